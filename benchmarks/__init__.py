@@ -0,0 +1 @@
+"""Micro-benchmarks for scanner hot paths. Run with ``python -m benchmarks.<name>``."""
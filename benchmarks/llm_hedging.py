@@ -0,0 +1,87 @@
+"""Benchmark hedged Claude calls against a local stub of the Messages API.
+
+The stub (tests/anthropic_stub.py) answers POST /v1/messages, plain and
+streamed, with a canned analysis after a random delay; a fraction of
+primary-model requests stall. The analyzer's client points at it, so the
+real request path (SDK, retries, timeouts, stream parsing) is exercised
+without network access.
+
+Usage:
+    python -m benchmarks.llm_hedging
+    python -m benchmarks.llm_hedging --calls 40 --stall-rate 0.3 --stream
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+
+import anthropic
+
+from tests.anthropic_stub import Reply, StubServer
+
+PRIMARY_MODEL = "claude-sonnet-4-20250514"
+BASE_DELAY = 0.3      # Typical time to a complete answer, seconds
+STALL_DELAY = 3.0     # Time taken by a stalled request
+FALLBACK_DELAY = 0.2  # Fallback model answers faster
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hedged Claude calls against a local stub")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--stall-rate", type=float, default=0.2)
+    parser.add_argument("--hedge-after", type=float, default=0.8)
+    parser.add_argument("--sla", type=float, default=5.0)
+    parser.add_argument("--stream", action="store_true", help="Use streamed requests")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    lock = threading.Lock()
+
+    def plan(model: str) -> Reply:
+        with lock:
+            if model != PRIMARY_MODEL:
+                return Reply(delay=FALLBACK_DELAY)
+            if rng.random() < args.stall_rate:
+                return Reply(delay=STALL_DELAY)
+            return Reply(delay=BASE_DELAY * rng.uniform(0.7, 1.5))
+
+    server = StubServer(plan).start()
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub-key")
+
+    from scanner.analyzer import ScannerAnalyzer
+    from scanner.cache import AnalysisCache
+    from scanner.hedging import percentiles
+
+    request = dict(
+        model=PRIMARY_MODEL,
+        max_tokens=8000,
+        system=[{"type": "text", "text": "stub"}],
+        messages=[{"role": "user", "content": "stub scan data"}],
+    )
+    print(f"calls={args.calls} stall_rate={args.stall_rate} stall={STALL_DELAY}s "
+          f"hedge_after={args.hedge_after}s sla={args.sla}s stream={args.stream}")
+    for label, hedge_after, fallback in (
+        ("no hedge", 0.0, None),
+        ("hedge, same model", args.hedge_after, None),
+        ("hedge, fallback model", args.hedge_after, "claude-fallback-stub"),
+    ):
+        rng.seed(7)
+        analyzer = ScannerAnalyzer(stream=args.stream, reanalyze=True)
+        analyzer.client = anthropic.Anthropic(api_key="stub-key", base_url=server.url)
+        analyzer.cache = AnalysisCache(tempfile.mkdtemp())
+        analyzer.hedge_after = hedge_after
+        analyzer.sla = args.sla
+        analyzer.fallback_model = fallback or analyzer.model
+        for i in range(args.calls):
+            analyzer._call({**request, "messages": [{"role": "user", "content": f"stub scan {i}"}]}, name=f"call-{i}")
+        stats = percentiles([t["seconds"] for t in analyzer.timings])
+        wins = sum(1 for t in analyzer.timings if t["winner"] == "hedge")
+        print(f"{label:22s} p50 {stats['p50']:5.2f}s  p90 {stats['p90']:5.2f}s  p99 {stats['p99']:5.2f}s  "
+              f"max {stats['max']:5.2f}s  hedge won {wins}/{args.calls}  failed {len(analyzer.failed_calls)}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
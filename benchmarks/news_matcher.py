@@ -0,0 +1,83 @@
+"""Benchmark news keyword scoring throughput on synthetic articles.
+
+Usage:
+    python -m benchmarks.news_matcher
+    python -m benchmarks.news_matcher --articles 20000 --repeat 10
+"""
+
+import argparse
+import random
+import time
+
+from scanner.keywords import KeywordMatcher
+from scanner.scanners.news import BULLISH_KEYWORDS, BEARISH_KEYWORDS, KEYWORD_INFLECTIONS
+
+FILLER = (
+    "the company said its ideal plan for the quarter would include closs review of "
+    "revenue margins shares investors analysts market trading session results outlook "
+    "management expects demand growth costs products customers said again despite"
+).split()
+NEGATIONS = ["no", "not", "denies", "without"]
+
+
+def make_articles(count: int, seed: int = 7) -> list:
+    """Headline + summary strings mixing filler, keywords and negations."""
+    rng = random.Random(seed)
+    keywords = list(BULLISH_KEYWORDS) + list(BEARISH_KEYWORDS)
+    articles = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(30, 80))
+        for _ in range(rng.randint(0, 3)):
+            phrase = rng.choice(keywords)
+            if rng.random() < 0.15:
+                phrase = f"{rng.choice(NEGATIONS)} {phrase}"
+            words.insert(rng.randrange(len(words)), phrase)
+        articles.append(" ".join(words).capitalize() + ".")
+    return articles
+
+
+def score_substring(text: str) -> tuple:
+    """Previous per-keyword substring scan, kept as the baseline."""
+    text = text.lower()
+    bullish_hits = [kw for kw in BULLISH_KEYWORDS if kw in text]
+    bearish_hits = [kw for kw in BEARISH_KEYWORDS if kw in text]
+    score = len(bullish_hits) - len(bearish_hits)
+    sentiment = "bullish" if score > 0 else "bearish" if score < 0 else "neutral"
+    return score, sentiment, bullish_hits + bearish_hits
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark news keyword scoring")
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    matcher = KeywordMatcher(BULLISH_KEYWORDS, BEARISH_KEYWORDS, inflections=KEYWORD_INFLECTIONS)
+    articles = make_articles(args.articles)
+
+    old = [score_substring(a) for a in articles]
+    new = matcher.score_batch(articles)
+    flagged_old = sum(1 for s, _, _ in old if s != 0)
+    flagged_new = sum(1 for s, _, _ in new if s != 0)
+
+    t_old = best_of(lambda: [score_substring(a) for a in articles], args.repeat)
+    t_single = best_of(lambda: [matcher.score(a) for a in articles], args.repeat)
+    t_batch = best_of(lambda: matcher.score_batch(articles), args.repeat)
+    print(f"articles={args.articles} keywords={len(matcher.weights)}")
+    print(f"flagged:    substring {flagged_old}, matcher {flagged_new} (word boundaries + negation)")
+    print(f"substring:  {args.articles / t_old:10,.0f} articles/s")
+    print(f"matcher:    {args.articles / t_single:10,.0f} articles/s (one call per article)")
+    print(f"batch:      {args.articles / t_batch:10,.0f} articles/s")
+
+
+if __name__ == "__main__":
+    main()
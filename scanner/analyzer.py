@@ -1,83 +1,146 @@
 """Claude Analyzer for Market Scanner."""
 
 import json
+import math
+import threading
+import time
 import anthropic
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Optional
-
-from .config import ANTHROPIC_API_KEY
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import (
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_BASE_URL,
+    ANALYZER_FALLBACK_MODEL,
+    ANALYZER_HEDGE_AFTER_SECONDS,
+    ANALYZER_MODE,
+    ANALYZER_SHARD_CANDIDATES,
+    ANALYZER_SHARD_WORKERS,
+    ANALYZER_SLA_SECONDS,
+    ANALYZER_STREAMING,
+    PRERANK_TOP_N,
+    PROMPT_ENCODING,
+)
 from .models import EarningsResult, NewsResult, MomentumResult, ScanAnalysis, Opportunity, WatchlistItem, SectorSummary, SectorNews
 from .scanners.options import OptionsSignal
 from .scanners.market_context import MarketContext
 from .scanners.technicals import TechnicalSignal
 from .scanners.premarket import PreMarketMover
-from .data.prompts import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from .cache import AnalysisCache
+from .hedging import race
+from .budget import PromptItem, PromptSection, TokenBudget, count_tokens
+from .ranking import TickerScore, fallback_analysis, score_tickers, shortlist
+from .streaming import IncrementalJSONParser, ParsedItem
+from .data.prompts import (
+    SYSTEM_PROMPT,
+    STATIC_CONTEXT_TEMPLATE,
+    USER_PROMPT_TEMPLATE,
+    SECTOR_PROMPT_TEMPLATE,
+    RANKING_SYSTEM_PROMPT,
+    RANKING_PROMPT_TEMPLATE,
+)
 
 
 class ScannerAnalyzer:
     """Analyzes scan results using Claude."""
 
-    def __init__(self):
-        self.client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    def __init__(
+        self,
+        stream: bool = ANALYZER_STREAMING,
+        encoding: str = PROMPT_ENCODING,
+        mode: str = ANALYZER_MODE,
+        reanalyze: bool = False
+    ):
+        self.client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, base_url=ANTHROPIC_BASE_URL)
         self.model = "claude-sonnet-4-20250514"
+        self.fallback_model = ANALYZER_FALLBACK_MODEL or self.model  # Model for hedged requests
+        self.sla = ANALYZER_SLA_SECONDS
+        self.hedge_after = ANALYZER_HEDGE_AFTER_SECONDS  # 0 = never hedge
+        self.timings: List[dict] = []  # Per-call latency and which request won, for this run
+        self.stream = stream
+        self.encoding = encoding
+        self.mode = mode
+        self.reanalyze = reanalyze  # Skip cached responses (new ones are still stored)
+        self.cache = AnalysisCache()
+        self.encoding_tokens: dict = {}
         self._portfolio: set = set()
+        self.last_usage: dict = {}
+        self.budget: Optional[TokenBudget] = None
+        self.shard_budgets: Dict[str, TokenBudget] = {}  # Sharded mode: one budget per sector call
+        self.scores: List[TickerScore] = []  # Local pre-ranking of every flagged ticker
+        self.shortlisted: List[str] = []
+        self.used_fallback = False  # Top picks came from the local ranking, not Claude
+        self.failed_calls: List[str] = []  # Calls this run that returned no complete response
+        self._lock = threading.Lock()
+        self._dropped: dict = {}
 
     def _tag(self, symbol: str) -> str:
         """Return symbol with [PORTFOLIO] prefix if held."""
         return f"[PORTFOLIO] {symbol}" if symbol in self._portfolio else symbol
 
-    def _format_earnings(self, earnings: List[EarningsResult]) -> str:
-        """Format earnings data for prompt."""
-        if not earnings:
-            return "No earnings in the next 5 trading days for watchlist stocks."
+    def _held(self, *symbols: str) -> bool:
+        return any(s in self._portfolio for s in symbols)
+
+    @staticmethod
+    def _row(*cells) -> str:
+        """One delimited table row; blank for missing values."""
+        return "|".join("" if c is None else str(c).replace("|", "/") for c in cells)
 
-        lines = []
+    def _earnings_section(self, earnings: List[EarningsResult]) -> PromptSection:
+        """Earnings items: portfolio first, then soonest report."""
+        items = []
         for e in earnings:
             beat_str = f"{e.beat_rate*100:.0f}% beat rate" if e.beat_rate else "No history"
             surprise_str = f"{e.avg_surprise_pct:+.1f}% avg surprise" if e.avg_surprise_pct else ""
             time_str = f" ({e.report_time})" if e.report_time else ""
 
-            lines.append(f"- {self._tag(e.symbol)}: {e.report_date}{time_str}")
-            lines.append(f"  EPS Est: ${e.eps_estimate:.2f}" if e.eps_estimate else "  EPS Est: N/A")
-            lines.append(f"  History: {beat_str} {surprise_str}")
-
-        return "\n".join(lines)
-
-    def _format_news(self, news: List[NewsResult]) -> str:
-        """Format news data for prompt."""
-        if not news:
-            return "No significant news catalysts in the last 48 hours."
-
-        lines = []
-        for n in news[:15]:  # Limit to top 15
+            lines = [
+                f"- {self._tag(e.symbol)}: {e.report_date}{time_str}",
+                f"  EPS Est: ${e.eps_estimate:.2f}" if e.eps_estimate else "  EPS Est: N/A",
+                f"  History: {beat_str} {surprise_str}",
+            ]
+            try:
+                soonness = -datetime.strptime(e.report_date[:10], "%Y-%m-%d").toordinal()  # Sooner sorts higher
+            except ValueError:
+                soonness = -math.inf
+            items.append(PromptItem(e.symbol, "\n".join(lines), (self._held(e.symbol), soonness)))
+        return PromptSection("earnings", items, empty="No earnings in the next 5 trading days for watchlist stocks.")
+
+    def _news_section(self, news: List[NewsResult]) -> PromptSection:
+        """News items: portfolio first, then |score|, then recency; at most 15."""
+        items = []
+        for n in news:
             sentiment_icon = "+" if n.sentiment == "bullish" else "-" if n.sentiment == "bearish" else "~"
             keywords_str = ", ".join(n.keywords_matched[:3])
-            lines.append(f"[{sentiment_icon}] {self._tag(n.symbol)}: {n.title}")
-            lines.append(f"    Source: {n.source} | Keywords: {keywords_str}")
-            lines.append(f"    URL: {n.url}")
-
-        return "\n".join(lines)
-
-    def _format_momentum(self, momentum: List[MomentumResult]) -> str:
-        """Format momentum data for prompt."""
-        if not momentum:
-            return "No unusual momentum signals detected."
+            related = f" (also {', '.join(n.related_symbols)})" if n.related_symbols else ""
+            sources = f" (+{n.source_count - 1} more sources)" if n.source_count > 1 else ""
+            lines = [
+                f"[{sentiment_icon}] {self._tag(n.symbol)}{related}: {n.title}",
+                f"    Source: {n.source}{sources} | Keywords: {keywords_str}",
+                f"    URL: {n.url}",
+            ]
+            priority = (self._held(n.symbol, *n.related_symbols), abs(n.sentiment_score), n.published_date.timestamp())
+            items.append(PromptItem(n.symbol, "\n".join(lines), priority))
+        return PromptSection(
+            "news", items, empty="No significant news catalysts in the last 48 hours.", max_items=15
+        )
 
-        lines = []
+    def _momentum_section(self, momentum: List[MomentumResult], table: bool = False) -> PromptSection:
+        """Momentum items: portfolio first, then signal count, then |change|."""
+        items = []
         for m in momentum:
-            signals_str = " | ".join(m.signals)
-            lines.append(f"- {self._tag(m.symbol)}: ${m.price:.2f} ({m.change_pct:+.1f}%)")
-            lines.append(f"  Signals: {signals_str}")
-
-        return "\n".join(lines)
-
-    def _format_options(self, options: List[OptionsSignal], call_put_ratios: dict) -> str:
-        """Format options flow data for prompt."""
-        if not options and not call_put_ratios:
-            return "No unusual options activity detected."
-
-        lines = []
-
+            if table:
+                text = self._row(self._tag(m.symbol), f"{m.price:.2f}", f"{m.change_pct:+.1f}", "; ".join(m.signals))
+            else:
+                signals_str = " | ".join(m.signals)
+                text = f"- {self._tag(m.symbol)}: ${m.price:.2f} ({m.change_pct:+.1f}%)\n  Signals: {signals_str}"
+            items.append(PromptItem(m.symbol, text, (self._held(m.symbol), len(m.signals), abs(m.change_pct))))
+        header = "symbol|price|chg%|signals" if table else ""
+        return PromptSection("momentum", items, header=header, empty="No unusual momentum signals detected.")
+
+    def _options_sections(self, options: List[OptionsSignal], call_put_ratios: dict, table: bool = False) -> tuple:
+        """Unusual activity grouped by symbol, and call/put ratios (most extreme first)."""
         # Group by symbol
         by_symbol = {}
         for o in options:
@@ -85,30 +148,47 @@ class ScannerAnalyzer:
                 by_symbol[o.symbol] = []
             by_symbol[o.symbol].append(o)
 
-        # Format unusual activity
-        if by_symbol:
-            lines.append("UNUSUAL OPTIONS ACTIVITY:")
-            for symbol, signals in by_symbol.items():
-                top_signals = sorted(signals, key=lambda x: x.volume_oi_ratio, reverse=True)[:3]
-                for s in top_signals:
-                    direction = "CALL" if s.option_type == "call" else "PUT"
-                    strength = "🔥" if s.signal_strength == "strong" else ""
-                    lines.append(f"  {strength}{self._tag(symbol)}: {s.expiry} ${s.strike} {direction} - Vol: {s.volume:,} / OI: {s.open_interest:,} ({s.volume_oi_ratio}x)")
-
-        # Format call/put ratios
-        if call_put_ratios:
-            lines.append("\nCALL/PUT VOLUME RATIOS (>1.5 = bullish, <0.7 = bearish):")
-            sorted_ratios = sorted(call_put_ratios.items(), key=lambda x: x[1], reverse=True)
-            for symbol, ratio in sorted_ratios:
-                if ratio > 1.5:
-                    sentiment = "📈 Bullish"
-                elif ratio < 0.7:
-                    sentiment = "📉 Bearish"
-                else:
-                    sentiment = "➡️ Neutral"
-                lines.append(f"  {self._tag(symbol)}: {ratio:.2f} {sentiment}")
-
-        return "\n".join(lines)
+        flow_items = []
+        for symbol, signals in by_symbol.items():
+            top_signals = sorted(signals, key=lambda x: x.volume_oi_ratio, reverse=True)[:3]
+            lines = []
+            for s in top_signals:
+                direction = "CALL" if s.option_type == "call" else "PUT"
+                if table:
+                    lines.append(self._row(
+                        self._tag(symbol), s.expiry, s.strike, direction, s.volume, s.open_interest,
+                        s.volume_oi_ratio, "Y" if s.signal_strength == "strong" else ""
+                    ))
+                    continue
+                strength = "🔥" if s.signal_strength == "strong" else ""
+                lines.append(f"  {strength}{self._tag(symbol)}: {s.expiry} ${s.strike} {direction} - Vol: {s.volume:,} / OI: {s.open_interest:,} ({s.volume_oi_ratio}x)")
+            strong = sum(1 for s in signals if s.signal_strength == "strong")
+            flow_items.append(PromptItem(symbol, "\n".join(lines), (self._held(symbol), strong, top_signals[0].volume_oi_ratio)))
+
+        ratio_items = []
+        for symbol, ratio in sorted(call_put_ratios.items(), key=lambda x: x[1], reverse=True):
+            if ratio > 1.5:
+                sentiment = "📈 Bullish"
+            elif ratio < 0.7:
+                sentiment = "📉 Bearish"
+            else:
+                sentiment = "➡️ Neutral"
+            extremity = abs(math.log(ratio)) if ratio > 0 else float("inf")
+            if table:
+                text = self._row(self._tag(symbol), f"{ratio:.2f}", sentiment.split()[-1].lower())
+            else:
+                text = f"  {self._tag(symbol)}: {ratio:.2f} {sentiment}"
+            ratio_items.append(PromptItem(symbol, text, (self._held(symbol), extremity)))
+
+        flow_header = "UNUSUAL OPTIONS ACTIVITY:"
+        ratio_header = "CALL/PUT VOLUME RATIOS (>1.5 = bullish, <0.7 = bearish):"
+        if table:
+            flow_header += "\nsymbol|expiry|strike|type|volume|oi|vol/oi|strong"
+            ratio_header += "\nsymbol|call/put|bias"
+        return (
+            PromptSection("options_flow", flow_items, header=flow_header),
+            PromptSection("call_put_ratios", ratio_items, header=ratio_header),
+        )
 
     def _format_market_context(self, ctx: Optional[MarketContext]) -> str:
         """Format market context for prompt."""
@@ -136,14 +216,20 @@ class ScannerAnalyzer:
 
         return "\n".join(lines)
 
-    def _format_technicals(self, technicals: List[TechnicalSignal]) -> str:
-        """Format technical signals for prompt."""
-        if not technicals:
-            return "No notable technical signals."
-
-        lines = ["TECHNICAL SIGNALS:"]
-
+    def _technicals_section(self, technicals: List[TechnicalSignal], table: bool = False) -> PromptSection:
+        """Technical items: portfolio first, then signal count, then RSI extremity."""
+        items = []
         for t in technicals:
+            rsi_extremity = abs(t.rsi_14 - 50) if t.rsi_14 else 0
+            priority = (self._held(t.symbol), len(t.signals), rsi_extremity)
+            if table:
+                ma = {None: "", True: "above", False: "below"}
+                short = f"{t.short_percent_float:.1f}" if t.short_percent_float and t.short_percent_float > 5 else ""
+                text = self._row(
+                    self._tag(t.symbol), t.rsi_14 or "", ma[t.above_50ma], ma[t.above_200ma], short, "; ".join(t.signals)
+                )
+                items.append(PromptItem(t.symbol, text, priority))
+                continue
             rsi_str = f"RSI: {t.rsi_14}" if t.rsi_14 else "RSI: N/A"
             ma_status = []
             if t.above_50ma is not None:
@@ -156,32 +242,130 @@ class ScannerAnalyzer:
             if t.short_percent_float and t.short_percent_float > 5:
                 short_str = f" | Short: {t.short_percent_float:.1f}%"
 
-            lines.append(f"  {self._tag(t.symbol)}: {rsi_str} | {ma_str}{short_str}")
+            lines = [f"  {self._tag(t.symbol)}: {rsi_str} | {ma_str}{short_str}"]
             if t.signals:
                 lines.append(f"    → {', '.join(t.signals)}")
+            items.append(PromptItem(t.symbol, "\n".join(lines), priority))
+        header = "TECHNICAL SIGNALS:"
+        if table:
+            header += "\nsymbol|rsi14|vs_50ma|vs_200ma|short%float|signals"
+        return PromptSection("technicals", items, header=header, empty="No notable technical signals.")
+
+    def _premarket_section(self, movers: List[PreMarketMover], table: bool = False) -> PromptSection:
+        """Pre-market items: portfolio first, then |move|; at most 10."""
+        items = []
+        for m in movers:
+            if table:
+                text = self._row(self._tag(m.symbol), f"{m.change_pct:+.1f}", m.price, "Y" if m.on_watchlist else "N")
+            else:
+                direction = "🚀" if m.change_pct > 0 else "📉"
+                watchlist_tag = "" if m.on_watchlist else " (NOT ON WATCHLIST - consider adding)"
+                text = f"  {direction} {self._tag(m.symbol)}: {m.change_pct:+.1f}% ${m.price}{watchlist_tag}"
+            items.append(PromptItem(m.symbol, text, (self._held(m.symbol), abs(m.change_pct))))
+        header = "PRE-MARKET MOVERS (±3%+):"
+        if table:
+            header += "\nsymbol|chg%|price|on_watchlist (N = consider adding)"
+        return PromptSection(
+            "premarket", items, header=header,
+            empty="No significant pre-market moves (±3%).", max_items=10
+        )
 
-        return "\n".join(lines)
-
-    def _format_premarket(self, movers: List[PreMarketMover]) -> str:
-        """Format pre-market movers for prompt."""
-        if not movers:
-            return "No significant pre-market moves (±3%)."
-
-        lines = ["PRE-MARKET MOVERS (±3%+):"]
-
-        for m in movers[:10]:
-            direction = "🚀" if m.change_pct > 0 else "📉"
-            watchlist_tag = "" if m.on_watchlist else " (NOT ON WATCHLIST - consider adding)"
-            lines.append(f"  {direction} {self._tag(m.symbol)}: {m.change_pct:+.1f}% ${m.price}{watchlist_tag}")
-
-        return "\n".join(lines)
+    def _signal_sections(self, premarket_movers, momentum, technicals, options, call_put_ratios, table: bool) -> list:
+        """The per-ticker signal sections in one encoding: prose lines or header + delimited rows."""
+        return [
+            self._premarket_section(premarket_movers, table),
+            self._momentum_section(momentum, table),
+            self._technicals_section(technicals, table),
+            *self._options_sections(options, call_put_ratios, table),
+        ]
 
     def _format_portfolio_context(self) -> str:
         """Build a dedicated portfolio section for the prompt."""
         if not self._portfolio:
             return ""
         tickers = ", ".join(sorted(self._portfolio))
-        return f"### PORTFOLIO HOLDINGS\nThe user currently holds the following positions: {tickers}\nThese are tagged [PORTFOLIO] throughout the data above. Always include position management guidance (add/hold/trim/hedge) for these in trade setups.\n"
+        return f"### PORTFOLIO HOLDINGS\nThe user currently holds the following positions: {tickers}\nThese are tagged [PORTFOLIO] throughout the scan data. Always include position management guidance (add/hold/trim/hedge) for these in trade setups.\n"
+
+    def _system_blocks(self, sector_context: str) -> List[dict]:
+        """System prompt plus static context, with the prefix marked cacheable.
+
+        Everything here is identical run to run (it only changes with the
+        watchlist), so later runs read it from the prompt cache.
+        """
+        static_context = STATIC_CONTEXT_TEMPLATE.format(
+            sectors=sector_context,
+            portfolio_context=self._format_portfolio_context()
+        )
+        return [
+            {"type": "text", "text": SYSTEM_PROMPT},
+            {"type": "text", "text": static_context, "cache_control": {"type": "ephemeral"}},
+        ]
+
+    def _record_usage(self, response) -> dict:
+        """Add the call's token usage, including prompt cache reads and writes, to this run's total."""
+        usage = getattr(response, "usage", None)
+        call_usage = {
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        }
+        with self._lock:
+            self.last_usage = {k: self.last_usage.get(k, 0) + v for k, v in call_usage.items()}
+        return call_usage
+
+    def _user_prompt(
+        self,
+        template: str,
+        date_str: str,
+        market_context_text: str,
+        macro_warnings: str,
+        earnings: List[EarningsResult],
+        news: List[NewsResult],
+        momentum: List[MomentumResult],
+        technicals: List[TechnicalSignal],
+        options: List[OptionsSignal],
+        call_put_ratios: dict,
+        premarket_movers: List[PreMarketMover],
+        **extra
+    ) -> Tuple[str, TokenBudget, dict]:
+        """Fill ``template`` with the scan data fitted to the token budget.
+
+        Returns the prompt, its budget, and the signal sections' token cost in
+        each encoding. Market context and macro warnings are never trimmed.
+        """
+        # Both layouts of the signal sections are built so the run can report what each costs
+        layouts = {
+            encoding: self._signal_sections(premarket_movers, momentum, technicals, options, call_put_ratios, encoding == "table")
+            for encoding in ("prose", "table")
+        }
+        encoding_tokens = {
+            encoding: sum(count_tokens(s.render()) for s in layout) for encoding, layout in layouts.items()
+        }
+        signal_sections = layouts["table" if self.encoding == "table" else "prose"]
+        options_flow, ratios = signal_sections[-2:]
+        sections = [self._earnings_section(earnings), self._news_section(news), *signal_sections]
+        budget = TokenBudget()
+        text = budget.fit(sections, fixed=template + market_context_text + macro_warnings)
+
+        if options_flow.items or ratios.items:
+            options_text = "\n\n".join(t for t in (text["options_flow"], text["call_put_ratios"]) if t)
+        else:
+            options_text = "No unusual options activity detected."
+
+        prompt = template.format(
+            date=date_str,
+            market_context=market_context_text,
+            premarket=text["premarket"],
+            macro_warnings=macro_warnings,
+            earnings=text["earnings"],
+            news=text["news"],
+            momentum=text["momentum"],
+            technicals=text["technicals"],
+            options=options_text,
+            **extra
+        )
+        return prompt, budget, encoding_tokens
 
     def analyze(
         self,
@@ -195,18 +379,24 @@ class ScannerAnalyzer:
         premarket_movers: List[PreMarketMover] = None,
         macro_warnings: str = None,
         watchlist: dict = None,
-        portfolio_tickers: List[str] = None
+        portfolio_tickers: List[str] = None,
+        on_item: Optional[Callable] = None
     ) -> ScanAnalysis:
-        """Analyze scan results and return structured analysis."""
+        """Analyze scan results and return structured analysis.
+
+        In streaming mode ``on_item(section, key, item)`` is called with each
+        Opportunity, WatchlistItem or SectorSummary as soon as it is complete.
+        """
 
         date_str = datetime.now().strftime("%Y-%m-%d")
-        technicals = technicals or []
-        options = options or []
-        call_put_ratios = call_put_ratios or {}
-        premarket_movers = premarket_movers or []
-        macro_warnings = macro_warnings or "No major macro events in next 5 days."
         watchlist = watchlist or {}
         self._portfolio = set(portfolio_tickers or [])
+        self.last_usage = {}
+        self.timings = []
+        self.used_fallback = False
+        self.failed_calls = []
+        self.budget = None
+        self.shard_budgets = {}
 
         # Build sector context (skip portfolio key)
         sector_lines = ["Sectors being tracked:"]
@@ -218,29 +408,59 @@ class ScannerAnalyzer:
             sector_lines.append(f"- {display_name}: {', '.join(tagged)}")
         sector_context = "\n".join(sector_lines)
 
-        # Build user prompt from template
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            date=date_str,
-            market_context=self._format_market_context(market_context),
-            premarket=self._format_premarket(premarket_movers),
-            macro_warnings=macro_warnings,
-            earnings=self._format_earnings(earnings),
-            news=self._format_news(news),
-            momentum=self._format_momentum(momentum),
-            technicals=self._format_technicals(technicals),
-            options=self._format_options(options, call_put_ratios),
-            sectors=sector_context,
-            portfolio_context=self._format_portfolio_context()
+        data = dict(
+            earnings=earnings,
+            news=news,
+            momentum=momentum,
+            technicals=technicals or [],
+            options=options or [],
+            call_put_ratios=call_put_ratios or {},
+            premarket_movers=premarket_movers or [],
         )
+        # Only the top-scoring tickers (plus holdings) go into the prompt
+        self.scores = score_tickers(**data, portfolio=self._portfolio)
+        self.shortlisted = [s.symbol for s in self.scores]
+        if PRERANK_TOP_N > 0:
+            self.shortlisted = shortlist(self.scores, PRERANK_TOP_N, self._portfolio)
+            data = self._slice(data, self.shortlisted)
+        kept = set(self.shortlisted)
+        below_cut = [s.symbol for s in self.scores if s.symbol not in kept]
+
+        market_context_text = self._format_market_context(market_context)
+        macro_warnings = macro_warnings or "No major macro events in next 5 days."
+        if self.mode == "sharded":
+            analysis = self._analyze_sharded(
+                data, watchlist, sector_context, market_context_text, macro_warnings, date_str, on_item
+            )
+        else:
+            # Dynamic data goes in the user message, after the cached prefix
+            user_prompt, self.budget, self.encoding_tokens = self._user_prompt(
+                USER_PROMPT_TEMPLATE, date_str, market_context_text, macro_warnings, **data
+            )
+            self._dropped = self.budget.dropped
 
-        try:
-            response = self.client.messages.create(
+            request = dict(
                 model=self.model,
                 max_tokens=8000,
-                system=SYSTEM_PROMPT,
+                system=self._system_blocks(sector_context),
                 messages=[{"role": "user", "content": user_prompt}]
             )
-
+            analysis = self._build_analysis(self._call(request, on_item, name="analysis"), date_str)
+
+        if below_cut:
+            analysis.dropped_items = {"below_shortlist": below_cut, **analysis.dropped_items}
+        # An empty top 3 from a complete response is Claude's call; only a failed call falls back
+        if not analysis.top_opportunities and self.scores and self.failed_calls:
+            print("[Warning] Claude analysis failed; using the local pre-ranking instead")
+            analysis.top_opportunities = fallback_analysis(self.scores, date_str).top_opportunities
+            self.used_fallback = True
+        return analysis
+
+    def _complete(self, request: dict, client=None) -> dict:
+        """Non-streaming call; the parsed JSON response, or {} on failure."""
+        try:
+            response = (client or self.client).messages.create(**request)
+            self._record_usage(response)
             response_text = response.content[0].text
 
             # Parse JSON response — strip markdown code blocks if present
@@ -249,54 +469,411 @@ class ScannerAnalyzer:
             elif "```" in response_text:
                 response_text = response_text.split("```")[1].split("```")[0]
 
-            data = json.loads(response_text.strip())
-
-            # Build Opportunity objects and flag portfolio holdings
-            opportunities = []
-            for opp in data.get("top_opportunities", []):
-                opportunity = Opportunity(**opp)
-                if opportunity.ticker in self._portfolio:
-                    opportunity.is_portfolio = True
-                opportunities.append(opportunity)
-
-            watchlist_items = [
-                WatchlistItem(**item) for item in data.get("watchlist", [])
-            ]
-            no_action_items = [
-                WatchlistItem(**item) for item in data.get("no_action", [])
-            ]
-
-            # Parse sector summaries
-            raw_sectors = data.get("sector_summary", {})
-            sector_summaries = {}
-            for sector, info in raw_sectors.items():
-                if isinstance(info, dict):
-                    news_items = [
-                        SectorNews(**n) for n in info.get("news", [])
-                    ]
-                    sector_summaries[sector] = SectorSummary(
-                        outlook=info.get("outlook", "Neutral"),
-                        overview=info.get("overview", ""),
-                        news=news_items
-                    )
-                else:
-                    sector_summaries[sector] = SectorSummary(
-                        outlook=info.split(" - ")[0] if " - " in str(info) else "Neutral",
-                        overview=str(info),
-                        news=[]
-                    )
-
-            return ScanAnalysis(
-                scan_date=date_str,
-                top_opportunities=opportunities,
-                watchlist=watchlist_items,
-                no_action=no_action_items,
-                sector_summary=sector_summaries
-            )
+            return json.loads(response_text.strip())
 
         except json.JSONDecodeError as e:
             print(f"[Warning] Failed to parse Claude response as JSON: {e}")
-            return ScanAnalysis(scan_date=date_str)
+            return {}
         except anthropic.APIError as e:
             print(f"[Error] Claude API error: {e}")
-            return ScanAnalysis(scan_date=date_str)
+            return {}
+
+    @staticmethod
+    def _shards(watchlist: dict, data: dict) -> Dict[str, List[str]]:
+        """Tickers per watchlist key, each ticker in one shard only.
+
+        Sectors claim tickers first, so "portfolio" keeps only holdings outside
+        every sector; "other" collects flagged symbols on no list (e.g.
+        pre-market movers).
+        """
+        shards: Dict[str, List[str]] = {}
+        listed = set()
+        for key in sorted(watchlist, key=lambda k: k == "portfolio"):
+            tickers = [t for t in dict.fromkeys(watchlist[key]) if t not in listed]
+            listed.update(tickers)
+            if tickers:
+                shards[key] = tickers
+        flagged = [x.symbol for key in ("earnings", "news", "momentum", "technicals", "options", "premarket_movers") for x in data[key]]
+        other = [s for s in dict.fromkeys(flagged + list(data["call_put_ratios"])) if s not in listed]
+        if other:
+            shards["other"] = other
+        return shards
+
+    @staticmethod
+    def _slice(data: dict, tickers: List[str]) -> dict:
+        """The scan data for one shard's tickers (news also matches on related tickers)."""
+        symbols = set(tickers)
+        sliced = {
+            key: [x for x in data[key] if x.symbol in symbols]
+            for key in ("earnings", "momentum", "technicals", "options", "premarket_movers")
+        }
+        sliced["news"] = [n for n in data["news"] if n.symbol in symbols or symbols.intersection(n.related_symbols)]
+        sliced["call_put_ratios"] = {s: r for s, r in data["call_put_ratios"].items() if s in symbols}
+        return sliced
+
+    def _analyze_sector(
+        self, sector: str, tickers: List[str], data: dict, system: List[dict],
+        market_context_text: str, macro_warnings: str, date_str: str
+    ) -> dict:
+        """One shard's call: candidate setups, watchlist, no-action and its sector summary."""
+        user_prompt, budget, encoding_tokens = self._user_prompt(
+            SECTOR_PROMPT_TEMPLATE, date_str, market_context_text, macro_warnings, **data,
+            sector=sector, tickers=", ".join(self._tag(t) for t in tickers), candidates=ANALYZER_SHARD_CANDIDATES
+        )
+        with self._lock:
+            self.shard_budgets[sector] = budget
+            for encoding, tokens in encoding_tokens.items():
+                self.encoding_tokens[encoding] = self.encoding_tokens.get(encoding, 0) + tokens
+        request = dict(
+            model=self.model,
+            max_tokens=4000,
+            system=system,
+            messages=[{"role": "user", "content": user_prompt}]
+        )
+        return self._call(request, name=sector)
+
+    def _analyze_sharded(
+        self, data: dict, watchlist: dict, sector_context: str,
+        market_context_text: str, macro_warnings: str, date_str: str, on_item: Optional[Callable]
+    ) -> ScanAnalysis:
+        """Per-sector calls in parallel, then one small call ranking their candidates.
+
+        Every sector call shares the cached system prefix. Sector summaries and
+        no-action items are handed to ``on_item`` as each sector finishes; the
+        top 3 and watchlist follow the ranking call.
+        """
+        shards = self._shards(watchlist, data)
+        sliced = {sector: self._slice(data, tickers) for sector, tickers in shards.items()}
+        sliced = {sector: d for sector, d in sliced.items() if any(d.values())}  # Nothing flagged, nothing to analyze
+        self.encoding_tokens = {}
+        self._dropped = {}
+        system = self._system_blocks(sector_context)
+
+        candidates: Dict[str, Tuple[str, Opportunity]] = {}
+        picks: Dict[str, WatchlistItem] = {}
+        no_action: Dict[str, WatchlistItem] = {}
+        sector_summary = {}
+        summarized = set(watchlist) - {"portfolio"}
+
+        def emit(section, key, item):
+            if on_item is not None:
+                self._deliver(on_item, section, key, item)
+
+        # Sectors with nothing flagged get no call, but still a line in the report
+        for name in watchlist:
+            if name in summarized and name not in sliced:
+                sector_summary[name] = SectorSummary(outlook="Neutral", overview="No signals flagged")
+                emit("sector_summary", name, sector_summary[name])
+
+        workers = max(1, min(ANALYZER_SHARD_WORKERS, len(sliced)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shard") as pool:
+            futures = {
+                pool.submit(
+                    self._analyze_sector, sector, shards[sector], d, system, market_context_text, macro_warnings, date_str
+                ): sector
+                for sector, d in sliced.items()
+            }
+            for future in as_completed(futures):
+                sector = futures[future]
+                try:
+                    result = self._build_analysis(future.result(), date_str)
+                except Exception as e:
+                    print(f"[Warning] Sector analysis failed for {sector}: {e}")
+                    continue
+                for opp in result.top_opportunities:
+                    held = candidates.get(opp.ticker)
+                    if held is None or opp.conviction > held[1].conviction:
+                        candidates[opp.ticker] = (sector, opp)
+                for item in result.watchlist:
+                    picks.setdefault(item.ticker, item)
+                for item in result.no_action:
+                    if item.ticker not in no_action:
+                        no_action[item.ticker] = item
+                        emit("no_action", None, item)
+                for name, summary in result.sector_summary.items():
+                    if name in summarized and name not in sector_summary:
+                        sector_summary[name] = summary
+                        emit("sector_summary", name, summary)
+
+        for budget in self.shard_budgets.values():
+            for section, tickers in budget.dropped.items():
+                self._dropped.setdefault(section, []).extend(tickers)
+
+        top, watch = self._rank(candidates, picks, market_context_text, macro_warnings, date_str)
+        for opp in top:
+            emit("top_opportunities", None, opp)
+        for item in watch:
+            emit("watchlist", None, item)
+        return ScanAnalysis(
+            scan_date=date_str,
+            top_opportunities=top,
+            watchlist=watch,
+            no_action=list(no_action.values()),
+            sector_summary={name: sector_summary[name] for name in watchlist if name in sector_summary},
+            dropped_items=self._dropped,
+        )
+
+    def _rank(
+        self, candidates: Dict[str, Tuple[str, Opportunity]], picks: Dict[str, WatchlistItem],
+        market_context_text: str, macro_warnings: str, date_str: str
+    ) -> Tuple[List[Opportunity], List[WatchlistItem]]:
+        """Top 3 and watchlist across sectors; falls back to conviction order if the call fails."""
+        by_conviction = sorted(candidates.values(), key=lambda c: c[1].conviction, reverse=True)
+        top = [opp for _, opp in by_conviction[:3]]
+        watch = [item for ticker, item in picks.items() if ticker not in {o.ticker for o in top}]
+
+        if len(candidates) > 3:
+            candidate_lines = [
+                f"- {self._tag(opp.ticker)} ({sector}) {opp.setup_type}, {opp.time_horizon or 'n/a'}, "
+                f"conviction {opp.conviction}/10\n  Catalyst: {opp.catalyst}\n  Thesis: {opp.thesis}\n  Risk: {opp.key_risk}"
+                for sector, opp in by_conviction
+            ]
+            watch_lines = [f"- {self._tag(t)}: {item.reason}" for t, item in picks.items()] or ["None."]
+            request = dict(
+                model=self.model,
+                max_tokens=1000,
+                system=RANKING_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": RANKING_PROMPT_TEMPLATE.format(
+                    date=date_str,
+                    market_context=market_context_text,
+                    macro_warnings=macro_warnings,
+                    candidates="\n".join(candidate_lines),
+                    watchlist="\n".join(watch_lines),
+                )}]
+            )
+            ranking = self._call(request, stream=False, name="ranking")
+            ranked = sorted(
+                (r for r in ranking.get("top_opportunities") or [] if isinstance(r, dict) and r.get("ticker") in candidates),
+                key=lambda r: r.get("rank", 99)
+            )
+            if ranked:
+                top = list(dict.fromkeys(r["ticker"] for r in ranked))[:3]
+                top += [opp.ticker for _, opp in by_conviction if opp.ticker not in top][:3 - len(top)]
+                top = [candidates[t][1] for t in top]
+                chosen = {o.ticker for o in top}
+                watch = []
+                for raw in ranking.get("watchlist") or []:
+                    try:
+                        item = WatchlistItem(**raw)
+                    except Exception as e:
+                        print(f"[Warning] Skipping malformed watchlist item: {e}")
+                        continue
+                    if item.ticker not in chosen:
+                        watch.append(item)
+            else:
+                print("[Warning] Ranking call returned no usable picks; ranking candidates by conviction")
+
+        return [opp.model_copy(update={"rank": i}) for i, opp in enumerate(top, 1)], watch
+
+    def _call(
+        self, request: dict, on_item: Optional[Callable] = None, stream: Optional[bool] = None, name: str = "analysis"
+    ) -> dict:
+        """Parsed response for ``request``, from the analysis cache when the exact request was answered before.
+
+        Only complete answers from the requested model are cached, so a hedge
+        won by ``fallback_model`` is never served later as that model's answer.
+        Calls that return an empty or incomplete response are recorded in
+        ``failed_calls``. ``--reanalyze`` skips the lookup.
+        """
+        key = AnalysisCache.make_key(request)
+        cached = None if self.reanalyze else self.cache.get(key)
+        if cached is not None:
+            if on_item is not None:
+                for section, items in cached.items():
+                    members = items.items() if isinstance(items, dict) else ((None, v) for v in items or [])
+                    for member, value in members:
+                        self._emit(ParsedItem(section, member, value), on_item)
+            return cached
+
+        data, complete, model = self._hedged(request, on_item, self.stream if stream is None else stream, name)
+        if complete and model == request["model"]:
+            self.cache.put(key, model, data)
+        elif not complete:
+            with self._lock:
+                self.failed_calls.append(name)
+        return data
+
+    def _hedged(
+        self, request: dict, on_item: Optional[Callable], streaming: bool, name: str
+    ) -> Tuple[dict, bool, Optional[str]]:
+        """Send ``request``; if no complete answer (or, streaming, no first item) within
+        ``hedge_after`` seconds, also send it to ``fallback_model`` and take whichever finishes first.
+
+        Both requests are abandoned at the ``sla``. When streaming, the first
+        request to yield an item owns ``on_item``; the other stops reading. If
+        the SLA passes mid-stream, the owner's items so far are returned as an
+        incomplete response. Returns the response, whether it completed, and
+        the model that wrote it (None if neither answered).
+        """
+        deadline = time.monotonic() + self.sla
+        owner: List[str] = []
+        sent: set = set()  # Attempts that actually sent a request
+        progress: Dict[str, dict] = {}  # Items each streamed attempt has parsed so far
+        hedging = self.hedge_after > 0
+
+        def claim(label: str) -> bool:
+            with self._lock:
+                if not owner:
+                    owner.append(label)
+                return owner[0] == label
+
+        def attempt(label: str, model: str):
+            def run(cancel):
+                if owner and owner[0] != label:
+                    return None  # The other request is already streaming items
+                sent.add(label)
+                options = {"timeout": max(deadline - time.monotonic(), 1.0)}
+                if hedging:
+                    options["max_retries"] = 0  # The hedge is the retry
+                client = self.client.with_options(**options)
+                attempt_request = {**request, "model": model}
+                if not streaming:
+                    data = self._complete(attempt_request, client)
+                    return data, bool(data)
+                result = self._stream_response(
+                    attempt_request, on_item, client, cancel, lambda: claim(label),
+                    on_progress=lambda data: progress.__setitem__(label, data)
+                )
+                return None if owner and owner[0] != label else result
+            return label, run
+
+        hedge = attempt("hedge", self.fallback_model) if hedging else None
+        result = race(
+            attempt("primary", request["model"]), hedge, self.hedge_after, self.sla,
+            accept=lambda r: r is not None and r[1]
+        )
+        winner, value = result.winner, result.value
+        if (value is None or not value[1]) and owner and progress.get(owner[0]):
+            # No complete answer in time; keep what the owning stream already handed to on_item
+            winner, value = owner[0], (progress[owner[0]], False)
+        model = {"primary": request["model"], "hedge": self.fallback_model}.get(winner)
+        with self._lock:
+            self.timings.append({
+                "call": name, "winner": winner, "model": model,
+                "seconds": round(result.seconds, 2), "hedged": "hedge" in sent,
+            })
+        data, complete = value or ({}, False)
+        return data, complete, model
+
+    def _stream_response(
+        self,
+        request: dict,
+        on_item: Optional[Callable] = None,
+        client=None,
+        cancel: Optional[threading.Event] = None,
+        claim: Optional[Callable[[], bool]] = None,
+        on_progress: Optional[Callable[[dict], None]] = None
+    ) -> Tuple[dict, bool]:
+        """Stream the response, handing each completed item to ``on_item`` as it arrives.
+
+        Returns the parsed response and whether it completed. If the stream
+        fails partway, the items completed so far are returned. Reading stops
+        early once ``cancel`` is set or ``claim()`` says another request owns
+        the output. ``on_progress`` gets a copy of the items parsed so far
+        before each batch is handed on.
+        """
+        parser = IncrementalJSONParser()
+        stopped = False
+        try:
+            with (client or self.client).messages.stream(**request) as stream:
+                for text in stream.text_stream:
+                    if cancel is not None and cancel.is_set():
+                        stopped = True
+                        break
+                    items = parser.feed(text)
+                    if items and claim is not None and not claim():
+                        stopped = True
+                        break
+                    if items and on_progress is not None:
+                        on_progress({k: type(v)(v) for k, v in parser.sections.items()})
+                    for item in items:
+                        self._emit(item, on_item)
+                if not stopped:
+                    self._record_usage(stream.get_final_message())
+        except Exception as e:
+            # Network drops surface from the HTTP layer as well as anthropic.APIError
+            print(f"[Warning] Claude stream interrupted, keeping {self._count_items(parser.sections)} completed items: {e}")
+        if stopped:
+            return parser.result(), False
+        if not parser.done and parser.buffer:
+            print("[Warning] Claude response was incomplete; using the items parsed so far")
+        data = parser.result()
+        return data, parser.done and bool(data)
+
+    @staticmethod
+    def _count_items(sections: dict) -> int:
+        return sum(len(v) for v in sections.values() if isinstance(v, (list, dict)))
+
+    def _emit(self, item: ParsedItem, on_item: Optional[Callable]):
+        """Convert a streamed item to its model and pass it on."""
+        if on_item is None:
+            return
+        try:
+            if item.section == "top_opportunities":
+                model = self._to_opportunity(item.value)
+            elif item.section in ("watchlist", "no_action"):
+                model = WatchlistItem(**item.value)
+            elif item.section == "sector_summary":
+                model = self._to_sector_summary(item.value)
+            else:
+                return
+        except Exception as e:
+            print(f"[Warning] Skipping malformed {item.section} item: {e}")
+            return
+        self._deliver(on_item, item.section, item.key, model)
+
+    @staticmethod
+    def _deliver(on_item: Callable, section: str, key: Optional[str], model):
+        """Call ``on_item``; a consumer error is logged so it can't cut the response short."""
+        try:
+            on_item(section, key, model)
+        except Exception as e:
+            print(f"[Warning] Failed to handle {section} item: {e}")
+
+    def _to_opportunity(self, raw: dict) -> Opportunity:
+        """Build an Opportunity and flag portfolio holdings."""
+        opportunity = Opportunity(**raw)
+        if opportunity.ticker in self._portfolio:
+            opportunity.is_portfolio = True
+        return opportunity
+
+    @staticmethod
+    def _to_sector_summary(info) -> SectorSummary:
+        if isinstance(info, dict):
+            return SectorSummary(
+                outlook=info.get("outlook", "Neutral"),
+                overview=info.get("overview", ""),
+                news=[SectorNews(**n) for n in info.get("news", [])]
+            )
+        return SectorSummary(
+            outlook=info.split(" - ")[0] if " - " in str(info) else "Neutral",
+            overview=str(info),
+            news=[]
+        )
+
+    def _build_analysis(self, data: dict, date_str: str) -> ScanAnalysis:
+        """Typed analysis from the parsed response; malformed items are skipped."""
+        def build(items, factory, label):
+            built = []
+            for raw in items or []:
+                try:
+                    built.append(factory(raw))
+                except Exception as e:
+                    print(f"[Warning] Skipping malformed {label} item: {e}")
+            return built
+
+        sector_summaries = {}
+        for sector, info in (data.get("sector_summary") or {}).items():
+            try:
+                sector_summaries[sector] = self._to_sector_summary(info)
+            except Exception as e:
+                print(f"[Warning] Skipping malformed sector_summary item: {e}")
+
+        return ScanAnalysis(
+            scan_date=date_str,
+            top_opportunities=build(data.get("top_opportunities"), self._to_opportunity, "top_opportunities"),
+            watchlist=build(data.get("watchlist"), lambda raw: WatchlistItem(**raw), "watchlist"),
+            no_action=build(data.get("no_action"), lambda raw: WatchlistItem(**raw), "no_action"),
+            sector_summary=sector_summaries,
+            dropped_items=self._dropped
+        )
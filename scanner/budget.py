@@ -0,0 +1,144 @@
+"""Prompt Budget - Keep the per-run prompt data under a token budget.
+
+Each prompt section is a list of items (one ticker's lines, one article)
+with a priority. When the sections together exceed the budget, every
+section gets a weighted share, shares a section doesn't need go to the
+others, and each section keeps its highest-priority items that fit.
+Whatever is cut is recorded so the report can say what the model never saw.
+"""
+
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from .config import PROMPT_SECTION_WEIGHTS, PROMPT_TOKEN_BUDGET
+
+_PIECE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def count_tokens(text: str) -> int:
+    """Local token estimate: ~4 characters per word piece, 1 per symbol.
+
+    Within ~10-15% of the real tokenizer on this prompt's mix of tickers,
+    numbers and punctuation, which is all a budget needs.
+    """
+    return sum(math.ceil(len(p) / 4) if p[0].isalnum() or p[0] == "_" else 1 for p in _PIECE.findall(text))
+
+
+class PromptItem(NamedTuple):
+    label: str       # Shown in the dropped-items report (usually the ticker)
+    text: str
+    priority: tuple  # Higher sorts first: (in portfolio, signal strength, recency); first element is a bool
+
+
+class PromptSection:
+    """Items for one prompt slot, rendered in their original order."""
+
+    def __init__(
+        self,
+        name: str,
+        items: Sequence[PromptItem],
+        header: str = "",
+        empty: str = "",
+        max_items: Optional[int] = None
+    ):
+        self.name = name
+        self.items = list(items)
+        self.header = header
+        self.empty = empty
+        self.max_items = max_items
+        self.kept: List[int] = list(range(len(self.items)))
+
+    def render(self) -> str:
+        if not self.items:
+            return self.empty
+        lines = [self.header] if self.header else []
+        lines += [self.items[i].text for i in sorted(self.kept)]
+        omitted = len(self.items) - len(self.kept)
+        if omitted:
+            lines.append(f"  ({omitted} lower-priority items omitted for length)")
+        return "\n".join(lines)
+
+    def dropped(self) -> List[str]:
+        kept = set(self.kept)
+        return [item.label for i, item in enumerate(self.items) if i not in kept]
+
+
+class TokenBudget:
+    """Trims prompt sections to fit ``total`` tokens."""
+
+    def __init__(self, total: int = PROMPT_TOKEN_BUDGET, weights: Optional[Dict[str, float]] = None):
+        self.total = total
+        self.weights = weights if weights is not None else PROMPT_SECTION_WEIGHTS
+        self.usage: Dict[str, int] = {}
+        self.dropped: Dict[str, List[str]] = {}
+
+    def _allocate(self, needs: Dict[str, int], available: int) -> Dict[str, int]:
+        """Weighted shares, with shares a section doesn't need passed to the rest."""
+        alloc: Dict[str, int] = {}
+        open_sections = dict(needs)
+        remaining = available
+        while open_sections:
+            weight_sum = sum(self.weights.get(n, 1.0) for n in open_sections)
+            shares = {n: remaining * self.weights.get(n, 1.0) / weight_sum for n in open_sections}
+            satisfied = [n for n, need in open_sections.items() if need <= shares[n]]
+            if not satisfied:
+                alloc.update({n: int(shares[n]) for n in open_sections})
+                break
+            for n in satisfied:
+                alloc[n] = open_sections.pop(n)
+                remaining -= alloc[n]
+        return alloc
+
+    def fit(self, sections: List[PromptSection], fixed: str = "") -> Dict[str, str]:
+        """Trim sections in place and return their rendered text by name.
+
+        ``fixed`` is prompt text that is never trimmed (template, market
+        context); it is charged against the budget first.
+        """
+        fixed_tokens = count_tokens(fixed)
+        costs = {s.name: [count_tokens(item.text) + 1 for item in s.items] for s in sections}
+        order = {
+            s.name: sorted(range(len(s.items)), key=lambda i: s.items[i].priority, reverse=True)[:s.max_items]
+            for s in sections
+        }
+        needs = {
+            s.name: count_tokens(s.header) + sum(costs[s.name][i] for i in order[s.name])
+            for s in sections
+        }
+        alloc = self._allocate(needs, max(self.total - fixed_tokens, 0))
+
+        used = {}
+        for s in sections:
+            budget = alloc[s.name] - count_tokens(s.header)
+            kept, spent = [], 0
+            for i in order[s.name]:
+                if spent + costs[s.name][i] > budget:
+                    break
+                kept.append(i)
+                spent += costs[s.name][i]
+            s.kept = kept
+            used[s.name] = spent
+
+        # Spend what's left on each section's next items: portfolio first, then cheapest
+        leftover = max(self.total - fixed_tokens, 0) - sum(count_tokens(s.header) for s in sections) - sum(used.values())
+        candidates = sorted(
+            ((not s.items[i].priority[0], costs[s.name][i], n, s, i)
+             for n, s in enumerate(sections) for i in order[s.name][len(s.kept):]),
+            key=lambda c: c[:3]
+        )
+        for _, cost, _, s, i in candidates:
+            if cost <= leftover and len(s.kept) < len(order[s.name]) and order[s.name][len(s.kept)] == i:
+                s.kept.append(i)
+                used[s.name] += cost
+                leftover -= cost
+
+        rendered = {s.name: s.render() for s in sections}
+        self.usage = {name: count_tokens(text) for name, text in rendered.items()}
+        self.usage["fixed"] = fixed_tokens
+        self.dropped = {s.name: s.dropped() for s in sections if s.dropped()}
+        return rendered
+
+    @property
+    def used(self) -> int:
+        return sum(self.usage.values())
@@ -0,0 +1,10 @@
+"""Local on-disk caches for market and provider data."""
+
+from .analysis import AnalysisCache
+from .articles import ArticleIndex
+from .earnings import EarningsStore
+from .prices import PriceStore
+from .reference import ReferenceStore, get_reference_store
+from .responses import ResponseCache, get_response_cache, configure_response_cache
+
+__all__ = ["AnalysisCache", "ArticleIndex", "EarningsStore", "PriceStore", "ReferenceStore", "get_reference_store", "ResponseCache", "get_response_cache", "configure_response_cache"]
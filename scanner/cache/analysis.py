@@ -0,0 +1,72 @@
+"""Analysis Cache - Parsed Claude responses keyed by a hash of the exact request."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..config import ANALYSIS_CACHE_MAX_AGE_DAYS, CACHE_DIR
+
+
+class AnalysisCache:
+    """One JSON file per request hash (model, system prompt and rendered user prompt).
+
+    Identical scan data renders an identical prompt, so a re-run that only
+    changes the PDF, the email or nothing at all reuses the earlier answer
+    instead of paying for the call again. Files older than ``max_age_days``
+    are pruned on write.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age_days: float = ANALYSIS_CACHE_MAX_AGE_DAYS):
+        self.path = Path(path) if path else CACHE_DIR / "analysis"
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # Sharded sector calls look up concurrently
+
+    @staticmethod
+    def make_key(request: dict) -> str:
+        """SHA-256 of the request as sent (model, max_tokens, system blocks, messages)."""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """The stored parsed response, or None."""
+        path = self.path / f"{key}.json"
+        data = None
+        if path.exists():
+            try:
+                with open(path) as f:
+                    data = json.load(f)["response"]
+            except Exception as e:
+                print(f"[Warning] Analysis cache entry unreadable, ignoring: {e}")
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, key: str, model: str, data: dict):
+        """Store a complete parsed response."""
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._prune()
+            tmp = self.path / f"{key}.json.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"model": model, "stored": time.time(), "response": data}, f)
+            os.replace(tmp, self.path / f"{key}.json")
+        except OSError as e:
+            print(f"[Warning] Failed to save analysis cache entry: {e}")
+
+    def _prune(self):
+        cutoff = time.time() - self.max_age_days * 86400
+        for path in self.path.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,94 @@
+"""Article Index - Scored news articles remembered across runs."""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config import CACHE_DIR, NEWS_INDEX_RETENTION_HOURS
+
+
+def article_key(article: dict) -> str:
+    """Finnhub article id, or a hash of the URL (headline if no URL)."""
+    if article.get("id"):
+        return f"id:{article['id']}"
+    basis = article.get("url") or article.get("headline") or ""
+    return "url:" + hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+class ArticleIndex:
+    """Seen articles with their score and every ticker they were fetched for.
+
+    Each article is scored once, the first run that sees it; later runs (and
+    other tickers carrying the same wire story) only add symbols to it.
+    Entries older than ``retention_hours`` by publish time are pruned on save.
+    """
+
+    def __init__(self, path: Optional[Path] = None, retention_hours: float = NEWS_INDEX_RETENTION_HOURS):
+        self.path = Path(path) if path else CACHE_DIR / "articles.json"
+        self.retention_hours = retention_hours
+        self.articles: Dict[str, dict] = {}
+        self.last_run: Optional[float] = None
+        self.cursors: Dict[str, int] = {}  # Newest article id seen per bulk news category
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.articles = data.get("articles", {})
+            self.last_run = data.get("last_run")
+            self.cursors = data.get("cursors", {})
+        except Exception as e:
+            print(f"[Warning] Article index unreadable, rebuilding: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.articles
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.articles.get(key)
+
+    def add(self, key: str, article: dict, symbol: str, score: int, sentiment: str, keywords: List[str]):
+        """Record a newly scored article."""
+        self.articles[key] = {
+            "symbols": [symbol],
+            "published": article.get("datetime", 0),
+            "headline": article.get("headline") or "",
+            "url": article.get("url") or "",
+            "source": article.get("source") or "Unknown",
+            "score": score,
+            "sentiment": sentiment,
+            "keywords": keywords,
+        }
+
+    def link(self, key: str, symbol: str):
+        """Attach another ticker to an indexed article."""
+        symbols = self.articles[key]["symbols"]
+        if symbol not in symbols:
+            symbols.append(symbol)
+
+    def since(self, published_after: float) -> Iterable[dict]:
+        """Indexed articles published after a Unix timestamp."""
+        return (a for a in self.articles.values() if a["published"] >= published_after)
+
+    def save(self, run_started: Optional[float] = None):
+        """Prune expired entries and persist; ``run_started`` marks a successful run."""
+        cutoff = time.time() - self.retention_hours * 3600
+        self.articles = {k: a for k, a in self.articles.items() if a["published"] >= cutoff}
+        if run_started is not None:
+            self.last_run = run_started
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "updated": datetime.now().isoformat(),
+                "last_run": self.last_run,
+                "cursors": self.cursors,
+                "articles": self.articles,
+            }, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,156 @@
+"""Earnings Store - Per-symbol EPS history refreshed only after a new report."""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..config import CACHE_DIR, EARNINGS_HISTORY_MAX_AGE_DAYS, EARNINGS_HISTORY_WINDOWS
+
+
+def beat_rate(history: List[dict], quarters: int) -> Optional[float]:
+    """Share of the last ``quarters`` reports where actual EPS beat the estimate."""
+    recent = history[:quarters]
+    if not recent:
+        return None
+    beats = sum(1 for e in recent if e.get("actual") and e.get("estimate") and e["actual"] > e["estimate"])
+    return beats / len(recent)
+
+
+def avg_surprise(history: List[dict], quarters: int) -> Optional[float]:
+    """Mean EPS surprise % over the last ``quarters`` reports."""
+    surprises = []
+    for e in history[:quarters]:
+        actual = e.get("actual")
+        estimate = e.get("estimate")
+        if actual and estimate and estimate != 0:
+            surprises.append((actual - estimate) / abs(estimate) * 100)
+    return sum(surprises) / len(surprises) if surprises else None
+
+
+def aggregate(history: List[dict], windows: Iterable[int] = EARNINGS_HISTORY_WINDOWS) -> Dict[str, dict]:
+    """Beat rate and average surprise for each window, keyed by quarter count."""
+    return {
+        str(n): {
+            "quarters": min(n, len(history)),
+            "beat_rate": beat_rate(history, n),
+            "avg_surprise_pct": avg_surprise(history, n),
+        }
+        for n in windows
+    }
+
+
+class EarningsStore:
+    """EPS history per symbol in one JSON file, with precomputed aggregates.
+
+    A symbol is refetched only when it has never been fetched, when a report
+    date recorded via ``note_report`` has passed since the last fetch, or when
+    the entry is older than ``max_age_days`` (catches reports we never saw on
+    the calendar).
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        windows: Iterable[int] = EARNINGS_HISTORY_WINDOWS,
+        max_age_days: int = EARNINGS_HISTORY_MAX_AGE_DAYS
+    ):
+        self.path = Path(path) if path else CACHE_DIR / "earnings.json"
+        self.windows = tuple(sorted(set(windows)))
+        self.max_age_days = max_age_days
+        self.entries: Dict[str, dict] = self._load()
+        self.last_refresh: dict = {}
+        self._dirty = False
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data.get("symbols", {})
+        except Exception as e:
+            print(f"[Warning] Earnings store unreadable, rebuilding: {e}")
+            return {}
+
+    def save(self):
+        """Write the store atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"updated": datetime.now().isoformat(), "symbols": self.entries}, f)
+        os.replace(tmp, self.path)
+
+    def note_report(self, symbol: str, report_date: str):
+        """Remember an upcoming (or just-passed) report date from the calendar."""
+        entry = self.entries.get(symbol.upper())
+        if entry is not None and report_date and entry.get("next_report") != report_date:
+            entry["next_report"] = report_date
+            self._dirty = True
+
+    def needs_refresh(self, symbol: str, today: Optional[date] = None) -> bool:
+        """Whether the stored history may be missing a report."""
+        entry = self.entries.get(symbol.upper())
+        if entry is None:
+            return True
+        today = today or date.today()
+        fetched = date.fromisoformat(entry["fetched"])
+        if today - fetched > timedelta(days=self.max_age_days):
+            return True
+        next_report = entry.get("next_report")
+        # A report on the fetch day may have landed after the fetch (AMC), so refetch the day after
+        return bool(next_report) and date.fromisoformat(next_report) >= fetched and today > date.fromisoformat(next_report)
+
+    def _put(self, symbol: str, history: List[dict], today: date):
+        history = sorted(history, key=lambda e: e.get("period") or "", reverse=True)
+        previous = self.entries.get(symbol, {})
+        next_report = previous.get("next_report")
+        if next_report and today > date.fromisoformat(next_report):
+            next_report = None  # Consumed: this fetch happened after the report
+        self.entries[symbol] = {
+            "fetched": today.isoformat(),
+            "next_report": next_report,
+            "history": history,
+            "aggregates": aggregate(history, self.windows),
+        }
+
+    def refresh(self, symbols: Iterable[str], fetch: Callable[[str], List[dict]], today: Optional[date] = None):
+        """Fetch history for symbols that need it and persist the store.
+
+        ``fetch`` returns a symbol's EPS history, most recent first. Symbols whose
+        fetch fails (raises or returns nothing) keep their previous entry.
+        """
+        today = today or date.today()
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        stale = [s for s in symbols if self.needs_refresh(s, today)]
+        fetched = 0
+        for symbol in stale:
+            try:
+                history = fetch(symbol)
+            except Exception as e:
+                print(f"[Warning] Failed to fetch earnings history for {symbol}: {e}")
+                continue
+            if history:
+                self._put(symbol, history, today)
+                self._dirty = True
+                fetched += 1
+        self.last_refresh = {"symbols": len(symbols), "cached": len(symbols) - len(stale), "fetched": fetched}
+        if self._dirty:
+            try:
+                self.save()
+                self._dirty = False
+            except OSError as e:
+                print(f"[Warning] Failed to save earnings store: {e}")
+
+    def history(self, symbol: str) -> List[dict]:
+        """Stored EPS history, most recent first."""
+        return self.entries.get(symbol.upper(), {}).get("history", [])
+
+    def aggregates(self, symbol: str, quarters: int) -> dict:
+        """Beat rate and average surprise over the last ``quarters`` reports."""
+        entry = self.entries.get(symbol.upper())
+        if entry is None:
+            return {"quarters": 0, "beat_rate": None, "avg_surprise_pct": None}
+        cached = entry.get("aggregates", {}).get(str(quarters))
+        return cached if cached is not None else aggregate(entry["history"], [quarters])[str(quarters)]
@@ -0,0 +1,175 @@
+"""Price Store - Memory-mapped columnar daily OHLCV with incremental updates."""
+
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import CACHE_DIR, PRICE_HISTORY_BARS
+from ..market_data import FIELDS, PricePanel, download_price_panel
+
+
+class PriceStore:
+    """Daily OHLCV persisted as one (tickers x days) ``.npy`` file per field.
+
+    ``load()`` memory-maps the arrays read-only, so scanners index straight
+    into the page cache instead of copying. ``sync()`` fetches only the bars
+    missing since each ticker's last stored day.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bars: int = PRICE_HISTORY_BARS):
+        self.root = Path(root) if root else CACHE_DIR / "prices"
+        self.max_bars = max_bars
+        self.adjust_tolerance = 0.005  # 0.5% drift on the overlap bar means split/dividend re-adjustment
+        self.stale_days = 30  # Drop tickers that haven't been synced in this long
+        self.last_sync: dict = {}
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    def _empty(self) -> PricePanel:
+        return PricePanel([], np.array([], dtype="datetime64[D]"), {f: np.empty((0, 0)) for f in FIELDS})
+
+    def load(self) -> PricePanel:
+        """Memory-map the stored panel (empty panel if nothing is stored yet)."""
+        meta_path = self._path("meta.json")
+        if not meta_path.exists():
+            return self._empty()
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            tickers = meta["tickers"]
+            dates = np.load(self._path("dates.npy"))
+            fields = {f: np.load(self._path(f"{f}.npy"), mmap_mode="r") for f in FIELDS}
+            expected = (len(tickers), len(dates))
+            if any(arr.shape != expected for arr in fields.values()):
+                raise ValueError(f"shape mismatch, expected {expected}")
+            return PricePanel(tickers, dates, fields)
+        except Exception as e:
+            print(f"[Warning] Price store unreadable, rebuilding: {e}")
+            return self._empty()
+
+    def _save_array(self, name: str, array: np.ndarray):
+        tmp = self._path(f"{name}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp, self._path(name))
+
+    def _write(self, panel: PricePanel):
+        """Write arrays first and metadata last so readers never see a mixed state."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for field in FIELDS:
+            self._save_array(f"{field}.npy", panel.fields[field])
+        self._save_array("dates.npy", panel.dates)
+        tmp = self._path("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"tickers": panel.tickers, "updated": datetime.now().isoformat()}, f)
+        os.replace(tmp, self._path("meta.json"))
+
+    @staticmethod
+    def _last_valid(row: np.ndarray) -> Optional[int]:
+        valid = np.flatnonzero(~np.isnan(row))
+        return int(valid[-1]) if len(valid) else None
+
+    def _full_period(self) -> str:
+        return "1y" if self.max_bars <= 250 else "2y"
+
+    def _merge(self, stored: PricePanel, updates: List[PricePanel], replaced: set) -> PricePanel:
+        """Overlay fetched bars onto the stored panel on a common, trimmed date axis."""
+        tickers = list(dict.fromkeys(stored.tickers + [t for p in updates for t in p.tickers]))
+        dates = np.unique(np.concatenate([stored.dates] + [p.dates for p in updates]))
+        dates = dates[-self.max_bars:]
+        index = {t: i for i, t in enumerate(tickers)}
+        fields = {f: np.full((len(tickers), len(dates)), np.nan) for f in FIELDS}
+
+        def overlay(panel: PricePanel, skip: set):
+            src_cols = np.flatnonzero(np.isin(panel.dates, dates))
+            dst_cols = np.searchsorted(dates, panel.dates[src_cols])
+            for src, t in enumerate(panel.tickers):
+                if t in skip:
+                    continue
+                dst = index[t]
+                for f in FIELDS:
+                    values = np.asarray(panel.fields[f][src, src_cols])
+                    keep = ~np.isnan(values)
+                    fields[f][dst, dst_cols[keep]] = values[keep]
+
+        overlay(stored, skip=replaced)
+        for panel in updates:
+            overlay(panel, skip=set())
+
+        # Forget tickers nobody has asked for in a while (removed from watchlist, delisted)
+        if len(dates):
+            cutoff = dates[-1] - np.timedelta64(self.stale_days, "D")
+            keep_rows = []
+            for i in range(len(tickers)):
+                last = self._last_valid(fields["close"][i])
+                if last is not None and dates[last] >= cutoff:
+                    keep_rows.append(i)
+            tickers = [tickers[i] for i in keep_rows]
+            fields = {f: arr[keep_rows] for f, arr in fields.items()}
+        return PricePanel(tickers, dates, fields)
+
+    def sync(self, tickers: List[str]) -> PricePanel:
+        """Bring ``tickers`` up to date and return the memory-mapped panel."""
+        stored = self.load()
+        tickers = list(dict.fromkeys(tickers))
+
+        full: List[str] = []
+        by_start: Dict[str, List[str]] = defaultdict(list)
+        for ticker in tickers:
+            row = stored.row(ticker)
+            last = self._last_valid(row) if row is not None else None
+            if last is None:
+                full.append(ticker)
+            else:
+                # Refetch the last stored bar too: it may have been a partial
+                # intraday bar, and it lets us detect re-adjusted history
+                by_start[str(stored.dates[last])].append(ticker)
+
+        updates = []
+        requests = 0
+        for start, batch in by_start.items():
+            fresh = download_price_panel(batch, start=start)
+            requests += 1
+            col_new, col_old = fresh.column(start), stored.column(start)
+            for ticker in batch:
+                if col_new is None or col_old is None:
+                    continue
+                new = fresh.row(ticker)[col_new]
+                old = stored.row(ticker)[col_old]
+                if not np.isnan(new) and old and abs(new - old) / old > self.adjust_tolerance:
+                    full.append(ticker)
+            updates.append(fresh)
+
+        replaced = set(full) & set(stored.tickers)
+        if full:
+            updates = [self._drop(p, replaced) for p in updates]
+            updates.append(download_price_panel(full, period=self._full_period()))
+            requests += 1
+
+        self.last_sync = {
+            "tickers": len(tickers),
+            "incremental": sum(len(b) for b in by_start.values()) - len(replaced),
+            "full": len(full),
+            "requests": requests,
+        }
+        if not updates:
+            return stored
+
+        self._write(self._merge(stored, updates, replaced))
+        return self.load()
+
+    @staticmethod
+    def _drop(panel: PricePanel, tickers: set) -> PricePanel:
+        """Panel without the given tickers."""
+        keep = [i for i, t in enumerate(panel.tickers) if t not in tickers]
+        return PricePanel(
+            [panel.tickers[i] for i in keep],
+            panel.dates,
+            {f: arr[keep] for f, arr in panel.fields.items()}
+        )
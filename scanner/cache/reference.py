@@ -0,0 +1,122 @@
+"""Reference Store - Slow-moving per-ticker fields refreshed on their publication schedule."""
+
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from ..config import (
+    CACHE_DIR,
+    REFERENCE_MAX_AGE_DAYS,
+    SHORT_INTEREST_CYCLE_DAYS,
+    SHORT_INTEREST_PUBLICATION_LAG_DAYS,
+)
+
+SHORT_INTEREST = "short_interest"  # {"ratio", "pct_float", "settlement"}
+YEAR_RANGE = "year_range"          # {"high", "low"}
+PROFILE = "profile"                # {"name"}
+
+
+class ReferenceStore:
+    """Compact reference fields per ticker and dataset in one JSON file.
+
+    Scanners read with ``get`` (a dict lookup) and call ``refresh`` once per
+    run for their universe; only entries whose next publication is due are
+    refetched. Thread-safe so concurrent scanner stages can share it.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else CACHE_DIR / "reference.json"
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, dict]] = self._load()
+        self.last_refresh: Dict[str, dict] = {}
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("datasets", {})
+        except Exception as e:
+            print(f"[Warning] Reference store unreadable, rebuilding: {e}")
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"updated": datetime.now().isoformat(), "datasets": self.entries}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def get(self, dataset: str, symbol: str) -> Optional[dict]:
+        """Stored fields for a symbol, or None if never fetched."""
+        with self._lock:
+            entry = self.entries.get(dataset, {}).get(symbol.upper())
+            return dict(entry) if entry else None
+
+    def is_due(self, dataset: str, symbol: str, today: Optional[date] = None) -> bool:
+        """Whether a newer publication may exist than the stored one."""
+        today = today or date.today()
+        with self._lock:
+            entry = self.entries.get(dataset, {}).get(symbol.upper())
+        if entry is None:
+            return True
+        fetched = date.fromisoformat(entry["fetched"])
+        if fetched >= today:
+            return False
+        if dataset == SHORT_INTEREST and entry.get("settlement"):
+            # Settlements are twice a month and published about a week and a half later
+            next_release = date.fromisoformat(entry["settlement"][:10]) + timedelta(
+                days=SHORT_INTEREST_CYCLE_DAYS + SHORT_INTEREST_PUBLICATION_LAG_DAYS
+            )
+            return today >= next_release
+        return (today - fetched).days >= REFERENCE_MAX_AGE_DAYS.get(dataset, 1)
+
+    def refresh(
+        self,
+        dataset: str,
+        symbols: Iterable[str],
+        fetch: Callable[[str], Optional[dict]],
+        today: Optional[date] = None
+    ):
+        """Refetch due entries; ``fetch`` returns the compact fields or None.
+
+        Failed fetches keep the previous entry so a provider outage degrades to
+        slightly older data rather than none.
+        """
+        today = today or date.today()
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        due = [s for s in symbols if self.is_due(dataset, s, today)]
+        updated = {}
+        for symbol in due:
+            try:
+                fields = fetch(symbol)
+            except Exception as e:
+                print(f"[Warning] Failed to refresh {dataset} for {symbol}: {e}")
+                continue
+            # An empty result is still recorded so symbols without data aren't refetched every run
+            updated[symbol] = {**(fields or {}), "fetched": today.isoformat()}
+
+        with self._lock:
+            self.entries.setdefault(dataset, {}).update(updated)
+            self.last_refresh[dataset] = {"symbols": len(symbols), "cached": len(symbols) - len(due), "fetched": len(updated)}
+            if updated:
+                try:
+                    self._save()
+                except OSError as e:
+                    print(f"[Warning] Failed to save reference store: {e}")
+
+
+_store: Optional[ReferenceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_reference_store() -> ReferenceStore:
+    """Process-wide reference store shared by all scanners."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReferenceStore()
+        return _store
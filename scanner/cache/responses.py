@@ -0,0 +1,152 @@
+"""Response Cache - SQLite-backed provider response cache with per-endpoint TTLs."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..config import CACHE_DIR, RESPONSE_CACHE_TTLS
+
+MODE_ON = "on"            # Read fresh entries, store new responses
+MODE_REFRESH = "refresh"  # Ignore stored entries but store new responses
+MODE_OFF = "off"          # Bypass the cache entirely
+
+
+class ResponseCache:
+    """Key/value store of decoded JSON responses with expiry times."""
+
+    def __init__(self, path: Optional[Path] = None, mode: str = MODE_ON):
+        self.path = Path(path) if path else CACHE_DIR / "responses.sqlite"
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.by_endpoint: dict = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, endpoint TEXT, value TEXT, stored REAL, expires REAL)"
+            )
+            conn.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def ttl_for(endpoint: str) -> int:
+        """Configured TTL in seconds (0 = never cache)."""
+        return RESPONSE_CACHE_TTLS.get(endpoint, 0)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[dict] = None) -> str:
+        """Stable key from endpoint and request params."""
+        return f"{endpoint}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def _count(self, endpoint: str, hit: bool):
+        stats = self.by_endpoint.setdefault(endpoint, {"hits": 0, "misses": 0})
+        if hit:
+            self.hits += 1
+            stats["hits"] += 1
+        else:
+            self.misses += 1
+            stats["misses"] += 1
+
+    def _get(self, key: str) -> tuple:
+        """Return (hit, value) for a fresh entry."""
+        if self.mode != MODE_ON:
+            return False, None
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT value FROM responses WHERE key = ? AND expires >= ?", (key, time.time())
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[Warning] Response cache read failed: {e}")
+                row = None
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def _set(self, endpoint: str, key: str, value: Any, ttl: int):
+        """Store a JSON-serializable value for ``ttl`` seconds."""
+        if self.mode == MODE_OFF or ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, endpoint, value, stored, expires) VALUES (?, ?, ?, ?, ?)",
+                    (key, endpoint, json.dumps(value), now, now + ttl)
+                )
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"[Warning] Response cache write failed for {endpoint}: {e}")
+
+    def enabled_for(self, endpoint: str) -> bool:
+        """Whether responses for this endpoint are cached at all."""
+        return self.mode != MODE_OFF and self.ttl_for(endpoint) > 0
+
+    def lookup(self, endpoint: str, params: Optional[dict] = None) -> tuple:
+        """Return (hit, value) for (endpoint, params) and count the hit or miss."""
+        if not self.enabled_for(endpoint):
+            return False, None
+        hit, value = self._get(self.make_key(endpoint, params))
+        with self._lock:
+            self._count(endpoint, hit)
+        return hit, value
+
+    def store(self, endpoint: str, params: Optional[dict], value: Any):
+        """Store a response for (endpoint, params) using the endpoint's TTL."""
+        if self.enabled_for(endpoint):
+            self._set(endpoint, self.make_key(endpoint, params), value, self.ttl_for(endpoint))
+
+    def fetch(self, endpoint: str, params: Optional[dict], loader: Callable[[], Any]) -> Any:
+        """Return a cached value for (endpoint, params) or call ``loader`` and store it."""
+        hit, value = self.lookup(endpoint, params)
+        if hit:
+            return value
+        value = loader()
+        self.store(endpoint, params, value)
+        return value
+
+    def stats(self) -> dict:
+        """Hit/miss totals and per-endpoint breakdown."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "by_endpoint": {k: dict(v) for k, v in self.by_endpoint.items()},
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache shared by all provider calls."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def configure_response_cache(mode: str = MODE_ON, path: Optional[Path] = None) -> ResponseCache:
+    """Replace the process-wide cache, e.g. from --no-cache / --refresh."""
+    global _cache
+    with _cache_lock:
+        _cache = ResponseCache(path=path, mode=mode)
+        return _cache
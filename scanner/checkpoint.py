@@ -0,0 +1,126 @@
+"""Run Checkpoints - Each stage's output saved as it finishes, for resuming a failed run.
+
+A run directory (``logs/run-YYYY-MM-DD/``, or ``run-YYYY-MM-DD-dry-run/`` for
+dry runs) holds one JSON file per stage plus ``manifest.json`` recording each
+stage's status. Pydantic models are stored
+with their class path and validated back on load, so resumed stages hand the
+rest of the pipeline the same types a fresh run would.
+"""
+
+import importlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from .config import LOGS_DIR
+
+_MODEL_KEY = "__model__"
+
+
+def encode(value: Any) -> Any:
+    """JSON-ready form of a stage result; TypeError for anything else (e.g. numpy panels)."""
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        return {_MODEL_KEY: f"{cls.__module__}:{cls.__qualname__}", "data": value.model_dump(mode="json")}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError("only string keys can be checkpointed")
+        return {k: encode(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"cannot checkpoint {type(value).__name__}")
+
+
+def decode(value: Any) -> Any:
+    """Inverse of ``encode``; models are only loaded from this package."""
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if isinstance(value, dict):
+        if _MODEL_KEY in value:
+            module, _, name = value[_MODEL_KEY].partition(":")
+            if module.split(".")[0] != __name__.split(".")[0]:
+                raise ValueError(f"refusing to load model from {module}")
+            return getattr(importlib.import_module(module), name).model_validate(value["data"])
+        return {k: decode(v) for k, v in value.items()}
+    return value
+
+
+class RunCheckpoint:
+    """Stage outputs and statuses for one day's run."""
+
+    def __init__(self, run_dir: Optional[Path] = None, dry_run: bool = False):
+        # Dry runs keep their own directory so they never clear a real run's state
+        name = f"run-{datetime.now().strftime('%Y-%m-%d')}{'-dry-run' if dry_run else ''}"
+        self.dir = Path(run_dir) if run_dir else LOGS_DIR / name
+        self.manifest: Dict[str, dict] = {}
+
+    def _write_json(self, path: Path, payload: Any):
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def _save_manifest(self):
+        self._write_json(self.dir / "manifest.json", {"updated": datetime.now().isoformat(), "stages": self.manifest})
+
+    def start(self, resume: bool = False):
+        """Load the existing manifest to resume, or clear the directory for a fresh run."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.dir / "manifest.json"
+        if resume and manifest_path.exists():
+            try:
+                with open(manifest_path) as f:
+                    self.manifest = json.load(f).get("stages", {})
+            except Exception as e:
+                print(f"[Warning] Run manifest unreadable, starting fresh: {e}")
+                self.manifest = {}
+            return
+        for path in self.dir.glob("*.json"):
+            path.unlink()
+        self.manifest = {}
+
+    def save(self, name: str, value: Any, status: str = "ok") -> bool:
+        """Record a finished stage; the output is written only for ``ok`` stages that can be encoded."""
+        saved = False
+        if status == "ok":
+            try:
+                self._write_json(self.dir / f"{name}.json", encode(value))
+                saved = True
+            except TypeError:
+                pass  # Intermediate results (price panels) are recomputed if anything needs them
+            except OSError as e:
+                print(f"[Warning] Failed to checkpoint {name}: {e}")
+        self.manifest[name] = {"status": status, "saved": saved, "at": datetime.now().isoformat()}
+        try:
+            self._save_manifest()
+        except OSError as e:
+            print(f"[Warning] Failed to update run manifest: {e}")
+        return saved
+
+    def is_done(self, name: str) -> bool:
+        return self.manifest.get(name, {}).get("status") == "ok"
+
+    def load(self, name: str) -> Any:
+        with open(self.dir / f"{name}.json") as f:
+            return decode(json.load(f))
+
+    def completed(self) -> Tuple[Dict[str, Any], Set[str]]:
+        """Saved outputs of ``ok`` stages, and the ``ok`` stages whose output wasn't saveable."""
+        results, unsaved = {}, set()
+        for name, entry in self.manifest.items():
+            if entry.get("status") != "ok":
+                continue
+            if not entry.get("saved"):
+                unsaved.add(name)
+                continue
+            try:
+                results[name] = self.load(name)
+            except Exception as e:
+                print(f"[Warning] Checkpoint for {name} unreadable, rerunning: {e}")
+        return results, unsaved
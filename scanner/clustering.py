@@ -0,0 +1,98 @@
+"""News Clustering - Collapse near-duplicate headlines with MinHash + LSH.
+
+Syndicated stories arrive as several lightly reworded headlines. Each title
+becomes a set of character shingles, MinHash signatures estimate Jaccard
+similarity, and LSH banding limits comparisons to likely pairs, so cost
+stays near-linear in the number of articles.
+"""
+
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+from .config import NEWS_CLUSTER_THRESHOLD
+from .models import NewsResult
+
+_PRIME = 4294967311  # Smallest prime above 2**32; with 32-bit inputs a*x + b fits in uint64
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def shingles(text: str, k: int = 5) -> np.ndarray:
+    """CRC32 hashes of the character k-grams of normalized text."""
+    norm = " ".join(_NON_WORD.sub(" ", text.lower()).split())
+    if len(norm) <= k:
+        grams = {norm}
+    else:
+        grams = {norm[i:i + k] for i in range(len(norm) - k + 1)}
+    return np.array([zlib.crc32(g.encode("utf-8")) for g in grams], dtype=np.uint64)
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash functions."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        if len(hashes) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        values = (hashes[:, None] * self.a[None, :] + self.b[None, :]) % _PRIME
+        return values.min(axis=0)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_titles(titles: List[str], threshold: float = NEWS_CLUSTER_THRESHOLD, bands: int = 32) -> List[List[int]]:
+    """Group indices of near-duplicate titles (estimated Jaccard >= threshold)."""
+    if not titles:
+        return []
+    hasher = MinHasher()
+    signatures = np.stack([hasher.signature(shingles(t)) for t in titles])
+    rows = hasher.num_perm // bands
+    parent = list(range(len(titles)))
+
+    for band in range(bands):
+        buckets: dict = {}
+        chunk = signatures[:, band * rows:(band + 1) * rows]
+        for i, row in enumerate(chunk):
+            buckets.setdefault(row.tobytes(), []).append(i)
+        for members in buckets.values():
+            for j in members[1:]:
+                i = members[0]
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri != rj and np.mean(signatures[i] == signatures[j]) >= threshold:
+                    parent[rj] = ri
+
+    groups: dict = {}
+    for i in range(len(titles)):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return list(groups.values())
+
+
+def cluster_news(news: List[NewsResult], threshold: float = NEWS_CLUSTER_THRESHOLD) -> List[NewsResult]:
+    """One representative per story: strongest score (then most recent), with
+    the cluster's distinct source count and every ticker it mentioned."""
+    clusters = []
+    for members in cluster_titles([n.title for n in news], threshold):
+        items = [news[i] for i in members]
+        rep = max(items, key=lambda n: (abs(n.sentiment_score), n.published_date))
+        tickers = list(dict.fromkeys(
+            [rep.symbol] + [s for n in items for s in [n.symbol] + n.related_symbols]
+        ))
+        sources = {n.source for n in items}
+        clusters.append(rep.model_copy(update={
+            "related_symbols": tickers[1:],
+            "source_count": max(len(sources), rep.source_count),
+        }))
+    clusters.sort(key=lambda x: abs(x.sentiment_score), reverse=True)
+    return clusters
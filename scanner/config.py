@@ -10,6 +10,7 @@ load_dotenv()
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 LOGS_DIR = BASE_DIR.parent / "logs"
+CACHE_DIR = Path(os.getenv("SCANNER_CACHE_DIR", LOGS_DIR / "cache"))
 
 # API Keys (reuse from stocker)
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
@@ -20,12 +21,92 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
 FMP_BASE_URL = "https://financialmodelingprep.com/stable"
 
+# Finnhub rate limit (free tier: 60 calls/min)
+FINNHUB_CALLS_PER_MINUTE = int(os.getenv("FINNHUB_CALLS_PER_MINUTE", "60"))
+FINNHUB_BURST = int(os.getenv("FINNHUB_BURST", "5"))  # Calls allowed back-to-back before pacing kicks in
+
 # Scanner settings
 EARNINGS_LOOKAHEAD_DAYS = 7
 SCAN_LOOKBACK_HOURS = 24
 VOLUME_THRESHOLD = 1.5  # 1.5x average volume
 PRICE_CHANGE_THRESHOLD = 3.0  # 3% price change
 
+# Local price store
+PRICE_HISTORY_BARS = int(os.getenv("PRICE_HISTORY_BARS", "300"))  # Daily bars kept per ticker (200MA + buffer)
+
+# Earnings history store
+EARNINGS_HISTORY_WINDOWS = (4, 8, 12)  # Quarter windows with precomputed beat rate / surprise
+EARNINGS_HISTORY_QUARTERS = int(os.getenv("EARNINGS_HISTORY_QUARTERS", "4"))  # Window reported in EarningsResult
+EARNINGS_HISTORY_MAX_AGE_DAYS = 100  # Refetch anyway after this long (a quarter plus slack)
+
+# Reference data store (slow-moving per-ticker fields)
+REFERENCE_MAX_AGE_DAYS = {
+    "short_interest": 16,  # Used when no settlement date is known
+    "year_range": 7,       # 52-week high/low fallback; widened daily with the live quote
+    "profile": 30,         # Company names for mapping bulk news to tickers
+}
+SHORT_INTEREST_CYCLE_DAYS = 15            # Settlement dates are mid-month and month-end
+SHORT_INTEREST_PUBLICATION_LAG_DAYS = 9   # Data is published ~7 business days after settlement
+
+# News article index
+NEWS_INDEX_RETENTION_HOURS = 72  # Seen articles kept this long (by publish time)
+NEWS_CLUSTER_THRESHOLD = 0.5     # Estimated headline Jaccard similarity that merges two stories
+
+# News ingestion: "ticker" = one /company-news call per ticker, "bulk" = a few
+# /news feed calls mapped to tickers locally (portfolio names still fetched per ticker)
+NEWS_INGEST_MODE = os.getenv("NEWS_INGEST_MODE", "ticker")
+NEWS_BULK_CATEGORIES = ("general", "merger")
+
+# Response cache TTLs in seconds, keyed by "<provider>:<endpoint>" (0 or missing = never cached)
+RESPONSE_CACHE_TTLS = {
+    "finnhub:/quote": 30,
+    "finnhub:/company-news": 15 * 60,
+    "finnhub:/news": 5 * 60,
+    "finnhub:/calendar/economic": 6 * 3600,
+    "finnhub:/calendar/earnings": 6 * 3600,
+    "fmp:/earnings-calendar": 6 * 3600,
+    "yahoo:quote": 60,
+    "yahoo:options/expirations": 6 * 3600,
+    "yahoo:options/chain": 5 * 60,
+}
+# Cached Claude responses (keyed by request hash) are kept this long
+ANALYSIS_CACHE_MAX_AGE_DAYS = float(os.getenv("ANALYSIS_CACHE_MAX_AGE_DAYS", "7"))
+
+# Claude analysis
+ANALYZER_STREAMING = os.getenv("ANALYZER_STREAMING", "true").lower() == "true"  # Stream and parse the response incrementally
+ANALYZER_MODE = os.getenv("ANALYZER_MODE", "single")  # "single" call, or "sharded": one call per watchlist key plus a ranking call
+ANALYZER_SHARD_CANDIDATES = int(os.getenv("ANALYZER_SHARD_CANDIDATES", "3"))  # Candidate setups each sector call may propose
+ANALYZER_SHARD_WORKERS = int(os.getenv("ANALYZER_SHARD_WORKERS", "6"))  # Concurrent sector calls
+ANALYZER_SLA_SECONDS = float(os.getenv("ANALYZER_SLA_SECONDS", "240"))  # Abandon a Claude call (and its hedge) after this long
+ANALYZER_HEDGE_AFTER_SECONDS = float(os.getenv("ANALYZER_HEDGE_AFTER_SECONDS", "90"))  # Send a hedged request if none answered yet (0 = never)
+ANALYZER_FALLBACK_MODEL = os.getenv("ANALYZER_FALLBACK_MODEL", "")  # Model for the hedged request (empty = same model)
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL") or None  # Override the API endpoint, e.g. a local stub
+PRERANK_TOP_N = int(os.getenv("PRERANK_TOP_N", "30"))  # Tickers sent to Claude in full detail, plus portfolio holdings (0 = all)
+PRERANK_WEIGHTS = {  # Composite score weight per signal (each signal is scaled to 0-1 first)
+    "premarket": 2,
+    "news": 2,
+    "momentum": 1.5,
+    "options": 1.5,
+    "earnings": 1.5,
+    "rsi": 1,
+    "portfolio": 1,
+}
+PROMPT_ENCODING = os.getenv("PROMPT_ENCODING", "prose")  # "prose" or "table" (header row + one delimited row per ticker)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))  # Estimated tokens for per-run scan data
+PROMPT_SECTION_WEIGHTS = {  # Relative share of the budget when sections must be trimmed
+    "news": 3,
+    "earnings": 2,
+    "momentum": 2,
+    "technicals": 2,
+    "options_flow": 2,
+    "call_put_ratios": 1,
+    "premarket": 1,
+}
+
+# Pipeline settings
+SCANNER_MAX_WORKERS = int(os.getenv("SCANNER_MAX_WORKERS", "8"))
+STAGE_TIMEOUT_SECONDS = float(os.getenv("STAGE_TIMEOUT_SECONDS", "600"))  # Per-stage wall-clock limit
+
 # Email (Resend)
 SEND_EMAIL = os.getenv("SEND_EMAIL", "false").lower() == "true"
 RESEND_API_KEY = os.getenv("RESEND_API_KEY")
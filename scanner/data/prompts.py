@@ -101,11 +101,33 @@ IMPORTANT: Respond in valid JSON format matching this structure:
 Be direct and actionable. No fluff. Traders reading this have 30 minutes before market open."""
 
 
-# Template for the user prompt sent to Claude
+# Static context sent right after SYSTEM_PROMPT. Together they form the
+# cached prompt prefix, so keep anything that changes per run out of here.
+# Available variables: {sectors}, {portfolio_context}
+STATIC_CONTEXT_TEMPLATE = """## Analysis Guidelines
+
+IMPORTANT CONSIDERATIONS:
+- If VIX > 25, be cautious with aggressive setups — prefer swings with defined risk over intraday scalps
+- RSI > 70 = overbought (risky to go long), RSI < 30 = oversold (potential bounce)
+- Stocks below 200 MA are in downtrends — need strong catalyst to go long
+- High short interest + catalyst = potential squeeze
+- Options flow with high Vol/OI often signals smart money positioning
+- PRE-MARKET MOVERS: If a stock not on watchlist is moving significantly, flag it
+- MACRO LANDMINES: If Fed/CPI/Jobs data or major earnings are imminent, factor this risk into recommendations
+- For day trades: be very specific on entry trigger, target, and stop
+- For swings: include a time horizon and be clear on what invalidates the thesis
+- [PORTFOLIO] stocks: always address position management (add/hold/trim/hedge)
+
+### SECTOR CONTEXT
+{sectors}
+
+{portfolio_context}"""
+
+
+# Scan data shared by the single-call and per-sector prompts (per-run data only)
 # Available variables: {date}, {market_context}, {premarket}, {macro_warnings},
-#                      {earnings}, {news}, {momentum}, {technicals}, {options},
-#                      {sectors}, {portfolio_context}
-USER_PROMPT_TEMPLATE = """## Market Scan Results - {date}
+#                      {earnings}, {news}, {momentum}, {technicals}, {options}
+SCAN_DATA_TEMPLATE = """## Market Scan Results - {date}
 
 ### MARKET CONTEXT
 {market_context}
@@ -130,25 +152,67 @@ USER_PROMPT_TEMPLATE = """## Market Scan Results - {date}
 
 ### OPTIONS FLOW
 {options}
+"""
 
-### SECTOR CONTEXT
-{sectors}
 
-{portfolio_context}
+# Template for the user prompt sent to Claude in a single-call scan
+USER_PROMPT_TEMPLATE = SCAN_DATA_TEMPLATE + """
 ---
 
-Analyze this data and provide your TOP 3 opportunities for today.
+Analyze this data and provide your TOP 3 opportunities for today, following the analysis guidelines.
 
-IMPORTANT CONSIDERATIONS:
-- If VIX > 25, be cautious with aggressive setups — prefer swings with defined risk over intraday scalps
-- RSI > 70 = overbought (risky to go long), RSI < 30 = oversold (potential bounce)
-- Stocks below 200 MA are in downtrends — need strong catalyst to go long
-- High short interest + catalyst = potential squeeze
-- Options flow with high Vol/OI often signals smart money positioning
-- PRE-MARKET MOVERS: If a stock not on watchlist is moving significantly, flag it
-- MACRO LANDMINES: If Fed/CPI/Jobs data or major earnings are imminent, factor this risk into recommendations
-- For day trades: be very specific on entry trigger, target, and stop
-- For swings: include a time horizon and be clear on what invalidates the thesis
-- [PORTFOLIO] stocks: always address position management (add/hold/trim/hedge)
+Respond with valid JSON only, no markdown code blocks."""
+
+
+# Template for one sector's call in a sharded scan (ANALYZER_MODE=sharded)
+# Additional variables: {sector}, {tickers}, {candidates}
+SECTOR_PROMPT_TEMPLATE = SCAN_DATA_TEMPLATE + """
+---
+
+This is one slice of a larger scan: the data above covers only the {sector} tickers ({tickers}). \
+Other sectors are analyzed separately, and a final pass ranks candidates from every sector.
+
+Instead of a TOP 3, provide up to {candidates} candidate opportunities from these tickers, ranked by conviction, \
+with watchlist and no_action limited to these tickers and sector_summary containing only "{sector}". \
+Use the same JSON structure and field definitions.
+
+Respond with valid JSON only, no markdown code blocks."""
+
+
+# Final cross-sector ranking call in a sharded scan
+RANKING_SYSTEM_PROMPT = """You are a pre-market trading analyst making the final cut for today.
+
+Sector analysts have each proposed candidate setups from their slice of the watchlist. Your job:
+1. Pick the TOP 3 candidates across all sectors, ranked by conviction (risk-adjusted potential, catalyst timing, setup clarity)
+2. Weigh the market context and macro landmines; when conviction is close, prefer setups from different sectors
+3. Pick 2-3 of the remaining names (unpicked candidates or sector watchlist picks) as the WATCHLIST
+
+Only use tickers that appear in the candidates or watchlist picks.
+
+IMPORTANT: Respond in valid JSON format matching this structure:
+{
+    "top_opportunities": [
+        {"ticker": "NVDA", "rank": 1}
+    ],
+    "watchlist": [
+        {"ticker": "SMR", "reason": "Reason here"}
+    ]
+}"""
+
+
+# Available variables: {date}, {market_context}, {macro_warnings}, {candidates}, {watchlist}
+RANKING_PROMPT_TEMPLATE = """## Cross-Sector Ranking - {date}
+
+### MARKET CONTEXT
+{market_context}
+
+### ⚠️ MACRO LANDMINES (Next 5 Days)
+{macro_warnings}
+
+### CANDIDATE SETUPS
+{candidates}
+
+### SECTOR WATCHLIST PICKS
+{watchlist}
 
 Respond with valid JSON only, no markdown code blocks."""
@@ -0,0 +1,131 @@
+"""Hedged Calls - Race a slow request against a late backup, within a latency SLA.
+
+The primary attempt starts immediately. If it has not produced an
+acceptable result after ``hedge_after`` seconds (or fails sooner), a hedge
+attempt starts, and whichever acceptable result arrives first wins. At
+``sla`` seconds both are abandoned. Attempts receive a ``threading.Event``
+that is set once the race is decided, so cooperative ones (streams) can
+stop early; blocking ones should carry their own timeout.
+
+Per-call timings are appended to a JSON-lines log so latency percentiles
+can be tracked run over run.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import LOGS_DIR
+
+Attempt = Callable[[threading.Event], Any]
+
+
+class RaceResult(NamedTuple):
+    value: Any          # The winning result, else the first non-None result seen, else None
+    winner: str         # Label of the attempt that won, or "none"
+    seconds: float
+    hedged: bool        # Whether the hedge attempt was started
+
+
+def race(
+    primary: Tuple[str, Attempt],
+    hedge: Optional[Tuple[str, Attempt]],
+    hedge_after: float,
+    sla: float,
+    accept: Callable[[Any], bool]
+) -> RaceResult:
+    """Run ``primary``, start ``hedge`` if needed, and return the first accepted result."""
+    start = time.monotonic()
+    cancel = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedge")
+    pending = {pool.submit(primary[1], cancel): primary[0]}
+    hedged = False
+    best: Tuple[Any, str] = (None, "none")
+
+    def start_hedge():
+        nonlocal hedged
+        hedged = True
+        pending[pool.submit(hedge[1], cancel)] = hedge[0]
+
+    try:
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= sla:
+                break
+            if not pending:
+                if hedge is None or hedged:
+                    break
+                start_hedge()  # Primary failed outright; the hedge doubles as a retry
+                continue
+            next_deadline = hedge_after if hedge is not None and not hedged else sla
+            done, _ = wait(pending, timeout=max(next_deadline - elapsed, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                label = pending.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    print(f"[Warning] {label} request failed: {e}")
+                    continue
+                if accept(value):
+                    return RaceResult(value, label, time.monotonic() - start, hedged)
+                if best[0] is None and value is not None:
+                    best = (value, label)
+            if not done and hedge is not None and not hedged and time.monotonic() - start >= hedge_after:
+                start_hedge()
+        if pending:
+            print(f"[Warning] No complete response within the {sla:.0f}s SLA; abandoning {len(pending)} request(s)")
+        return RaceResult(best[0], best[1], time.monotonic() - start, hedged)
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False)
+
+
+def percentiles(values: Sequence[float], qs: Sequence[int] = (50, 90, 99)) -> Dict[str, float]:
+    """``{"p50": ..., "p90": ..., "p99": ..., "max": ...}``, or {} for no values."""
+    if not len(values):
+        return {}
+    arr = np.asarray(values, dtype=float)
+    stats = {f"p{q}": float(np.percentile(arr, q)) for q in qs}
+    stats["max"] = float(arr.max())
+    return stats
+
+
+class LatencyLog:
+    """Append-only JSON-lines log of LLM call timings."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else LOGS_DIR / "llm-latency.jsonl"
+
+    def append(self, records: List[dict]):
+        if not records:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now().isoformat(timespec="seconds")
+            with open(self.path, "a") as f:
+                for record in records:
+                    f.write(json.dumps({"at": stamp, **record}) + "\n")
+        except OSError as e:
+            print(f"[Warning] Failed to write latency log: {e}")
+
+    def recent(self, days: float = 30) -> List[dict]:
+        """Records from the last ``days`` days."""
+        if not self.path.exists():
+            return []
+        cutoff = datetime.now().timestamp() - days * 86400
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if datetime.fromisoformat(record["at"]).timestamp() >= cutoff:
+                        records.append(record)
+                except (ValueError, KeyError):
+                    continue
+        return records
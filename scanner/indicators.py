@@ -0,0 +1,128 @@
+"""Indicator Engine - RSI, moving averages and crossovers for a whole universe at once.
+
+Every function takes a (tickers x days) close matrix, oldest day first, with
+NaN for missing bars, and works across all tickers with NumPy array ops.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """Carry the last valid value forward along each row; leading NaNs stay NaN."""
+    if matrix.size == 0:
+        return np.array(matrix, dtype=float)
+    valid = ~np.isnan(matrix)
+    idx = np.where(valid, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], idx]
+    # Rows whose first bar is NaN pick up column 0 (NaN) until their first valid bar
+    return filled
+
+
+def valid_counts(matrix: np.ndarray) -> np.ndarray:
+    """Number of non-NaN bars per row."""
+    return (~np.isnan(matrix)).sum(axis=1)
+
+
+def rolling_mean(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average per row; NaN until a full window of bars exists."""
+    n, days = matrix.shape
+    out = np.full((n, days), np.nan)
+    if days < window:
+        return out
+    valid = ~np.isnan(matrix)
+    sums = np.concatenate([np.zeros((n, 1)), np.cumsum(np.where(valid, matrix, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([np.zeros((n, 1), dtype=int), np.cumsum(valid, axis=1)], axis=1)
+    window_sums = sums[:, window:] - sums[:, :-window]
+    window_counts = counts[:, window:] - counts[:, :-window]
+    out[:, window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+    return out
+
+
+def wilder_rsi(matrix: np.ndarray, period: int = 14) -> np.ndarray:
+    """Latest Wilder RSI per row; NaN where fewer than ``period + 1`` bars exist.
+
+    The recursion runs over days (a few hundred steps), but each step updates
+    every ticker at once, so cost grows with days rather than tickers x days
+    Python iterations.
+    """
+    n, days = matrix.shape
+    if days < 2:
+        return np.full(n, np.nan)
+    deltas = np.diff(matrix, axis=1)
+    valid = ~np.isnan(deltas)
+    gains = np.where(valid & (deltas > 0), deltas, 0.0)
+    losses = np.where(valid & (deltas < 0), -deltas, 0.0)
+    seen = np.cumsum(valid, axis=1)
+
+    avg_gain = np.zeros(n)
+    avg_loss = np.zeros(n)
+    for t in range(deltas.shape[1]):
+        step = valid[:, t]
+        seeding = step & (seen[:, t] <= period)
+        smoothing = step & (seen[:, t] > period)
+        # First ``period`` deltas form a simple mean, then Wilder smoothing
+        avg_gain = np.where(seeding, avg_gain + gains[:, t] / period, avg_gain)
+        avg_loss = np.where(seeding, avg_loss + losses[:, t] / period, avg_loss)
+        avg_gain = np.where(smoothing, (avg_gain * (period - 1) + gains[:, t]) / period, avg_gain)
+        avg_loss = np.where(smoothing, (avg_loss * (period - 1) + losses[:, t]) / period, avg_loss)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    return np.where(seen[:, -1] >= period, rsi, np.nan)
+
+
+def last_crossover(fast: np.ndarray, slow: np.ndarray) -> tuple:
+    """Most recent day each row's ``fast`` crossed ``slow``.
+
+    Returns (day_index, direction): day_index is -1 where no cross exists;
+    direction is +1 for fast crossing above slow (golden), -1 for below (death).
+    """
+    n, days = fast.shape
+    side = np.sign(fast - slow)
+    side = np.where(np.isnan(side), 0, side)
+    if days < 2:
+        return np.full(n, -1), np.zeros(n, dtype=int)
+    # A touch (side == 0) is carried through so touch-and-reverse isn't a cross
+    carried = side.copy()
+    for t in range(1, days):
+        carried[:, t] = np.where(carried[:, t] == 0, carried[:, t - 1], carried[:, t])
+    crossed = (carried[:, 1:] != carried[:, :-1]) & (carried[:, :-1] != 0) & (carried[:, 1:] != 0)
+    has_cross = crossed.any(axis=1)
+    last = days - 1 - np.argmax(crossed[:, ::-1], axis=1)  # index into days (crossed is offset by 1)
+    direction = carried[np.arange(n), np.where(has_cross, last, 0)].astype(int)
+    return np.where(has_cross, last, -1), np.where(has_cross, direction, 0)
+
+
+class TechnicalIndicators:
+    """Indicator arrays for a universe, aligned with the input rows."""
+
+    def __init__(
+        self,
+        closes: np.ndarray,
+        dates: Optional[np.ndarray] = None,
+        rsi_period: int = 14,
+        fast: int = 50,
+        slow: int = 200
+    ):
+        filled = forward_fill(np.asarray(closes, dtype=float))
+        days = filled.shape[1]
+        self.dates = dates
+        self.bars = valid_counts(filled)
+        self.price = filled[:, -1] if days else np.full(len(filled), np.nan)
+        self.rsi = wilder_rsi(filled, rsi_period)
+        self.ma_fast_series = rolling_mean(filled, fast)
+        self.ma_slow_series = rolling_mean(filled, slow)
+        self.ma_fast = self.ma_fast_series[:, -1] if days else self.price.copy()
+        self.ma_slow = self.ma_slow_series[:, -1] if days else self.price.copy()
+        self.cross_index, self.cross_direction = last_crossover(self.ma_fast_series, self.ma_slow_series)
+        self.bars_since_cross = np.where(self.cross_index >= 0, days - 1 - self.cross_index, -1)
+
+    def cross_date(self, row: int) -> Optional[str]:
+        """YYYY-MM-DD of the row's latest crossover, if any."""
+        i = int(self.cross_index[row])
+        if i < 0 or self.dates is None:
+            return None
+        return str(np.datetime64(self.dates[i], "D"))
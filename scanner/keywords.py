@@ -0,0 +1,196 @@
+"""Keyword Matcher - Weighted bullish/bearish phrase matching in one regex pass.
+
+All phrases, their listed inflections and the negation words compile into
+a single word-boundary regex, so short terms like "ai" or "deal" no longer
+match inside "said" or "ideal", and a batch of articles is scanned with one
+``finditer`` over the joined text. Only the listed forms match: there is no
+blanket suffix, so "ai" does not match "aid".
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+NEGATIONS = (
+    "no", "not", "never", "without", "denies", "denied", "rejects", "rejected",
+    "fails", "failed", "won't", "isn't", "doesn't", "didn't", "unlikely",
+)
+
+_SEPARATOR = "\n\x00\n"  # Keeps matches and negation windows from spanning two articles
+_CLAUSE_BREAK = re.compile(r"[.!?;:]")
+_WORD = re.compile(r"[a-z']+")
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Regex alternation of ``phrases`` factored by common prefix."""
+    root: dict = {}
+    for phrase in phrases:
+        node = root
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End of a phrase
+
+    def build(node: dict) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(root)
+
+
+class KeywordHit(NamedTuple):
+    keyword: str
+    weight: int  # Positive for bullish, negative for bearish
+    negated: bool
+
+
+class KeywordMatcher:
+    """Scores text against weighted bullish and bearish phrases.
+
+    ``inflections`` maps a phrase to the other forms that count as it
+    ("deal" -> "deals"). A hit preceded by a negation word within
+    ``negation_window`` words of the same clause ("no deal", "denies fraud")
+    is reported as negated and does not count toward the score. Each phrase
+    counts once per text.
+    """
+
+    def __init__(
+        self,
+        bullish: Dict[str, int],
+        bearish: Dict[str, int],
+        negations: Iterable[str] = NEGATIONS,
+        negation_window: int = 3,
+        inflections: Optional[Dict[str, Iterable[str]]] = None
+    ):
+        def norm(phrase: str) -> str:
+            return " ".join(phrase.lower().split())
+
+        weights = {norm(kw): abs(w) for kw, w in bullish.items()}
+        weights.update({norm(kw): -abs(w) for kw, w in bearish.items()})
+        self.weights = weights
+        self.forms = {kw: kw for kw in weights}  # Matched form -> phrase
+        for kw, forms in (inflections or {}).items():
+            if norm(kw) in weights:
+                self.forms.update((norm(f), norm(kw)) for f in forms)
+        self.negations = frozenset(n.lower() for n in negations)
+        self.negation_window = negation_window
+        # Negations share the pass; phrases come first so they win at the same position
+        alternatives = f"({_trie_pattern(self.forms)})"
+        negations = self.negations - set(self.forms)
+        if negations:
+            alternatives += f"|{_trie_pattern(negations)}"
+        self.pattern = re.compile(rf"\b(?:{alternatives})\b")
+
+    def _negated(self, text: str, negation_end: int, start: int) -> bool:
+        """Whether a negation ending at ``negation_end`` still reaches the hit at ``start``."""
+        return (
+            start - negation_end <= 60
+            and _CLAUSE_BREAK.search(text, negation_end, start) is None
+            and len(_WORD.findall(text, negation_end, start)) < self.negation_window
+        )
+
+    def find_batch(self, texts: Sequence[str]) -> List[List[KeywordHit]]:
+        """Distinct hits per text, scanning the whole batch in one pass."""
+        lowered = [t.lower() for t in texts]  # Lowercasing can change length ("İ"), so offsets use these
+        joined = _SEPARATOR.join(lowered)
+        offsets, pos = [], 0
+        for text in lowered:
+            offsets.append(pos)
+            pos += len(text) + len(_SEPARATOR)
+
+        hits: List[Dict[str, KeywordHit]] = [{} for _ in texts]
+        negation_end = -1  # End of the latest negation word; only the nearest one can apply
+        for m in self.pattern.finditer(joined):
+            form = m.group(1)
+            if form is None:
+                negation_end = m.end()
+                continue
+            start = m.start()
+            i = bisect_right(offsets, start) - 1
+            keyword = self.forms[" ".join(form.split())]
+            negated = negation_end >= offsets[i] and self._negated(joined, negation_end, start)
+            seen = hits[i].get(keyword)
+            # A phrase counts if any occurrence is un-negated
+            if seen is None or (seen.negated and not negated):
+                hits[i][keyword] = KeywordHit(keyword, self.weights[keyword], negated)
+        return [list(h.values()) for h in hits]
+
+    @staticmethod
+    def summarize(hits: List[KeywordHit]) -> Tuple[int, str, List[str]]:
+        """(score, sentiment, keywords) from a text's hits."""
+        live = [h for h in hits if not h.negated]
+        score = sum(h.weight for h in live)
+        bullish = [h.keyword for h in live if h.weight > 0]
+        bearish = [h.keyword for h in live if h.weight < 0]
+        if score > 0:
+            return score, "bullish", bullish
+        if score < 0:
+            return score, "bearish", bearish
+        return score, "neutral", bullish + bearish
+
+    def score_batch(self, texts: Sequence[str]) -> List[Tuple[int, str, List[str]]]:
+        """(score, sentiment, keywords) for each text."""
+        return [self.summarize(hits) for hits in self.find_batch(texts)]
+
+    def score(self, text: str) -> Tuple[int, str, List[str]]:
+        """(score, sentiment, keywords) for a single text."""
+        return self.score_batch([text])[0]
+
+
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc",
+    "holdings", "holding", "group", "adr", "sa", "nv", "ag", "se", "lp", "class", "a", "b", "the",
+}
+# First words too generic to stand in for the full company name
+_GENERIC_WORDS = {
+    "advanced", "american", "applied", "first", "general", "global", "international", "national",
+    "united", "digital", "energy", "nuclear", "quantum", "data", "micro", "bit", "core", "rocket",
+}
+
+
+def company_aliases(name: str) -> List[str]:
+    """Lowercase names a headline might use for a company ("NVIDIA Corp" -> ["nvidia"])."""
+    words = [w for w in re.sub(r"[^a-z0-9&' -]+", " ", name.lower()).split()]
+    while words and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    while words and words[0] == "the":
+        words.pop(0)
+    if not words:
+        return []
+    aliases = [" ".join(words)]
+    if len(words) > 1 and len(words[0]) >= 5 and words[0] not in _GENERIC_WORDS:
+        aliases.append(words[0])  # "Kratos Defense & Security Solutions" -> "kratos"
+    return [a for a in aliases if len(a) >= 4]
+
+
+class SymbolMatcher:
+    """Maps free text to tickers by symbol and company name in two regex passes.
+
+    Symbols match case-sensitively as whole words or cashtags ("NVDA",
+    "$NVDA"), names case-insensitively ("Nvidia"), so short tickers that
+    are also words only match when written as tickers.
+    """
+
+    def __init__(self, names: Dict[str, str]):
+        symbols = [s.upper() for s in names]
+        self.by_alias: Dict[str, List[str]] = {}
+        for symbol, name in names.items():
+            for alias in company_aliases(name or ""):
+                self.by_alias.setdefault(alias, []).append(symbol.upper())
+        self.symbol_pattern = re.compile(rf"(?<![A-Za-z0-9])\$?({_trie_pattern(symbols)})(?![A-Za-z0-9])") if symbols else None
+        self.name_pattern = re.compile(rf"\b({_trie_pattern(self.by_alias)})\b") if self.by_alias else None
+
+    def match(self, text: str) -> List[str]:
+        """Tickers mentioned in ``text``, in order of first mention."""
+        found = []
+        if self.symbol_pattern:
+            found += [m.group(1) for m in self.symbol_pattern.finditer(text)]
+        if self.name_pattern:
+            for m in self.name_pattern.finditer(text.lower()):
+                found += self.by_alias.get(" ".join(m.group(1).split()), [])
+        return list(dict.fromkeys(found))
@@ -7,6 +7,8 @@ Usage:
     python -m scanner.main              # Full run (PDF + email)
     python -m scanner.main --dry-run    # Local test (no email)
     python -m scanner.main --verbose    # Show detailed output
+    python -m scanner.main --refresh    # Ignore cached API responses (still store new ones)
+    python -m scanner.main --no-cache   # Bypass the response cache entirely
 """
 
 import sys
@@ -19,14 +21,38 @@ from rich.console import Console
 from rich.panel import Panel
 from rich import box
 
-from .config import validate_config, DATA_DIR, LOGS_DIR, SEND_EMAIL
+from .config import validate_config, DATA_DIR, LOGS_DIR, SEND_EMAIL, SCANNER_MAX_WORKERS, STAGE_TIMEOUT_SECONDS
 from .scanners import EarningsScanner, NewsScanner, MomentumScanner, OptionsScanner, MarketContextScanner, TechnicalsScanner, PreMarketScanner, MacroCalendar
 from .analyzer import ScannerAnalyzer
-from .output.pdf_generator import generate_pdf_report
+from .clustering import cluster_news
+from .hedging import LatencyLog, percentiles
+from .pipeline import StageExecutor
+from .checkpoint import RunCheckpoint
+from .cache import PriceStore, configure_response_cache, get_reference_store
+from .market_data import get_quote_snapshots
+from .ratelimit import get_finnhub_scheduler
+from .providers import provider_stats
+from .output.pdf_generator import IncrementalReport
 from .output.email_sender import send_scan_email
 
 console = Console()
 
+STAGE_LABELS = {
+    "price_history": "Price history (local store sync)",
+    "quotes": "Quote snapshots (batched)",
+    "market_context": "Market context",
+    "premarket": "Pre-market movers",
+    "macro_landmines": "Macro calendar",
+    "macro_warnings": "Macro warnings",
+    "earnings": "Earnings scanner",
+    "news": "News scanner",
+    "news_clusters": "News de-duplication",
+    "momentum": "Momentum scanner",
+    "technicals": "Technicals scanner",
+    "options": "Options flow scanner",
+    "call_put_ratios": "Call/put ratios",
+}
+
 
 def load_watchlist() -> dict:
     """Load watchlist from JSON file."""
@@ -52,7 +78,13 @@ def get_portfolio(watchlist: dict) -> list:
     return watchlist.get("portfolio", [])
 
 
-def run_scan(dry_run: bool = False, verbose: bool = False):
+def run_scan(
+    dry_run: bool = False,
+    verbose: bool = False,
+    cache_mode: str = "on",
+    reanalyze: bool = False,
+    resume: bool = False
+):
     """Execute full market scan pipeline."""
     
     start_time = datetime.now()
@@ -65,6 +97,8 @@ def run_scan(dry_run: bool = False, verbose: bool = False):
         console.print(f"[bold red]Error:[/bold red] Missing API keys: {', '.join(missing)}")
         sys.exit(1)
     
+    response_cache = configure_response_cache(cache_mode)
+    
     # Load watchlist and portfolio
     watchlist = load_watchlist()
     portfolio_tickers = get_portfolio(watchlist)
@@ -73,59 +107,144 @@ def run_scan(dry_run: bool = False, verbose: bool = False):
     portfolio_note = f" | {len(portfolio_tickers)} portfolio holdings" if portfolio_tickers else ""
     console.print(f"[dim]Watchlist loaded: {len(all_tickers)} tickers across {sector_count} sectors{portfolio_note}[/dim]")
     
-    # Run scanners
+    # Run scanners — independent stages run concurrently, dependents wait
     console.print("\n[bold cyan]Running Scanners...[/bold cyan]")
-    
-    console.print("[dim]  → Market context...[/dim]")
+    finnhub_scheduler = get_finnhub_scheduler()
+    finnhub_scheduler.set_priority_symbols(portfolio_tickers)
     market_scanner = MarketContextScanner()
-    market_context = market_scanner.scan()
+    premarket_scanner = PreMarketScanner()
+    macro_calendar = MacroCalendar()
+    options_scanner = OptionsScanner()
+    earnings_scanner = EarningsScanner()
+    news_scanner = NewsScanner()
+    quote_universe = list(dict.fromkeys(premarket_scanner.symbols(all_tickers) + market_scanner.symbols()))
+    price_universe = quote_universe
+
+    # Each stage's output is checkpointed as it finishes so a failed run can be resumed
+    checkpoint = RunCheckpoint(dry_run=dry_run)
+    checkpoint.start(resume=resume)
+
+    def on_stage_complete(name, value, report):
+        console.print(f"[dim]  → {STAGE_LABELS.get(name, name)} ({report.status}, {report.duration:.1f}s)[/dim]")
+        if report.status == "resumed":
+            return
+        # A stage that ran on a failed dependency's default is rerun on resume
+        deps_ok = all(executor.reports[d].status in ("ok", "resumed") for d in executor.stages[name].depends_on)
+        checkpoint.save(name, value, report.status if deps_ok else "degraded")
+
+    executor = StageExecutor(
+        max_workers=SCANNER_MAX_WORKERS,
+        default_timeout=STAGE_TIMEOUT_SECONDS,
+        on_complete=on_stage_complete
+    )
+    price_store = PriceStore()
+    executor.add("price_history", lambda: price_store.sync(price_universe))
+    executor.add(
+        "quotes",
+        lambda price_history: get_quote_snapshots(quote_universe, panel=price_history),
+        depends_on=["price_history"],
+        default={}
+    )
+    executor.add("market_context", lambda quotes: market_scanner.scan(quotes), depends_on=["quotes"])
+    executor.add(
+        "premarket",
+        lambda quotes: premarket_scanner.scan(all_tickers, snapshots=quotes),
+        depends_on=["quotes"],
+        default=[]
+    )
+    executor.add("macro_landmines", lambda: macro_calendar.get_landmines(days_ahead=5), default={})
+    executor.add(
+        "macro_warnings",
+        lambda macro_landmines: macro_calendar.format_warnings(days_ahead=5, landmines=macro_landmines),
+        depends_on=["macro_landmines"],
+        timeout=60,
+        default="Macro calendar unavailable."
+    )
+    executor.add("earnings", lambda: earnings_scanner.scan(all_tickers), default=[])
+    executor.add("news", lambda: news_scanner.scan(all_tickers, portfolio=portfolio_tickers), default=[])
+    executor.add("news_clusters", lambda news: cluster_news(news), depends_on=["news"], default=None)
+    executor.add(
+        "momentum",
+        lambda price_history: MomentumScanner().scan(all_tickers, panel=price_history),
+        depends_on=["price_history"],
+        default=[]
+    )
+    executor.add(
+        "technicals",
+        lambda price_history: TechnicalsScanner().scan(all_tickers, panel=price_history),
+        depends_on=["price_history"],
+        default=[]
+    )
+    executor.add("options", lambda: options_scanner.scan(all_tickers), default=[])
+    executor.add(
+        "call_put_ratios",
+        lambda options: options_scanner.get_call_put_ratio(all_tickers),
+        depends_on=["options"],
+        default={}
+    )
+    completed, unsaved = checkpoint.completed() if resume else ({}, set())
+    results = executor.run(completed=completed, skippable=unsaved)
+    if completed:
+        rerun = [r.name for r in executor.summary() if r.status != "resumed"]
+        rerun_note = f"; reran {', '.join(rerun)}" if rerun else ""
+        console.print(f"[dim]  Resumed {len(completed)} stages from {checkpoint.dir}{rerun_note}[/dim]")
+
+    market_context = results["market_context"]
+    premarket_movers = results["premarket"]
+    macro_landmines = results["macro_landmines"]
+    macro_warnings = results["macro_warnings"]
+    earnings_results = results["earnings"]
+    # Fall back to unclustered news if de-duplication failed
+    news_results = results["news_clusters"] if results["news_clusters"] is not None else results["news"]
+    momentum_results = results["momentum"]
+    technicals_results = results["technicals"]
+    options_results = results["options"]
+    call_put_ratios = results["call_put_ratios"]
+
+    console.print("\n[bold cyan]Scanner Results[/bold cyan]")
     if market_context:
         sentiment_emoji = "🟢" if market_context.market_sentiment == "risk_on" else "🔴" if market_context.market_sentiment == "risk_off" else "🟡"
-        console.print(f"[dim]     {sentiment_emoji} SPY {market_context.spy_change_pct:+.1f}% | QQQ {market_context.qqq_change_pct:+.1f}% | VIX {market_context.vix_level}[/dim]")
-    
-    console.print("[dim]  → Pre-market movers...[/dim]")
-    premarket_scanner = PreMarketScanner()
-    premarket_movers = premarket_scanner.scan(all_tickers)
+        console.print(f"[dim]  {sentiment_emoji} SPY {market_context.spy_change_pct:+.1f}% | QQQ {market_context.qqq_change_pct:+.1f}% | VIX {market_context.vix_level}[/dim]")
+
     if premarket_movers:
-        console.print(f"[dim]     Found {len(premarket_movers)} significant movers (±3%)[/dim]")
+        console.print(f"[dim]  Found {len(premarket_movers)} significant movers (±3%)[/dim]")
     else:
-        console.print(f"[dim]     No significant pre-market moves[/dim]")
-    
-    console.print("[dim]  → Macro calendar...[/dim]")
-    macro_calendar = MacroCalendar()
-    macro_warnings = macro_calendar.format_warnings(days_ahead=5)
-    macro_landmines = macro_calendar.get_landmines(days_ahead=5)
+        console.print(f"[dim]  No significant pre-market moves[/dim]")
+
     num_events = len(macro_landmines.get("economic_events", [])) + len(macro_landmines.get("sector_moving_earnings", []))
     if num_events > 0:
-        console.print(f"[dim]     ⚠️ {num_events} upcoming events to watch[/dim]")
+        console.print(f"[dim]  ⚠️ {num_events} upcoming events to watch[/dim]")
     else:
-        console.print(f"[dim]     No major events in next 5 days[/dim]")
-    
-    console.print("[dim]  → Earnings scanner...[/dim]")
-    earnings_scanner = EarningsScanner()
-    earnings_results = earnings_scanner.scan(all_tickers)
-    console.print(f"[dim]     Found {len(earnings_results)} upcoming earnings[/dim]")
-    
-    console.print("[dim]  → News scanner...[/dim]")
-    news_scanner = NewsScanner()
-    news_results = news_scanner.scan(all_tickers)
-    console.print(f"[dim]     Found {len(news_results)} news catalysts[/dim]")
-    
-    console.print("[dim]  → Momentum scanner...[/dim]")
-    momentum_scanner = MomentumScanner()
-    momentum_results = momentum_scanner.scan(all_tickers)
-    console.print(f"[dim]     Found {len(momentum_results)} momentum signals[/dim]")
-    
-    console.print("[dim]  → Technicals scanner...[/dim]")
-    technicals_scanner = TechnicalsScanner()
-    technicals_results = technicals_scanner.scan(all_tickers)
-    console.print(f"[dim]     Found {len(technicals_results)} technical signals[/dim]")
-    
-    console.print("[dim]  → Options flow scanner...[/dim]")
-    options_scanner = OptionsScanner()
-    options_results = options_scanner.scan(all_tickers)
-    call_put_ratios = options_scanner.get_call_put_ratio(all_tickers)
-    console.print(f"[dim]     Found {len(options_results)} unusual options signals[/dim]")
+        console.print(f"[dim]  No major events in next 5 days[/dim]")
+
+    console.print(f"[dim]  Found {len(earnings_results)} upcoming earnings[/dim]")
+    news_note = ""
+    if news_scanner.last_stats:
+        ns = news_scanner.last_stats
+        news_note = f" ({ns['mode']} ingest: {len(results['news'])} articles, {ns['new']} newly scored, {ns['seen']} already indexed)"
+    console.print(f"[dim]  Found {len(news_results)} news catalysts{news_note}[/dim]")
+    console.print(f"[dim]  Found {len(momentum_results)} momentum signals[/dim]")
+    console.print(f"[dim]  Found {len(technicals_results)} technical signals[/dim]")
+    console.print(f"[dim]  Found {len(options_results)} unusual options signals ({options_scanner.chains.downloads} chains downloaded)[/dim]")
+    scan_duration = sum(r.duration for r in executor.summary())
+    console.print(f"[dim]  Scanners finished in {(datetime.now() - start_time).total_seconds():.1f}s ({scan_duration:.1f}s of stage time)[/dim]")
+    if price_store.last_sync:
+        ps = price_store.last_sync
+        console.print(f"[dim]  Price store: {ps['incremental']} tickers updated incrementally, {ps['full']} full downloads, {ps['requests']} bulk requests[/dim]")
+    if earnings_scanner.store.last_refresh:
+        es = earnings_scanner.store.last_refresh
+        console.print(f"[dim]  Earnings history: {es['cached']} served from store, {es['fetched']} refetched[/dim]")
+    for dataset, rs in get_reference_store().last_refresh.items():
+        console.print(f"[dim]  Reference {dataset}: {rs['cached']} served from store, {rs['fetched']} refetched[/dim]")
+    fh = finnhub_scheduler.stats()
+    throttled_note = f" | {fh['throttled']} throttled (429)" if fh["throttled"] else ""
+    console.print(f"[dim]  Finnhub: {fh['calls']} calls | avg wait {fh['avg_wait_s']:.2f}s, max {fh['max_wait_s']:.1f}s | peak queue {fh['max_queue_depth']}{throttled_note}[/dim]")
+    rc = response_cache.stats()
+    if rc["mode"] != "off":
+        console.print(f"[dim]  Response cache ({rc['mode']}): {rc['hits']} hits / {rc['misses']} misses ({rc['hit_rate']:.0%} hit rate)[/dim]")
+    for provider, totals in provider_stats().items():
+        avg_ms = totals["latency_s"] / totals["calls"] * 1000 if totals["calls"] else 0
+        console.print(f"[dim]  {provider}: {totals['calls']} requests ({totals['errors']} failed) | {totals['wire_bytes'] / 1024:.0f} KB transferred | avg {avg_ms:.0f}ms[/dim]")
     
     # Verbose output
     if verbose:
@@ -179,36 +298,96 @@ def run_scan(dry_run: bool = False, verbose: bool = False):
                 emoji = "📈" if o.option_type == "call" else "📉"
                 console.print(f"  {emoji} {o.symbol}: {o.expiry} ${o.strike} {o.option_type.upper()} - Vol/OI: {o.volume_oi_ratio}x ({o.signal_strength})")
     
-    # Analyze with Claude
+    # Analyze with Claude — streamed items are printed and laid out as they arrive
     console.print("\n[bold cyan]Analyzing with Claude...[/bold cyan]")
-    analyzer = ScannerAnalyzer()
-    analysis = analyzer.analyze(
-        earnings=earnings_results,
-        news=news_results,
-        momentum=momentum_results,
-        technicals=technicals_results,
-        options=options_results,
-        call_put_ratios=call_put_ratios,
-        market_context=market_context,
-        premarket_movers=premarket_movers,
-        macro_warnings=macro_warnings,
-        watchlist=watchlist,
-        portfolio_tickers=portfolio_tickers
-    )
-    console.print(f"[dim]  Found {len(analysis.top_opportunities)} top opportunities[/dim]")
-    
-    # Generate PDF
     LOGS_DIR.mkdir(exist_ok=True)
     pdf_filename = f"market-scan-{datetime.now().strftime('%Y-%m-%d')}.pdf"
     pdf_path = LOGS_DIR / pdf_filename
-    generate_pdf_report(analysis, str(pdf_path))
+    report = IncrementalReport(str(pdf_path))
+
+    def on_item(section, key, item):
+        report.add(section, key, item)
+        if section == "top_opportunities":
+            badge = " ★" if item.is_portfolio else ""
+            console.print(f"[dim]  → #{item.rank} {item.ticker}{badge} ({item.setup_type}, conviction {item.conviction}/10)[/dim]")
+
+    resumed = all(r.status == "resumed" for r in executor.summary())
+    if resume and resumed and not reanalyze and checkpoint.is_done("analysis"):
+        analysis = checkpoint.load("analysis")
+        console.print(f"[dim]  Resumed analysis from {checkpoint.dir} ({len(analysis.top_opportunities)} top opportunities)[/dim]")
+    else:
+        analyzer = ScannerAnalyzer(reanalyze=reanalyze)
+        analysis = analyzer.analyze(
+            earnings=earnings_results,
+            news=news_results,
+            momentum=momentum_results,
+            technicals=technicals_results,
+            options=options_results,
+            call_put_ratios=call_put_ratios,
+            market_context=market_context,
+            premarket_movers=premarket_movers,
+            macro_warnings=macro_warnings,
+            watchlist=watchlist,
+            portfolio_tickers=portfolio_tickers,
+            on_item=on_item
+        )
+        console.print(f"[dim]  Found {len(analysis.top_opportunities)} top opportunities[/dim]")
+        if len(analyzer.shortlisted) < len(analyzer.scores):
+            console.print(f"[dim]  Pre-ranking: {len(analyzer.shortlisted)} of {len(analyzer.scores)} flagged tickers sent to Claude[/dim]")
+        if analyzer.budget:
+            b = analyzer.budget
+            dropped = sum(len(v) for v in b.dropped.values())
+            dropped_note = f", {dropped} lower-priority items dropped" if dropped else ""
+            console.print(f"[dim]  Prompt data: ~{b.used} of {b.total} budgeted tokens{dropped_note}[/dim]")
+        elif analyzer.shard_budgets:
+            used = {sector: b.used for sector, b in analyzer.shard_budgets.items()}
+            largest = max(used, key=used.get)
+            dropped = sum(len(v) for v in analysis.dropped_items.values())
+            dropped_note = f", {dropped} lower-priority items dropped" if dropped else ""
+            console.print(
+                f"[dim]  Prompt data: ~{sum(used.values())} tokens across {len(used)} sector calls "
+                f"(largest: {largest}, ~{used[largest]}){dropped_note}[/dim]"
+            )
+        if analyzer.encoding_tokens:
+            enc = analyzer.encoding_tokens
+            console.print(f"[dim]  Signal encoding: {analyzer.encoding} (~{enc['prose']} tokens as prose, ~{enc['table']} as table)[/dim]")
+        if analyzer.timings:
+            latency_log = LatencyLog()
+            latency_log.append(analyzer.timings)
+            seconds = [t["seconds"] for t in analyzer.timings]
+            hedged = sum(1 for t in analyzer.timings if t["hedged"])
+            hedge_wins = sum(1 for t in analyzer.timings if t["winner"] == "hedge")
+            failed = sum(1 for t in analyzer.timings if t["winner"] == "none")
+            run = percentiles(seconds)
+            console.print(
+                f"[dim]  LLM latency: p50 {run['p50']:.1f}s / max {run['max']:.1f}s over {len(seconds)} call(s)"
+                f" | hedged {hedged}, hedge won {hedge_wins}" + (f", {failed} missed the SLA" if failed else "") + "[/dim]"
+            )
+            history = percentiles([r["seconds"] for r in latency_log.recent(days=30) if r.get("winner") != "none"])
+            if history:
+                console.print(
+                    f"[dim]  LLM latency (30 days): p50 {history['p50']:.1f}s, p90 {history['p90']:.1f}s, p99 {history['p99']:.1f}s[/dim]"
+                )
+        if analyzer.cache.hits:
+            console.print(f"[dim]  Reused {analyzer.cache.hits} cached Claude response(s) for unchanged scan data (--reanalyze to force)[/dim]")
+        if analyzer.last_usage:
+            u = analyzer.last_usage
+            console.print(f"[dim]  Tokens: {u['input_tokens']} in / {u['output_tokens']} out | prompt cache: {u['cache_read_tokens']} read, {u['cache_write_tokens']} written[/dim]")
+        checkpoint.save("analysis", analysis, "degraded" if analyzer.used_fallback else "ok")
+
+    # Generate PDF (reuses sections laid out during streaming)
+    report.build(analysis)
+    checkpoint.save("pdf", str(pdf_path))
     console.print(f"\n[green]✓[/green] PDF generated: {pdf_path}")
     
     # Send email with PDF attachment
-    if not dry_run and SEND_EMAIL:
+    if not dry_run and SEND_EMAIL and resume and checkpoint.is_done("email"):
+        console.print("[yellow]⊘[/yellow] Email already sent for this run - skipping")
+    elif not dry_run and SEND_EMAIL:
         console.print("[dim]  → Sending email with PDF attachment...[/dim]")
-        send_scan_email(analysis, str(pdf_path))
-        console.print("[green]✓[/green] Email sent")
+        sent = send_scan_email(analysis, str(pdf_path))
+        checkpoint.save("email", None, "ok" if sent else "failed")
+        console.print("[green]✓[/green] Email sent" if sent else "[red]✗[/red] Email failed - rerun with --resume to retry")
     elif dry_run:
         console.print("[yellow]⊘[/yellow] Dry run - skipping email")
     
@@ -253,11 +432,40 @@ def main():
         action="store_true",
         help="Show detailed scanner output"
     )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the API response cache (no reads or writes)"
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached API responses but store fresh ones"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse today's completed stages from logs/run-YYYY-MM-DD and run only missing or failed ones"
+    )
+    parser.add_argument(
+        "--reanalyze",
+        action="store_true",
+        help="Call Claude even if the scan data matches a cached analysis"
+    )
     
     args = parser.parse_args()
+    cache_mode = "off" if args.no_cache else "refresh" if args.refresh else "on"
     
     try:
-        run_scan(dry_run=args.dry_run, verbose=args.verbose)
+        run_scan(
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            cache_mode=cache_mode,
+            reanalyze=args.reanalyze,
+            resume=args.resume
+        )
     except KeyboardInterrupt:
         console.print("\n[yellow]Interrupted[/yellow]")
         sys.exit(0)
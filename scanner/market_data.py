@@ -0,0 +1,300 @@
+"""Market Data - Batched daily OHLCV shared by the yfinance-based scanners."""
+
+from datetime import time as dtime
+from typing import Dict, List, Optional
+
+import numpy as np
+import yfinance as yf
+from pydantic import BaseModel
+
+FIELDS = ("open", "high", "low", "close", "volume")
+_YF_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+_MARKET_OPEN = dtime(9, 30)
+_MARKET_CLOSE = dtime(16, 0)
+
+
+class QuoteSnapshot(BaseModel):
+    """Lightweight quote: just the prices the scanners need."""
+    symbol: str
+    last_price: Optional[float] = None       # Latest regular-session price
+    previous_close: Optional[float] = None   # Close of the session before last_price
+    pre_market_price: Optional[float] = None  # Latest extended-hours price after last_price
+    volume: int = 0                          # Extended-hours volume if pre_market_price is set, else session volume
+
+    @property
+    def change_pct(self) -> Optional[float]:
+        """Regular-session change vs the prior close."""
+        if not self.last_price or not self.previous_close:
+            return None
+        return (self.last_price - self.previous_close) / self.previous_close * 100
+
+    @property
+    def pre_market_change_pct(self) -> Optional[float]:
+        """Extended-hours change vs the last regular-session price."""
+        if not self.pre_market_price or not self.last_price:
+            return None
+        return (self.pre_market_price - self.last_price) / self.last_price * 100
+
+
+class PricePanel:
+    """Daily OHLCV for a ticker universe, one (tickers x days) array per field.
+
+    Rows follow ``tickers``; columns follow ``dates`` (oldest first). Missing
+    bars are NaN, so a ticker with a short history is left-padded with NaN.
+    """
+
+    def __init__(self, tickers: List[str], dates: np.ndarray, fields: Dict[str, np.ndarray]):
+        self.tickers = list(tickers)
+        self.dates = dates
+        self.fields = fields
+        self._index = {t: i for i, t in enumerate(self.tickers)}
+
+    def __contains__(self, ticker: str) -> bool:
+        i = self._index.get(ticker)
+        return i is not None and not np.isnan(self.fields["close"][i]).all()
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def matrix(self, field: str = "close") -> np.ndarray:
+        """Full (tickers x days) array for a field."""
+        return self.fields[field]
+
+    def rows(self, tickers: List[str]) -> List[int]:
+        """Row indices for tickers present in the panel, in the given order."""
+        return [self._index[t] for t in tickers if t in self]
+
+    def row(self, ticker: str, field: str = "close") -> Optional[np.ndarray]:
+        """All bars for one ticker (NaN where missing), or None if unknown."""
+        i = self._index.get(ticker)
+        return None if i is None else self.fields[field][i]
+
+    def series(self, ticker: str, field: str = "close") -> np.ndarray:
+        """Bars for one ticker with missing values dropped.
+
+        When the only gaps are leading padding this is a view into the panel
+        (no copy), which matters when the panel is memory-mapped from disk.
+        """
+        values = self.row(ticker, field)
+        if values is None:
+            return np.empty(0)
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return values[:0]
+        tail = values[int(np.argmax(valid)):]
+        return tail if valid[-len(tail):].all() else values[valid]
+
+    def column(self, date) -> Optional[int]:
+        """Column index for a date, or None if there is no bar that day."""
+        day = np.datetime64(date, "D")
+        i = int(np.searchsorted(self.dates, day))
+        return i if i < len(self.dates) and self.dates[i] == day else None
+
+    def last(self, ticker: str, field: str = "close", offset: int = 0) -> Optional[float]:
+        """Most recent value (``offset`` bars back), or None if unavailable."""
+        values = self.series(ticker, field)
+        if len(values) <= offset:
+            return None
+        return float(values[-1 - offset])
+
+
+def _frame_to_panel(df, tickers: List[str]) -> PricePanel:
+    """Convert a yf.download frame (field, ticker) columns into a PricePanel."""
+    if df is None or df.empty:
+        return PricePanel(tickers, np.array([], dtype="datetime64[D]"),
+                          {f: np.full((len(tickers), 0), np.nan) for f in FIELDS})
+
+    df = df.sort_index()
+    dates = df.index.values.astype("datetime64[D]")
+    fields = {}
+    for field, column in _YF_COLUMNS.items():
+        if getattr(df.columns, "nlevels", 1) > 1:
+            block = df[column] if column in df.columns.get_level_values(0) else None
+        else:
+            # Older yfinance returns flat columns for a single ticker
+            block = df[[column]].set_axis(tickers[:1], axis=1) if column in df.columns else None
+        if block is None:
+            fields[field] = np.full((len(tickers), len(dates)), np.nan)
+            continue
+        block = block.reindex(columns=tickers)
+        fields[field] = block.to_numpy(dtype=float).T.copy()
+    return PricePanel(tickers, dates, fields)
+
+
+def _concat_panels(panels: List[PricePanel]) -> PricePanel:
+    """Merge panels for disjoint ticker batches onto a common date axis."""
+    panels = [p for p in panels if len(p)]
+    if len(panels) == 1:
+        return panels[0]
+    dates = np.unique(np.concatenate([p.dates for p in panels])) if panels else np.array([], dtype="datetime64[D]")
+    tickers = [t for p in panels for t in p.tickers]
+    fields = {f: np.full((len(tickers), len(dates)), np.nan) for f in FIELDS}
+    row = 0
+    for p in panels:
+        cols = np.searchsorted(dates, p.dates)
+        for f in FIELDS:
+            fields[f][row:row + len(p), cols] = p.fields[f]
+        row += len(p)
+    return PricePanel(tickers, dates, fields)
+
+
+def download_price_panel(
+    tickers: List[str],
+    period: str = "1y",
+    start: Optional[str] = None,
+    batch_size: int = 200
+) -> PricePanel:
+    """Download daily bars for many tickers in a few bulk requests.
+
+    Pass ``start`` (YYYY-MM-DD, inclusive) to fetch only recent bars instead
+    of a whole ``period``.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    window = {"start": start} if start else {"period": period}
+    panels = []
+    for offset in range(0, len(tickers), batch_size):
+        batch = tickers[offset:offset + batch_size]
+        try:
+            df = yf.download(
+                batch,
+                **window,
+                interval="1d",
+                group_by="column",
+                auto_adjust=True,
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            print(f"[Warning] Batched price download failed for {len(batch)} tickers: {e}")
+            df = None
+        panels.append(_frame_to_panel(df, batch))
+    return _concat_panels(panels)
+
+
+def _column(df, field: str, symbol: str):
+    """One symbol's column from a yf.download frame, or None."""
+    if getattr(df.columns, "nlevels", 1) > 1:
+        if (field, symbol) in df.columns:
+            return df[(field, symbol)]
+        return None
+    return df[field] if field in df.columns else None
+
+
+def _snapshot_from_bars(symbol: str, df, panel: Optional[PricePanel]) -> Optional[QuoteSnapshot]:
+    """Build a snapshot from 1-minute bars (with extended hours) for one symbol."""
+    closes = _column(df, "Close", symbol)
+    volumes = _column(df, "Volume", symbol)
+    if closes is None:
+        return None
+    closes = closes.dropna()
+    if closes.empty:
+        return None
+    volumes = volumes.reindex(closes.index).fillna(0) if volumes is not None else None
+
+    index = closes.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_convert("America/New_York")
+    times = np.array([ts.time() for ts in index])
+    days = np.array([ts.date() for ts in index])
+    regular = (times >= _MARKET_OPEN) & (times < _MARKET_CLOSE)
+    latest_day = days[-1]
+    values = closes.to_numpy(dtype=float)
+    vols = volumes.to_numpy(dtype=float) if volumes is not None else np.zeros(len(values))
+
+    regular_idx = np.flatnonzero(regular)
+    today_regular = regular_idx[days[regular_idx] == latest_day] if len(regular_idx) else regular_idx
+    last_regular = int(regular_idx[-1]) if len(regular_idx) else None
+
+    # Daily bars give exact official closes; fall back to minute bars without them
+    daily_before = np.empty(0)
+    if panel is not None and symbol in panel:
+        daily = panel.row(symbol, "close")
+        daily_before = daily[~np.isnan(daily) & (panel.dates < np.datetime64(latest_day, "D"))]
+    prior_regular = regular_idx[days[regular_idx] < latest_day] if len(regular_idx) else regular_idx
+
+    if len(today_regular):
+        last_price = float(values[today_regular[-1]])
+        session_volume = int(vols[today_regular].sum())
+        if len(daily_before):
+            previous_close = float(daily_before[-1])
+        else:
+            previous_close = float(values[prior_regular[-1]]) if len(prior_regular) else None
+    else:
+        # Pre-market: the latest regular session is a previous day
+        session_volume = 0
+        if len(daily_before):
+            last_price = float(daily_before[-1])
+            previous_close = float(daily_before[-2]) if len(daily_before) > 1 else None
+        else:
+            last_price = float(values[prior_regular[-1]]) if len(prior_regular) else None
+            previous_close = None
+
+    pre_market_price, extended_volume = None, 0
+    after = np.arange(len(values)) > (last_regular if last_regular is not None else -1)
+    extended = after & ~regular & (days == latest_day)
+    if extended.any():
+        pre_market_price = float(values[np.flatnonzero(extended)[-1]])
+        extended_volume = int(vols[extended].sum())
+
+    return QuoteSnapshot(
+        symbol=symbol,
+        last_price=last_price,
+        previous_close=previous_close,
+        pre_market_price=pre_market_price,
+        volume=extended_volume if pre_market_price is not None else session_volume
+    )
+
+
+def get_quote_snapshots(
+    symbols: List[str],
+    panel: Optional[PricePanel] = None,
+    batch_size: int = 200
+) -> Dict[str, QuoteSnapshot]:
+    """Quotes for many symbols from one batched intraday request per batch.
+
+    Uses 1-minute bars including pre/post-market instead of scraping the full
+    ``.info`` profile per symbol. ``panel`` (daily bars) supplies official
+    closes when available.
+    """
+    from .cache.responses import get_response_cache  # Deferred: the cache package imports this module
+
+    cache = get_response_cache()
+    symbols = list(dict.fromkeys(symbols))
+    snapshots: Dict[str, QuoteSnapshot] = {}
+
+    # Serve fresh cached quotes first and download only the rest
+    missing = []
+    for symbol in symbols:
+        hit, value = cache.lookup("yahoo:quote", {"symbol": symbol})
+        if hit:
+            snapshots[symbol] = QuoteSnapshot(**value)
+        else:
+            missing.append(symbol)
+
+    for offset in range(0, len(missing), batch_size):
+        batch = missing[offset:offset + batch_size]
+        try:
+            df = yf.download(
+                batch,
+                period="2d",
+                interval="1m",
+                prepost=True,
+                group_by="column",
+                auto_adjust=False,
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            print(f"[Warning] Quote snapshot download failed for {len(batch)} symbols: {e}")
+            continue
+        if df is None or df.empty:
+            continue
+        for symbol in batch:
+            try:
+                snapshot = _snapshot_from_bars(symbol, df, panel)
+                if snapshot:
+                    snapshots[symbol] = snapshot
+                    cache.store("yahoo:quote", {"symbol": symbol}, snapshot.model_dump())
+            except Exception as e:
+                print(f"[Warning] Quote snapshot failed for {symbol}: {e}")
+    return snapshots
@@ -1,7 +1,7 @@
 """Data models for Market Scanner."""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -26,6 +26,8 @@ class NewsResult(BaseModel):
     sentiment: str  # bullish, bearish, neutral
     sentiment_score: int
     keywords_matched: List[str] = Field(default_factory=list)
+    related_symbols: List[str] = Field(default_factory=list)  # Other watchlist tickers carrying the same story
+    source_count: int = 1  # Distinct sources that ran this story (after clustering)
 
 
 class MomentumResult(BaseModel):
@@ -80,4 +82,5 @@ class ScanAnalysis(BaseModel):
     top_opportunities: List[Opportunity] = Field(default_factory=list)
     watchlist: List[WatchlistItem] = Field(default_factory=list)
     no_action: List[WatchlistItem] = Field(default_factory=list)
-    sector_summary: dict = Field(default_factory=dict)  # sector name -> SectorSummary
+    sector_summary: Dict[str, SectorSummary] = Field(default_factory=dict)  # sector name -> summary
+    dropped_items: Dict[str, List[str]] = Field(default_factory=dict)  # prompt section -> tickers trimmed for the token budget
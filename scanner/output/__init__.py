@@ -1,4 +1,4 @@
-from .pdf_generator import generate_pdf_report
+from .pdf_generator import IncrementalReport, generate_pdf_report
 from .email_sender import send_scan_email
 
-__all__ = ["generate_pdf_report", "send_scan_email"]
+__all__ = ["IncrementalReport", "generate_pdf_report", "send_scan_email"]
@@ -3,6 +3,7 @@
 import html
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
@@ -10,7 +11,7 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
 from reportlab.lib.units import inch
 
-from ..models import ScanAnalysis
+from ..models import Opportunity, ScanAnalysis, WatchlistItem
 
 
 def _e(text: str) -> str:
@@ -18,18 +19,8 @@ def _e(text: str) -> str:
     return html.escape(str(text))
 
 
-def generate_pdf_report(analysis: ScanAnalysis, output_path: str) -> str:
-    """Generate PDF report from scan analysis."""
-
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=letter,
-        leftMargin=0.75 * inch,
-        rightMargin=0.75 * inch,
-        topMargin=0.75 * inch,
-        bottomMargin=0.75 * inch
-    )
-
+def _build_styles():
+    """Stylesheet with the report's custom paragraph styles."""
     styles = getSampleStyleSheet()
 
     # Custom styles
@@ -92,91 +83,78 @@ def generate_pdf_report(analysis: ScanAnalysis, output_path: str) -> str:
         spaceAfter=2
     ))
 
-    story = []
-
-    # Title
-    story.append(Paragraph("MARKET SCANNER REPORT", styles['ReportTitle']))
-    story.append(Paragraph(
-        f"{datetime.now().strftime('%B %d, %Y')} | Pre-Market Analysis",
-        styles['SubTitle']
-    ))
-    story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#1a1a2e')))
-
-    # Top Opportunities
-    story.append(Paragraph("TOP OPPORTUNITIES", styles['SectionHeader']))
-
-    if analysis.top_opportunities:
-        for opp in analysis.top_opportunities:
-            # ASCII conviction bar — avoids Unicode block character issues
-            filled = "#" * opp.conviction
-            empty = "-" * (10 - opp.conviction)
-            conviction_bar = f"[{filled}{empty}] {opp.conviction}/10"
-
-            # Ticker header — use ASCII hyphen instead of Unicode em dash
-            header_text = f"#{opp.rank} {_e(opp.ticker)} - {_e(opp.company)}"
-            story.append(Paragraph(header_text, styles['TickerHeader']))
-
-            if opp.is_portfolio:
-                story.append(Paragraph("*** PORTFOLIO HOLDING ***", styles['PortfolioBadge']))
-
-            setup_label = "Day Trade" if opp.setup_type == "day_trade" else "Swing"
-            horizon_str = (
-                f" &nbsp;&nbsp;|&nbsp;&nbsp; <b>Horizon:</b> {_e(opp.time_horizon)}"
-                if opp.time_horizon else ""
-            )
-
-            story.append(Paragraph(
-                f"<b>Type:</b> {setup_label}{horizon_str}"
-                f" &nbsp;&nbsp;|&nbsp;&nbsp; <b>Conviction:</b> {conviction_bar}",
-                styles['ScanBodyText']
-            ))
-
-            story.append(Paragraph(f"<b>Catalyst:</b> {_e(opp.catalyst)}", styles['ScanBodyText']))
-            story.append(Paragraph(f"<b>Thesis:</b> {_e(opp.thesis)}", styles['ScanBodyText']))
-            story.append(Paragraph(f"<b>Trade Setup:</b> {_e(opp.trade_setup)}", styles['ScanBodyText']))
-            story.append(Paragraph(f"<b>Key Risk:</b> {_e(opp.key_risk)}", styles['RiskText']))
+    return styles
+
+
+# Plain hex strings — avoids color.hexval() returning invalid '0xffRRGGBB' format
+SECTOR_COLORS = {
+    "Bullish":  ("#2e7d32", "Bullish"),
+    "Neutral":  ("#666666", "Neutral"),
+    "Cautious": ("#f57c00", "Cautious"),
+    "Bearish":  ("#c62828", "Bearish"),
+}
+
+
+class IncrementalReport:
+    """Lays out report sections item by item so layout can start while the
+    analysis is still streaming; ``build`` writes the PDF."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.styles = _build_styles()
+        self.opportunities = []  # (ticker, flowables) per item, in arrival order
+        self.watchlist = []
+        self.no_action = []
+        self.sectors = []
+        self.dropped = {}
+
+    def add_opportunity(self, opp: Opportunity):
+        styles = self.styles
+        flowables = []
+        # ASCII conviction bar — avoids Unicode block character issues
+        filled = "#" * opp.conviction
+        empty = "-" * (10 - opp.conviction)
+        conviction_bar = f"[{filled}{empty}] {opp.conviction}/10"
+
+        # Ticker header — use ASCII hyphen instead of Unicode em dash
+        header_text = f"#{opp.rank} {_e(opp.ticker)} - {_e(opp.company)}"
+        flowables.append(Paragraph(header_text, styles['TickerHeader']))
+
+        if opp.is_portfolio:
+            flowables.append(Paragraph("*** PORTFOLIO HOLDING ***", styles['PortfolioBadge']))
+
+        setup_label = "Day Trade" if opp.setup_type == "day_trade" else "Swing"
+        horizon_str = (
+            f" &nbsp;&nbsp;|&nbsp;&nbsp; <b>Horizon:</b> {_e(opp.time_horizon)}"
+            if opp.time_horizon else ""
+        )
 
-            story.append(Spacer(1, 10))
-    else:
-        story.append(Paragraph("No actionable opportunities identified today.", styles['ScanBodyText']))
+        flowables.append(Paragraph(
+            f"<b>Type:</b> {setup_label}{horizon_str}"
+            f" &nbsp;&nbsp;|&nbsp;&nbsp; <b>Conviction:</b> {conviction_bar}",
+            styles['ScanBodyText']
+        ))
 
-    # Watchlist
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#cccccc')))
-    story.append(Paragraph("WATCHLIST", styles['SectionHeader']))
+        flowables.append(Paragraph(f"<b>Catalyst:</b> {_e(opp.catalyst)}", styles['ScanBodyText']))
+        flowables.append(Paragraph(f"<b>Thesis:</b> {_e(opp.thesis)}", styles['ScanBodyText']))
+        flowables.append(Paragraph(f"<b>Trade Setup:</b> {_e(opp.trade_setup)}", styles['ScanBodyText']))
+        flowables.append(Paragraph(f"<b>Key Risk:</b> {_e(opp.key_risk)}", styles['RiskText']))
 
-    if analysis.watchlist:
-        for item in analysis.watchlist:
-            story.append(Paragraph(
-                f"<b>{_e(item.ticker)}:</b> {_e(item.reason)}",
-                styles['ScanBodyText']
-            ))
-    else:
-        story.append(Paragraph("No watchlist items.", styles['ScanBodyText']))
+        flowables.append(Spacer(1, 10))
+        self.opportunities.append((opp.ticker, flowables))
 
-    # No Action
-    if analysis.no_action:
-        story.append(Spacer(1, 10))
-        story.append(Paragraph("NO ACTION", styles['SectionHeader']))
-        for item in analysis.no_action:
-            story.append(Paragraph(
-                f"<b>{_e(item.ticker)}:</b> {_e(item.reason)}",
-                styles['ScanBodyText']
-            ))
+    def _ticker_line(self, item: WatchlistItem) -> Paragraph:
+        return Paragraph(f"<b>{_e(item.ticker)}:</b> {_e(item.reason)}", self.styles['ScanBodyText'])
 
-    # Sector Summary
-    story.append(Spacer(1, 15))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#cccccc')))
-    story.append(Paragraph("SECTOR SUMMARY", styles['SectionHeader']))
+    def add_watchlist(self, item: WatchlistItem):
+        self.watchlist.append((item.ticker, [self._ticker_line(item)]))
 
-    # Plain hex strings — avoids color.hexval() returning invalid '0xffRRGGBB' format
-    sector_colors = {
-        "Bullish":  ("#2e7d32", "Bullish"),
-        "Neutral":  ("#666666", "Neutral"),
-        "Cautious": ("#f57c00", "Cautious"),
-        "Bearish":  ("#c62828", "Bearish"),
-    }
+    def add_no_action(self, item: WatchlistItem):
+        self.no_action.append((item.ticker, [self._ticker_line(item)]))
 
-    for sector, summary in analysis.sector_summary.items():
+    def add_sector(self, sector: str, summary):
+        styles = self.styles
+        flowables = []
         display_name = sector.replace("_", " ").title()
 
         if hasattr(summary, 'outlook'):
@@ -188,42 +166,157 @@ def generate_pdf_report(analysis: ScanAnalysis, output_path: str) -> str:
             overview = str(summary)
             news_items = []
 
-        color_hex, outlook_label = sector_colors.get(outlook, ("#666666", outlook))
+        color_hex, outlook_label = SECTOR_COLORS.get(outlook, ("#666666", outlook))
 
-        story.append(Paragraph(
+        flowables.append(Paragraph(
             f"<b>{_e(display_name)}</b> - "
             f"<font color='{color_hex}'>{_e(outlook_label)}</font>",
             styles['TickerHeader']
         ))
 
         if overview:
-            story.append(Paragraph(_e(overview), styles['ScanBodyText']))
+            flowables.append(Paragraph(_e(overview), styles['ScanBodyText']))
 
         if news_items:
             for news in news_items[:3]:
-                story.append(Paragraph(
+                flowables.append(Paragraph(
                     f"- <link href='{_e(news.url)}'>"
                     f"<font color='#1565c0'>{_e(news.title)}</font></link>",
                     styles['ScanBodyText']
                 ))
 
-        story.append(Spacer(1, 8))
-
-    # Footer
-    story.append(Spacer(1, 30))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#eeeeee')))
-    story.append(Paragraph(
-        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
-        "This is an automated scan. Not financial advice.",
-        ParagraphStyle(
-            name='Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#999999'),
-            spaceBefore=10
+        flowables.append(Spacer(1, 8))
+        self.sectors.append((sector, flowables))
+
+    def add(self, section: str, key, item):
+        """Dispatch a streamed analysis item to its section."""
+        if section == "top_opportunities":
+            self.add_opportunity(item)
+        elif section == "watchlist":
+            self.add_watchlist(item)
+        elif section == "no_action":
+            self.add_no_action(item)
+        elif section == "sector_summary":
+            self.add_sector(key, item)
+
+    def _matches(self, analysis: ScanAnalysis) -> bool:
+        return (
+            [t for t, _ in self.opportunities] == [o.ticker for o in analysis.top_opportunities]
+            and [t for t, _ in self.watchlist] == [w.ticker for w in analysis.watchlist]
+            and [t for t, _ in self.no_action] == [n.ticker for n in analysis.no_action]
+            and [s for s, _ in self.sectors] == list(analysis.sector_summary)
         )
-    ))
 
-    doc.build(story)
+    def load(self, analysis: ScanAnalysis):
+        """Lay out every section from a finished analysis, replacing streamed items."""
+        self.opportunities, self.watchlist, self.no_action, self.sectors = [], [], [], []
+        self.dropped = analysis.dropped_items
+        for opp in analysis.top_opportunities:
+            self.add_opportunity(opp)
+        for item in analysis.watchlist:
+            self.add_watchlist(item)
+        for item in analysis.no_action:
+            self.add_no_action(item)
+        for sector, summary in analysis.sector_summary.items():
+            self.add_sector(sector, summary)
+
+    def build(self, analysis: Optional[ScanAnalysis] = None) -> str:
+        """Write the PDF. Streamed sections are reused when they match ``analysis``."""
+        if analysis is not None and not self._matches(analysis):
+            self.load(analysis)
+        elif analysis is not None:
+            self.dropped = analysis.dropped_items
+
+        styles = self.styles
+        doc = SimpleDocTemplate(
+            self.output_path,
+            pagesize=letter,
+            leftMargin=0.75 * inch,
+            rightMargin=0.75 * inch,
+            topMargin=0.75 * inch,
+            bottomMargin=0.75 * inch
+        )
+
+        story = []
+
+        # Title
+        story.append(Paragraph("MARKET SCANNER REPORT", styles['ReportTitle']))
+        story.append(Paragraph(
+            f"{datetime.now().strftime('%B %d, %Y')} | Pre-Market Analysis",
+            styles['SubTitle']
+        ))
+        story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#1a1a2e')))
+
+        # Top Opportunities
+        story.append(Paragraph("TOP OPPORTUNITIES", styles['SectionHeader']))
+        if self.opportunities:
+            for _, flowables in self.opportunities:
+                story.extend(flowables)
+        else:
+            story.append(Paragraph("No actionable opportunities identified today.", styles['ScanBodyText']))
+
+        # Watchlist
+        story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#cccccc')))
+        story.append(Paragraph("WATCHLIST", styles['SectionHeader']))
+        if self.watchlist:
+            for _, flowables in self.watchlist:
+                story.extend(flowables)
+        else:
+            story.append(Paragraph("No watchlist items.", styles['ScanBodyText']))
+
+        # No Action
+        if self.no_action:
+            story.append(Spacer(1, 10))
+            story.append(Paragraph("NO ACTION", styles['SectionHeader']))
+            for _, flowables in self.no_action:
+                story.extend(flowables)
+
+        # Sector Summary
+        story.append(Spacer(1, 15))
+        story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#cccccc')))
+        story.append(Paragraph("SECTOR SUMMARY", styles['SectionHeader']))
+        for _, flowables in self.sectors:
+            story.extend(flowables)
+
+        # Items trimmed from the prompt so readers know what the analysis never saw
+        if self.dropped:
+            story.append(Spacer(1, 15))
+            story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#cccccc')))
+            story.append(Paragraph("OMITTED FROM ANALYSIS", styles['SectionHeader']))
+            story.append(Paragraph(
+                "Lower-priority items left out of the prompt (below the pre-ranking cut or over the token budget):",
+                styles['ScanBodyText']
+            ))
+            for section, labels in self.dropped.items():
+                shown = ", ".join(_e(label) for label in list(dict.fromkeys(labels))[:15])
+                more = f" (+{len(labels) - 15} more)" if len(labels) > 15 else ""
+                story.append(Paragraph(
+                    f"<b>{_e(section.replace('_', ' ').title())}</b> ({len(labels)}): {shown}{more}",
+                    styles['ScanBodyText']
+                ))
+
+        # Footer
+        story.append(Spacer(1, 30))
+        story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#eeeeee')))
+        story.append(Paragraph(
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
+            "This is an automated scan. Not financial advice.",
+            ParagraphStyle(
+                name='Footer',
+                parent=styles['Normal'],
+                fontSize=8,
+                textColor=colors.HexColor('#999999'),
+                spaceBefore=10
+            )
+        ))
+
+        doc.build(story)
+
+        return self.output_path
 
-    return output_path
+
+def generate_pdf_report(analysis: ScanAnalysis, output_path: str) -> str:
+    """Generate PDF report from scan analysis."""
+    report = IncrementalReport(output_path)
+    report.load(analysis)
+    return report.build()
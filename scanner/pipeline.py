@@ -0,0 +1,196 @@
+"""Stage Executor - Run independent scanners concurrently."""
+
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel
+
+
+class Stage(BaseModel):
+    """A unit of work in the scan pipeline.
+
+    ``func`` is called with the results of ``depends_on`` as keyword arguments.
+    If the stage fails or exceeds ``timeout`` seconds (the executor's
+    ``default_timeout`` when unset), ``default`` is used as its result so
+    downstream stages and the analyzer still get a value.
+    """
+    name: str
+    func: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    default: Any = None
+
+
+class StageReport(BaseModel):
+    """Outcome of a single stage run."""
+    name: str
+    status: str = "pending"  # ok, failed, timeout, resumed
+    duration: float = 0.0
+    error: str = ""
+
+
+class StageExecutor:
+    """Runs stages on worker threads as soon as their dependencies finish.
+
+    At most ``max_workers`` stages run at once. A timeout does not kill the
+    stage's thread; it is abandoned and keeps running in the background.
+    Workers are daemon threads, so a hung stage can't keep the process
+    alive after the run has moved on.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        default_timeout: Optional[float] = None,
+        on_complete: Optional[Callable[[str, Any, StageReport], None]] = None
+    ):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.on_complete = on_complete
+        self.stages: Dict[str, Stage] = {}
+        self.reports: Dict[str, StageReport] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends_on: Tuple[str, ...] = (),
+        timeout: Optional[float] = None,
+        default: Any = None
+    ) -> "StageExecutor":
+        """Register a stage. Dependencies must be registered before running."""
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage name: {name}")
+        self.stages[name] = Stage(
+            name=name, func=func, depends_on=tuple(depends_on), timeout=timeout, default=default
+        )
+        return self
+
+    def _validate(self):
+        """Reject unknown dependencies and cycles before anything runs."""
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _finish(self, results: Dict[str, Any], name: str, value: Any, report: StageReport):
+        """Record a stage result and notify the completion hook."""
+        results[name] = value
+        self.reports[name] = report
+        if self.on_complete:
+            try:
+                self.on_complete(name, value, report)
+            except Exception as e:
+                print(f"[Warning] Stage callback failed for {name}: {e}")
+
+    @staticmethod
+    def _start(stage: Stage, kwargs: Dict[str, Any]) -> Future:
+        """Run ``stage`` on its own daemon thread; the future holds its result."""
+        future: Future = Future()
+
+        def target():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(stage.func(**kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=target, name=f"stage-{stage.name}", daemon=True).start()
+        return future
+
+    def _resume(self, results: Dict[str, Any], completed: Dict[str, Any], skippable: Iterable[str]) -> Dict[str, Stage]:
+        """Seed results from a previous run; return the stages still to run.
+
+        ``skippable`` stages finished before but have no stored result (e.g.
+        in-memory price panels); they are skipped unless a stage that still
+        has to run depends on them.
+        """
+        for name, value in completed.items():
+            if name in self.stages:
+                self._finish(results, name, value, StageReport(name=name, status="resumed"))
+        pending = {n: s for n, s in self.stages.items() if n not in results}
+        changed = True
+        while changed:
+            changed = False
+            for name in [n for n in pending if n in skippable]:
+                if not any(name in s.depends_on for s in pending.values()):
+                    del pending[name]
+                    changed = True
+        return pending
+
+    def run(self, completed: Optional[Dict[str, Any]] = None, skippable: Iterable[str] = ()) -> Dict[str, Any]:
+        """Run all stages and return a mapping of stage name -> result.
+
+        ``completed`` holds results restored from an earlier run; those stages
+        are reported as "resumed" and not run again.
+        """
+        self._validate()
+        results: Dict[str, Any] = {}
+        pending = self._resume(results, completed or {}, set(skippable))
+        running = {}  # future -> (stage, started, deadline)
+
+        while pending or running:
+            # Start every stage whose dependencies have all produced a result, up to max_workers
+            for name in [n for n, s in pending.items() if all(d in results for d in s.depends_on)]:
+                if len(running) >= self.max_workers:
+                    break
+                stage = pending.pop(name)
+                kwargs = {dep: results[dep] for dep in stage.depends_on}
+                timeout = stage.timeout if stage.timeout is not None else self.default_timeout
+                started = time.monotonic()
+                deadline = started + timeout if timeout else None
+                running[self._start(stage, kwargs)] = (stage, started, deadline)
+
+            if not running:
+                break
+
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, started, _ = running.pop(future)
+                report = StageReport(name=stage.name, duration=time.monotonic() - started)
+                try:
+                    value = future.result()
+                    report.status = "ok"
+                except Exception as e:
+                    print(f"[Warning] Stage '{stage.name}' failed: {e}")
+                    value = stage.default
+                    report.status = "failed"
+                    report.error = str(e)
+                self._finish(results, stage.name, value, report)
+
+            # Threads cannot be killed; a timed-out stage is abandoned (its daemon
+            # thread runs on) and its default is used so the rest of the pipeline proceeds.
+            now = time.monotonic()
+            for future, (stage, started, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline and not future.done():
+                    running.pop(future)
+                    print(f"[Warning] Stage '{stage.name}' exceeded {deadline - started:.0f}s limit")
+                    report = StageReport(name=stage.name, status="timeout", duration=now - started, error="timed out")
+                    self._finish(results, stage.name, stage.default, report)
+
+        return results
+
+    def summary(self) -> List[StageReport]:
+        """Stage reports in registration order."""
+        return [self.reports[name] for name in self.stages if name in self.reports]
@@ -0,0 +1,216 @@
+"""Provider Clients - Pooled HTTP sessions for Finnhub and FMP."""
+
+import threading
+import time
+from typing import Any, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache.responses import get_response_cache
+from .config import FINNHUB_BASE_URL, FINNHUB_API_KEY, FMP_BASE_URL, FMP_API_KEY
+from .ratelimit import FinnhubScheduler, get_finnhub_scheduler
+
+
+class ProviderClient:
+    """Keep-alive session for one API host with per-endpoint call stats."""
+
+    name = "provider"
+    auth_param = "apikey"
+
+    def __init__(self, base_url: str, api_key: Optional[str], pool_size: int = 16, timeout: int = 10):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "stockerino-scanner",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._stats_lock = threading.Lock()
+        self._stats: dict = {}
+
+    def _before_request(self, symbol: Optional[str]):
+        """Hook for rate limiting; no-op by default."""
+
+    def _on_throttled(self, resp: requests.Response) -> bool:
+        """Hook called on HTTP 429. Return True to retry the request."""
+        return False
+
+    def _record(self, path: str, latency: float, wire_bytes: int, body_bytes: int, error: bool):
+        with self._stats_lock:
+            s = self._stats.setdefault(path, {
+                "calls": 0, "errors": 0, "wire_bytes": 0, "body_bytes": 0, "latency_s": 0.0
+            })
+            s["calls"] += 1
+            s["errors"] += int(error)
+            s["wire_bytes"] += wire_bytes
+            s["body_bytes"] += body_bytes
+            s["latency_s"] += latency
+
+    def _get(self, path: str, params: Optional[dict] = None, symbol: Optional[str] = None) -> Any:
+        """GET ``path`` and return decoded JSON, served from the response cache when fresh.
+
+        Cache hits skip rate limiting and spend no API quota. Raises on HTTP errors.
+        """
+        return get_response_cache().fetch(
+            f"{self.name}:{path}",
+            params,
+            lambda: self._request(path, params, symbol)
+        )
+
+    def _request(self, path: str, params: Optional[dict], symbol: Optional[str], retries: int = 2) -> Any:
+        """Perform the HTTP request (no caching)."""
+        params = dict(params or {})
+        params[self.auth_param] = self.api_key
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(retries + 1):
+            self._before_request(symbol)
+            start = time.perf_counter()
+            resp = None
+            try:
+                resp = self.session.get(url, params=params, timeout=self.timeout)
+                resp.content  # Read the body so latency and byte counts are final
+            finally:
+                latency = time.perf_counter() - start
+                if resp is not None:
+                    # raw.tell() counts bytes read off the socket (compressed size)
+                    wire = resp.raw.tell() if hasattr(resp.raw, "tell") else len(resp.content)
+                    self._record(path, latency, wire or len(resp.content), len(resp.content), not resp.ok)
+                else:
+                    self._record(path, latency, 0, 0, True)
+
+            if resp.status_code == 429 and attempt < retries and self._on_throttled(resp):
+                continue
+            break
+
+        resp.raise_for_status()
+        return resp.json()
+
+    def stats(self) -> dict:
+        """Per-endpoint call counts, bytes and cumulative latency."""
+        with self._stats_lock:
+            return {path: dict(s) for path, s in self._stats.items()}
+
+    def totals(self) -> dict:
+        """Stats summed over all endpoints."""
+        totals = {"calls": 0, "errors": 0, "wire_bytes": 0, "body_bytes": 0, "latency_s": 0.0}
+        for s in self.stats().values():
+            for key in totals:
+                totals[key] += s[key]
+        return totals
+
+
+class FinnhubClient(ProviderClient):
+    """Typed Finnhub endpoints, paced by the shared scheduler."""
+
+    name = "finnhub"
+    auth_param = "token"
+
+    def __init__(self, scheduler: Optional[FinnhubScheduler] = None, **kwargs):
+        super().__init__(FINNHUB_BASE_URL, FINNHUB_API_KEY, **kwargs)
+        self.scheduler = scheduler or get_finnhub_scheduler()
+
+    def _before_request(self, symbol: Optional[str]):
+        self.scheduler.acquire(symbol)
+
+    def _on_throttled(self, resp: requests.Response) -> bool:
+        try:
+            retry_after = float(resp.headers.get("Retry-After", 0))
+        except ValueError:
+            retry_after = 0
+        self.scheduler.throttle(retry_after)
+        return True
+
+    def quote(self, symbol: str) -> dict:
+        """Real-time quote: c (current), pc (prev close), o (open), dp (change %)."""
+        return self._get("/quote", {"symbol": symbol}, symbol=symbol) or {}
+
+    def basic_financials(self, symbol: str) -> dict:
+        """Metric dict from /stock/metric (52WeekHigh, 52WeekLow, ...)."""
+        data = self._get("/stock/metric", {"symbol": symbol, "metric": "all"}, symbol=symbol)
+        return (data or {}).get("metric", {}) or {}
+
+    def company_news(self, symbol: str, from_date: str, to_date: str) -> List[dict]:
+        """Company news articles between two YYYY-MM-DD dates."""
+        data = self._get("/company-news", {"symbol": symbol, "from": from_date, "to": to_date}, symbol=symbol)
+        return data if isinstance(data, list) else []
+
+    def market_news(self, category: str = "general", min_id: Optional[int] = None) -> List[dict]:
+        """Latest market-wide news for a category (general, forex, crypto, merger), newer than ``min_id``."""
+        params = {"category": category}
+        if min_id:
+            params["minId"] = min_id
+        data = self._get("/news", params)
+        return data if isinstance(data, list) else []
+
+    def company_profile(self, symbol: str) -> dict:
+        """Company profile from /stock/profile2 (name, exchange, industry, ...)."""
+        return self._get("/stock/profile2", {"symbol": symbol}, symbol=symbol) or {}
+
+    def earnings(self, symbol: str) -> List[dict]:
+        """Historical EPS actual vs estimate, most recent first."""
+        data = self._get("/stock/earnings", {"symbol": symbol}, symbol=symbol)
+        return data if isinstance(data, list) else []
+
+    def short_interest(self, symbol: str) -> List[dict]:
+        """Short interest records, most recent first."""
+        data = self._get("/stock/short-interest", {"symbol": symbol}, symbol=symbol)
+        return (data or {}).get("data", []) or []
+
+    def economic_calendar(self, from_date: str, to_date: str) -> List[dict]:
+        """Economic calendar events between two YYYY-MM-DD dates."""
+        data = self._get("/calendar/economic", {"from": from_date, "to": to_date})
+        return (data or {}).get("economicCalendar", []) or []
+
+    def earnings_calendar(self, from_date: str, to_date: str) -> List[dict]:
+        """Earnings calendar between two YYYY-MM-DD dates."""
+        data = self._get("/calendar/earnings", {"from": from_date, "to": to_date})
+        return (data or {}).get("earningsCalendar", []) or []
+
+
+class FMPClient(ProviderClient):
+    """Typed Financial Modeling Prep endpoints."""
+
+    name = "fmp"
+    auth_param = "apikey"
+
+    def __init__(self, **kwargs):
+        super().__init__(FMP_BASE_URL, FMP_API_KEY, **kwargs)
+
+    def earnings_calendar(self, from_date: str, to_date: str) -> List[dict]:
+        """Earnings calendar between two YYYY-MM-DD dates."""
+        data = self._get("/earnings-calendar", {"from": from_date, "to": to_date})
+        return data if isinstance(data, list) else []
+
+
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def get_finnhub_client() -> FinnhubClient:
+    """Process-wide Finnhub client so every scanner shares one connection pool."""
+    with _clients_lock:
+        if "finnhub" not in _clients:
+            _clients["finnhub"] = FinnhubClient()
+        return _clients["finnhub"]
+
+
+def get_fmp_client() -> FMPClient:
+    """Process-wide FMP client."""
+    with _clients_lock:
+        if "fmp" not in _clients:
+            _clients["fmp"] = FMPClient()
+        return _clients["fmp"]
+
+
+def provider_stats() -> dict:
+    """Totals per provider for clients created in this process."""
+    with _clients_lock:
+        clients = dict(_clients)
+    return {name: client.totals() for name, client in clients.items()}
@@ -0,0 +1,146 @@
+"""Local Pre-Ranking - Deterministic composite score per ticker.
+
+Every scanner's output is merged into one feature matrix (ticker x signal),
+each feature is scaled to 0-1 against a fixed saturation point, and the
+weighted sum gives a composite score. The shortlist (top N plus every
+portfolio holding) is what the prompt carries in full detail, and the same
+ranking stands in for Claude when the analysis call fails.
+"""
+
+import math
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from .config import PRERANK_WEIGHTS
+from .models import EarningsResult, MomentumResult, NewsResult, Opportunity, ScanAnalysis
+
+FEATURES = ("premarket", "news", "momentum", "rsi", "options", "earnings", "portfolio")
+
+# Raw value at which each feature saturates to 1.0
+_SCALES = {
+    "premarket": 10.0,   # |pre-market move| in %
+    "news": 6.0,         # Summed |sentiment score| of stories mentioning the ticker
+    "momentum": 3.0,     # Momentum signal count
+    "rsi": 20.0,         # RSI points beyond 30/70
+    "options": 5.0,      # Best vol/OI ratio, doubled for strong signals, plus call/put skew
+    "earnings": 1.0,     # Already 0-1: 1 for a report today, 0 at a week out
+    "portfolio": 1.0,
+}
+
+
+class TickerScore(NamedTuple):
+    symbol: str
+    score: float
+    components: Dict[str, float]  # Feature -> scaled value (0-1)
+
+
+def _days_until(report_date: str, today: date) -> Optional[int]:
+    try:
+        return (datetime.strptime(report_date[:10], "%Y-%m-%d").date() - today).days
+    except ValueError:
+        return None
+
+
+def score_tickers(
+    earnings: List[EarningsResult],
+    news: List[NewsResult],
+    momentum: List[MomentumResult],
+    technicals: list,
+    options: list,
+    call_put_ratios: dict,
+    premarket_movers: list,
+    portfolio: Iterable[str] = (),
+    weights: Optional[Dict[str, float]] = None,
+    today: Optional[date] = None
+) -> List[TickerScore]:
+    """Composite scores for every flagged ticker, highest first (ties by symbol)."""
+    weights = weights if weights is not None else PRERANK_WEIGHTS
+    today = today or date.today()
+    portfolio = set(portfolio)
+
+    symbols = list(dict.fromkeys(
+        [x.symbol for group in (premarket_movers, news, momentum, technicals, options, earnings) for x in group]
+        + [s for n in news for s in n.related_symbols]
+        + list(call_put_ratios)
+    ))
+    if not symbols:
+        return []
+    index = {s: i for i, s in enumerate(symbols)}
+    raw = np.zeros((len(symbols), len(FEATURES)))
+
+    def merge(ufunc, feature: str, pairs: list):
+        """Fold (symbol, value) pairs into a feature column with ``ufunc`` (max or add)."""
+        if pairs:
+            rows = np.fromiter((index[s] for s, _ in pairs), dtype=np.intp, count=len(pairs))
+            ufunc.at(raw[:, FEATURES.index(feature)], rows, np.array([v for _, v in pairs], dtype=float))
+
+    merge(np.maximum, "premarket", [(m.symbol, abs(m.change_pct)) for m in premarket_movers])
+    merge(np.add, "news", [
+        (s, abs(n.sentiment_score)) for n in news for s in dict.fromkeys([n.symbol] + n.related_symbols)
+    ])
+    merge(np.maximum, "momentum", [(m.symbol, len(m.signals)) for m in momentum])
+    merge(np.maximum, "rsi", [(t.symbol, max(abs(t.rsi_14 - 50) - 20, 0)) for t in technicals if t.rsi_14])
+    merge(np.maximum, "options", [
+        (o.symbol, o.volume_oi_ratio * (2 if o.signal_strength == "strong" else 1)) for o in options
+    ])
+    # A 3:1 call/put skew either way counts as much as a 1x vol/OI print
+    merge(np.add, "options", [
+        (symbol, abs(math.log(ratio)) / math.log(3) if ratio > 0 else 1.0) for symbol, ratio in call_put_ratios.items()
+    ])
+    days = [(e.symbol, _days_until(e.report_date, today)) for e in earnings]
+    merge(np.maximum, "earnings", [(s, 1 - d / 7) for s, d in days if d is not None and d >= 0])
+    merge(np.maximum, "portfolio", [(s, 1.0) for s in symbols if s in portfolio])
+
+    scales = np.array([_SCALES[f] for f in FEATURES])
+    scaled = np.clip(raw / scales, 0, 1)
+    scores = scaled @ np.array([weights.get(f, 0.0) for f in FEATURES])
+
+    order = np.lexsort((np.array(symbols), -scores))  # Score descending, then symbol
+    return [
+        TickerScore(symbols[i], float(scores[i]), dict(zip(FEATURES, scaled[i].tolist())))
+        for i in order
+    ]
+
+
+def shortlist(scores: List[TickerScore], top_n: int, portfolio: Iterable[str] = ()) -> List[str]:
+    """The ``top_n`` highest-scoring tickers plus every flagged portfolio holding, in score order."""
+    portfolio = set(portfolio)
+    return [s.symbol for rank, s in enumerate(scores) if rank < top_n or s.symbol in portfolio]
+
+
+def _catalyst(components: Dict[str, float]) -> str:
+    labels = {
+        "premarket": "pre-market move",
+        "news": "news flow",
+        "momentum": "momentum signals",
+        "rsi": "RSI extreme",
+        "options": "unusual options activity",
+        "earnings": "upcoming earnings",
+    }
+    drivers = sorted((f for f in labels if components[f] > 0), key=lambda f: components[f], reverse=True)
+    text = ", ".join(labels[f] for f in drivers[:3])
+    return text[:1].upper() + text[1:] if text else "Flagged by scanners"
+
+
+def fallback_analysis(scores: List[TickerScore], date_str: str, top: int = 3) -> ScanAnalysis:
+    """A ScanAnalysis from the local ranking alone, for when Claude is unavailable."""
+    max_score = sum(PRERANK_WEIGHTS.values()) or 1.0
+    opportunities = []
+    for rank, s in enumerate(scores[:top], 1):
+        fast = s.components["premarket"] + s.components["news"] + s.components["options"]
+        slow = s.components["momentum"] + s.components["rsi"] + s.components["earnings"]
+        opportunities.append(Opportunity(
+            rank=rank,
+            ticker=s.symbol,
+            company=s.symbol,
+            setup_type="day_trade" if fast >= slow else "swing",
+            catalyst=_catalyst(s.components),
+            thesis=f"Ranked #{rank} by the local composite score ({s.score:.2f}). No LLM analysis was available for this run.",
+            trade_setup="Review the scanner data manually before trading.",
+            key_risk="Unreviewed signal: the ranking weighs signal strength, not setup quality.",
+            conviction=max(1, min(10, round(10 * s.score / max_score))),
+            is_portfolio=s.components["portfolio"] > 0,
+        ))
+    return ScanAnalysis(scan_date=date_str, top_opportunities=opportunities)
@@ -0,0 +1,138 @@
+"""Finnhub Request Scheduler - Shared token bucket with priority lanes."""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Iterable, Optional
+
+from .config import FINNHUB_CALLS_PER_MINUTE, FINNHUB_BURST
+
+# Lower number is served first
+LANE_PRIORITY = 0  # Portfolio tickers and market-wide calls (calendars)
+LANE_NORMAL = 1    # Everything else on the watchlist
+
+
+class FinnhubScheduler:
+    """Token bucket shared by every Finnhub caller.
+
+    Tokens refill continuously at ``calls_per_minute / 60`` per second up to
+    ``burst``. Waiting callers are served strictly by lane, then FIFO, so
+    portfolio tickers jump ahead of the rest of the watchlist when several
+    scanners run in parallel.
+    """
+
+    def __init__(self, calls_per_minute: int = FINNHUB_CALLS_PER_MINUTE, burst: int = FINNHUB_BURST):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._priority_symbols: set = set()
+
+        # Stats
+        self.calls = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+        self.lane_calls = {LANE_PRIORITY: 0, LANE_NORMAL: 0}
+
+    def set_priority_symbols(self, symbols: Iterable[str]):
+        """Mark symbols (usually the portfolio) to be served first."""
+        with self._cond:
+            self._priority_symbols = {s.upper() for s in symbols}
+
+    def lane_for(self, symbol: Optional[str]) -> int:
+        """Market-wide calls and portfolio tickers use the priority lane."""
+        if symbol is None or symbol.upper() in self._priority_symbols:
+            return LANE_PRIORITY
+        return LANE_NORMAL
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, symbol: Optional[str] = None) -> float:
+        """Block until a request slot is available. Returns seconds waited."""
+        start = time.monotonic()
+        with self._cond:
+            lane = self.lane_for(symbol)
+            ticket = (lane, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+
+            served = False
+            try:
+                while True:
+                    if self._waiters[0] == ticket:
+                        now = time.monotonic()
+                        self._refill(now)
+                        if now >= self._paused_until and self._tokens >= 1:
+                            self._tokens -= 1
+                            heapq.heappop(self._waiters)
+                            served = True
+                            break
+                        delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                        self._cond.wait(timeout=delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                if not served:
+                    # Interrupted while waiting: drop the ticket so later callers aren't stuck behind it
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self.calls += 1
+            self.lane_calls[lane] += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Pause all callers after a 429 instead of letting them retry into it."""
+        pause = retry_after if retry_after and retry_after > 0 else 1.0 / self.rate * self.capacity
+        with self._cond:
+            self.throttled += 1
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._cond.notify_all()
+
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a slot."""
+        with self._cond:
+            return len(self._waiters)
+
+    def stats(self) -> dict:
+        """Throughput and queueing summary for reporting."""
+        with self._cond:
+            return {
+                "calls": self.calls,
+                "priority_calls": self.lane_calls[LANE_PRIORITY],
+                "normal_calls": self.lane_calls[LANE_NORMAL],
+                "throttled": self.throttled,
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self.max_queue_depth,
+                "total_wait_s": round(self.total_wait, 2),
+                "avg_wait_s": round(self.total_wait / self.calls, 3) if self.calls else 0.0,
+                "max_wait_s": round(self.max_wait, 2),
+            }
+
+
+_scheduler: Optional[FinnhubScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_finnhub_scheduler() -> FinnhubScheduler:
+    """Process-wide scheduler shared by all Finnhub callers."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FinnhubScheduler()
+        return _scheduler
+
@@ -1,74 +1,40 @@
 """Earnings Scanner - Find stocks reporting earnings in next 5 trading days."""
 
-import requests
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from ..config import FMP_BASE_URL, FMP_API_KEY, FINNHUB_BASE_URL, FINNHUB_API_KEY, EARNINGS_LOOKAHEAD_DAYS
+from ..cache import EarningsStore
+from ..config import EARNINGS_HISTORY_QUARTERS, EARNINGS_LOOKAHEAD_DAYS
 from ..models import EarningsResult
+from ..providers import FinnhubClient, FMPClient, get_finnhub_client, get_fmp_client
 
 
 class EarningsScanner:
     """Scans for upcoming earnings in watchlist."""
 
-    def __init__(self):
-        self.fmp_base = FMP_BASE_URL
-        self.fmp_key = FMP_API_KEY
-        self.finnhub_base = FINNHUB_BASE_URL
-        self.finnhub_key = FINNHUB_API_KEY
+    def __init__(
+        self,
+        finnhub: Optional[FinnhubClient] = None,
+        fmp: Optional[FMPClient] = None,
+        store: Optional[EarningsStore] = None,
+        quarters: int = EARNINGS_HISTORY_QUARTERS
+    ):
+        self.finnhub = finnhub or get_finnhub_client()
+        self.fmp = fmp or get_fmp_client()
+        self.store = store or EarningsStore()
+        self.quarters = quarters
 
     def _get_earnings_calendar(self, from_date: str, to_date: str) -> List[dict]:
         """Fetch earnings calendar from FMP."""
         try:
-            url = f"{self.fmp_base}/earnings-calendar"
-            params = {
-                "from": from_date,
-                "to": to_date,
-                "apikey": self.fmp_key
-            }
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            return resp.json() if isinstance(resp.json(), list) else []
+            return self.fmp.earnings_calendar(from_date, to_date)
         except Exception as e:
             print(f"[Warning] Failed to fetch earnings calendar: {e}")
             return []
 
     def _get_earnings_history(self, ticker: str) -> List[dict]:
         """Fetch earnings history from Finnhub for beat rate calculation."""
-        try:
-            url = f"{self.finnhub_base}/stock/earnings"
-            params = {"symbol": ticker, "token": self.finnhub_key}
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            return resp.json() if isinstance(resp.json(), list) else []
-        except Exception as e:
-            print(f"[Warning] Failed to fetch earnings history for {ticker}: {e}")
-            return []
-
-    def _calculate_beat_rate(self, history: List[dict]) -> Optional[float]:
-        """Calculate beat rate from earnings history."""
-        if not history:
-            return None
-        
-        beats = sum(1 for e in history[:4] if e.get("actual") and e.get("estimate") 
-                    and e["actual"] > e["estimate"])
-        total = min(len(history), 4)
-        return beats / total if total > 0 else None
-
-    def _calculate_avg_surprise(self, history: List[dict]) -> Optional[float]:
-        """Calculate average surprise percentage."""
-        if not history:
-            return None
-        
-        surprises = []
-        for e in history[:4]:
-            actual = e.get("actual")
-            estimate = e.get("estimate")
-            if actual and estimate and estimate != 0:
-                surprise_pct = ((actual - estimate) / abs(estimate)) * 100
-                surprises.append(surprise_pct)
-        
-        return sum(surprises) / len(surprises) if surprises else None
+        return self.finnhub.earnings(ticker)
 
     def scan(self, watchlist: List[str]) -> List[EarningsResult]:
         """Scan for earnings in watchlist within lookahead period."""
@@ -85,14 +51,15 @@ class EarningsScanner:
         watchlist_set = set(t.upper() for t in watchlist)
         watchlist_earnings = [e for e in calendar if e.get("symbol", "").upper() in watchlist_set]
 
+        # Only symbols whose last known report has passed hit Finnhub
+        for e in watchlist_earnings:
+            self.store.note_report(e.get("symbol", ""), e.get("date", ""))
+        self.store.refresh([e.get("symbol", "") for e in watchlist_earnings], self._get_earnings_history)
+
         results = []
         for e in watchlist_earnings:
             symbol = e.get("symbol", "")
-            
-            # Get earnings history for beat rate
-            history = self._get_earnings_history(symbol)
-            beat_rate = self._calculate_beat_rate(history)
-            avg_surprise = self._calculate_avg_surprise(history)
+            stats = self.store.aggregates(symbol, self.quarters)
 
             results.append(EarningsResult(
                 symbol=symbol,
@@ -100,8 +67,8 @@ class EarningsScanner:
                 report_time=e.get("time", "").upper() if e.get("time") else None,
                 eps_estimate=e.get("epsEstimated"),
                 revenue_estimate=e.get("revenueEstimated"),
-                beat_rate=beat_rate,
-                avg_surprise_pct=avg_surprise
+                beat_rate=stats["beat_rate"],
+                avg_surprise_pct=stats["avg_surprise_pct"]
             ))
 
         return results
@@ -1,11 +1,10 @@
 """Macro Event Calendar - Fed, CPI, Jobs, Major Earnings."""
 
-import requests
 from datetime import datetime, timedelta
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
-from ..config import FINNHUB_API_KEY, FINNHUB_BASE_URL
+from ..providers import FinnhubClient, get_finnhub_client
 
 
 class MacroEvent(BaseModel):
@@ -27,7 +26,9 @@ class EarningsEvent(BaseModel):
 class MacroCalendar:
     """Scans for upcoming macro events and major earnings."""
 
-    def __init__(self):
+    def __init__(self, finnhub: Optional[FinnhubClient] = None):
+        self.finnhub = finnhub or get_finnhub_client()
+        
         # High-impact earnings that move entire sectors
         self.sector_movers = {
             "NVDA": ["ai_semiconductors", "ai_infrastructure", "ai_software"],
@@ -51,18 +52,13 @@ class MacroCalendar:
             today = datetime.now()
             end_date = today + timedelta(days=days_ahead)
             
-            url = f"{FINNHUB_BASE_URL}/calendar/economic"
-            params = {
-                "from": today.strftime("%Y-%m-%d"),
-                "to": end_date.strftime("%Y-%m-%d"),
-                "token": FINNHUB_API_KEY
-            }
-            
-            resp = requests.get(url, params=params, timeout=10)
-            data = resp.json()
+            calendar = self.finnhub.economic_calendar(
+                today.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d")
+            )
             
-            if "economicCalendar" in data:
-                for item in data["economicCalendar"]:
+            if calendar:
+                for item in calendar:
                     # Filter for US and high-impact events
                     country = item.get("country", "")
                     impact = item.get("impact", "").lower()
@@ -109,18 +105,13 @@ class MacroCalendar:
             today = datetime.now()
             end_date = today + timedelta(days=days_ahead)
             
-            url = f"{FINNHUB_BASE_URL}/calendar/earnings"
-            params = {
-                "from": today.strftime("%Y-%m-%d"),
-                "to": end_date.strftime("%Y-%m-%d"),
-                "token": FINNHUB_API_KEY
-            }
-            
-            resp = requests.get(url, params=params, timeout=10)
-            data = resp.json()
+            calendar = self.finnhub.earnings_calendar(
+                today.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d")
+            )
             
-            if "earningsCalendar" in data:
-                for item in data["earningsCalendar"]:
+            if calendar:
+                for item in calendar:
                     symbol = item.get("symbol", "")
                     
                     # Only include sector-moving earnings
@@ -147,14 +138,15 @@ class MacroCalendar:
             "sector_moving_earnings": self.get_major_earnings(days_ahead)
         }
 
-    def format_warnings(self, days_ahead: int = 5) -> str:
+    def format_warnings(self, days_ahead: int = 5, landmines: Optional[dict] = None) -> str:
         """Format landmines as warnings for Claude."""
-        landmines = self.get_landmines(days_ahead)
+        if landmines is None:
+            landmines = self.get_landmines(days_ahead)
         
         lines = []
         
         # Economic events
-        econ = landmines["economic_events"]
+        econ = landmines.get("economic_events", [])
         if econ:
             lines.append("⚠️ MACRO LANDMINES (Economic Events):")
             for e in econ[:5]:  # Top 5
@@ -163,7 +155,7 @@ class MacroCalendar:
                     lines.append(f"    {e.description}")
         
         # Sector-moving earnings
-        earnings = landmines["sector_moving_earnings"]
+        earnings = landmines.get("sector_moving_earnings", [])
         if earnings:
             lines.append("\n⚠️ SECTOR-MOVING EARNINGS:")
             for e in earnings[:5]:  # Top 5
@@ -1,9 +1,10 @@
 """Market Context Scanner - SPY, QQQ, VIX, Sector ETFs."""
 
-import yfinance as yf
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
+from ..market_data import QuoteSnapshot, get_quote_snapshots
+
 
 class MarketContext(BaseModel):
     """Overall market conditions."""
@@ -37,29 +38,29 @@ class MarketContextScanner:
             "ARKQ": "Robotics/Automation"
         }
 
-    def scan(self) -> Optional[MarketContext]:
+    def symbols(self) -> List[str]:
+        """All symbols this scanner needs price data for."""
+        return list(self.indices) + list(self.sector_etfs)
+
+    def _price_and_change(self, snapshots: Dict[str, QuoteSnapshot], symbol: str) -> tuple:
+        """Latest regular-session price and % change vs the prior close."""
+        snapshot = snapshots.get(symbol)
+        if not snapshot or not snapshot.last_price:
+            return 0, 0
+        return snapshot.last_price, snapshot.change_pct or 0
+
+    def scan(self, snapshots: Optional[Dict[str, QuoteSnapshot]] = None) -> Optional[MarketContext]:
         """Get current market context."""
         try:
-            # Fetch index data
-            spy = yf.Ticker("SPY")
-            qqq = yf.Ticker("QQQ")
-            vix = yf.Ticker("^VIX")
-            
-            spy_info = spy.info
-            qqq_info = qqq.info
-            vix_info = vix.info
-            
-            spy_price = spy_info.get('currentPrice') or spy_info.get('regularMarketPrice', 0)
-            spy_prev = spy_info.get('previousClose', spy_price)
-            spy_change = ((spy_price - spy_prev) / spy_prev * 100) if spy_prev else 0
-            
-            qqq_price = qqq_info.get('currentPrice') or qqq_info.get('regularMarketPrice', 0)
-            qqq_prev = qqq_info.get('previousClose', qqq_price)
-            qqq_change = ((qqq_price - qqq_prev) / qqq_prev * 100) if qqq_prev else 0
+            if snapshots is None:
+                snapshots = get_quote_snapshots(self.symbols())
+            if "SPY" not in snapshots or "QQQ" not in snapshots:
+                print("[Warning] Failed to get market context: no index quotes")
+                return None
             
-            vix_level = vix_info.get('currentPrice') or vix_info.get('regularMarketPrice', 0)
-            vix_prev = vix_info.get('previousClose', vix_level)
-            vix_change = ((vix_level - vix_prev) / vix_prev * 100) if vix_prev else 0
+            spy_price, spy_change = self._price_and_change(snapshots, "SPY")
+            qqq_price, qqq_change = self._price_and_change(snapshots, "QQQ")
+            vix_level, vix_change = self._price_and_change(snapshots, "^VIX")
             
             # Determine market sentiment
             if vix_level > 25:
@@ -76,15 +77,10 @@ class MarketContextScanner:
             # Fetch sector ETF performance
             sector_perf = {}
             for etf, name in self.sector_etfs.items():
-                try:
-                    ticker = yf.Ticker(etf)
-                    info = ticker.info
-                    price = info.get('currentPrice') or info.get('regularMarketPrice', 0)
-                    prev = info.get('previousClose', price)
-                    change = ((price - prev) / prev * 100) if prev else 0
-                    sector_perf[etf] = round(change, 2)
-                except:
+                if etf not in snapshots:
                     continue
+                _, change = self._price_and_change(snapshots, etf)
+                sector_perf[etf] = round(change, 2)
             
             return MarketContext(
                 spy_price=round(spy_price, 2),
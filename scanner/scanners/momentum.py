@@ -1,49 +1,65 @@
 """Momentum Scanner - Flag unusual price/volume activity."""
 
-import requests
-from typing import List
+from typing import List, Optional
 
-from ..config import FINNHUB_BASE_URL, FINNHUB_API_KEY, VOLUME_THRESHOLD, PRICE_CHANGE_THRESHOLD
+from ..cache import ReferenceStore, get_reference_store
+from ..cache.reference import YEAR_RANGE
+from ..config import VOLUME_THRESHOLD, PRICE_CHANGE_THRESHOLD
+from ..market_data import PricePanel, download_price_panel
 from ..models import MomentumResult
+from ..providers import FinnhubClient, get_finnhub_client
 
 
 class MomentumScanner:
-    """Scans for momentum signals in watchlist using Finnhub."""
+    """Scans for momentum signals using Finnhub quotes and daily price history."""
 
-    def __init__(self):
-        self.finnhub_base = FINNHUB_BASE_URL
-        self.finnhub_key = FINNHUB_API_KEY
+    def __init__(self, finnhub: Optional[FinnhubClient] = None, reference: Optional[ReferenceStore] = None):
+        self.finnhub = finnhub or get_finnhub_client()
+        self.reference = reference or get_reference_store()
         self.volume_threshold = VOLUME_THRESHOLD
         self.price_threshold = PRICE_CHANGE_THRESHOLD
         self.high_proximity_pct = 5.0  # Within 5% of 52-week high
+        self.avg_volume_days = 20
+        self.year_bars = 252  # Trading days in 52 weeks
 
     def _get_quote(self, ticker: str) -> dict:
         """Fetch quote from Finnhub."""
         try:
-            url = f"{self.finnhub_base}/quote"
-            params = {"symbol": ticker, "token": self.finnhub_key}
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            return resp.json()
+            return self.finnhub.quote(ticker)
         except Exception as e:
             print(f"[Warning] Failed to fetch quote for {ticker}: {e}")
             return {}
 
-    def _get_basic_financials(self, ticker: str) -> dict:
-        """Fetch basic financials from Finnhub for 52-week high/low."""
-        try:
-            url = f"{self.finnhub_base}/stock/metric"
-            params = {"symbol": ticker, "metric": "all", "token": self.finnhub_key}
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("metric", {})
-        except Exception:
-            return {}
+    def _fetch_year_range(self, ticker: str) -> dict:
+        """52-week high/low from Finnhub basic financials, kept compact for the reference store."""
+        metrics = self.finnhub.basic_financials(ticker)
+        return {"high": metrics.get("52WeekHigh"), "low": metrics.get("52WeekLow")}
+
+    def _get_range_and_volume(self, ticker: str, panel: PricePanel) -> tuple:
+        """52-week high/low, last volume and average volume from daily bars."""
+        highs = panel.series(ticker, "high")[-self.year_bars:]
+        lows = panel.series(ticker, "low")[-self.year_bars:]
+        volumes = panel.series(ticker, "volume")
+        
+        year_high = float(highs.max()) if len(highs) else None
+        year_low = float(lows.min()) if len(lows) else None
+        volume = int(volumes[-1]) if len(volumes) else 0
+        # Average excludes the latest bar so a spike doesn't inflate its own baseline
+        baseline = volumes[-self.avg_volume_days - 1:-1]
+        avg_volume = int(baseline.mean()) if len(baseline) else 0
+        return year_high, year_low, volume, avg_volume
 
-    def scan(self, watchlist: List[str]) -> List[MomentumResult]:
+    def scan(self, watchlist: List[str], panel: Optional[PricePanel] = None) -> List[MomentumResult]:
         """Scan for momentum signals in watchlist."""
         results = []
+        if panel is None:
+            panel = download_price_panel(watchlist)
+        
+        # Finnhub metrics are only needed for tickers the panel lacks, and
+        # even then the reference store refetches them about once a week
+        missing = [t for t in watchlist if len(panel.series(t, "high")) == 0]
+        if missing:
+            self.reference.refresh(YEAR_RANGE, missing, self._fetch_year_range)
         
         for ticker in watchlist:
             quote = self._get_quote(ticker)
@@ -54,13 +70,17 @@ class MomentumScanner:
             prev_close = quote.get("pc", 0)
             change_pct = quote.get("dp", 0) or 0
             
-            # Get 52-week data
-            metrics = self._get_basic_financials(ticker)
-            year_high = metrics.get("52WeekHigh")
-            year_low = metrics.get("52WeekLow")
+            # 52-week range and volume come from the shared price panel
+            year_high, year_low, volume, avg_volume = self._get_range_and_volume(ticker, panel)
+            if year_high is None or year_low is None:
+                stored = self.reference.get(YEAR_RANGE, ticker) or {}
+                year_high, year_low = stored.get("high"), stored.get("low")
+                # The stored range can be a week old; today's price may have extended it
+                if year_high and price:
+                    year_high = max(year_high, price)
+                if year_low and price:
+                    year_low = min(year_low, price)
             
-            # Finnhub doesn't have volume in quote, skip volume signals
-            # Focus on price-based signals
             signals = []
             
             # Price change
@@ -68,6 +88,10 @@ class MomentumScanner:
                 direction = "up" if change_pct > 0 else "down"
                 signals.append(f"Price {direction} {abs(change_pct):.1f}%")
             
+            # Unusual volume on the latest session
+            if avg_volume and volume > avg_volume * self.volume_threshold:
+                signals.append(f"Volume {volume / avg_volume:.1f}x average")
+            
             # Near 52-week high
             if year_high and price > year_high * (1 - self.high_proximity_pct / 100):
                 signals.append(f"Near 52-week high (${year_high:.2f})")
@@ -90,8 +114,8 @@ class MomentumScanner:
                     symbol=ticker,
                     price=price,
                     change_pct=change_pct,
-                    volume=0,  # Not available in Finnhub free quote
-                    avg_volume=0,
+                    volume=volume,
+                    avg_volume=avg_volume,
                     year_high=year_high,
                     year_low=year_low,
                     signals=signals
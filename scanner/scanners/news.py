@@ -1,129 +1,213 @@
 """News Scanner - Identify catalyst-driven opportunities from recent news."""
 
-import requests
+import time
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional
 
-from ..config import FMP_BASE_URL, FMP_API_KEY, FINNHUB_BASE_URL, FINNHUB_API_KEY, SCAN_LOOKBACK_HOURS
+from ..cache import ArticleIndex, ReferenceStore, get_reference_store
+from ..cache.articles import article_key
+from ..cache.reference import PROFILE
+from ..config import NEWS_BULK_CATEGORIES, NEWS_INGEST_MODE, SCAN_LOOKBACK_HOURS
+from ..keywords import KeywordMatcher, SymbolMatcher
 from ..models import NewsResult
+from ..providers import FinnhubClient, get_finnhub_client
 
 
-# Keywords for sentiment scoring
-BULLISH_KEYWORDS = [
-    "acquisition", "acquire", "merger", "deal", "partnership",
-    "contract", "awarded", "patent", "fda approval", "breakthrough",
-    "upgrade", "outperform", "buy rating", "price target raised",
-    "beat", "exceeds", "record revenue", "guidance raised",
-    "ai", "artificial intelligence", "data center", "quantum",
-    "nuclear", "smr", "uranium", "robot", "autonomous"
-]
+# Keywords for sentiment scoring, with weights (specific phrases count more)
+BULLISH_KEYWORDS = {
+    "acquisition": 1, "acquire": 1, "merger": 1, "deal": 1, "partnership": 1,
+    "contract": 1, "awarded": 1, "patent": 1, "fda approval": 2, "breakthrough": 1,
+    "upgrade": 1, "outperform": 1, "buy rating": 2, "price target raised": 2,
+    "beat": 1, "exceeds": 1, "record revenue": 2, "guidance raised": 2,
+    "ai": 1, "artificial intelligence": 1, "data center": 1, "quantum": 1,
+    "nuclear": 1, "smr": 1, "uranium": 1, "robot": 1, "autonomous": 1
+}
 
-BEARISH_KEYWORDS = [
-    "downgrade", "sell rating", "price target cut", "misses",
-    "lawsuit", "investigation", "recall", "warning", "layoffs",
-    "guidance cut", "below expectations", "delays", "loss",
-    "bankruptcy", "default", "fraud", "sec probe"
-]
+BEARISH_KEYWORDS = {
+    "downgrade": 1, "sell rating": 2, "price target cut": 2, "misses": 1,
+    "lawsuit": 1, "investigation": 1, "recall": 1, "warning": 1, "layoffs": 1,
+    "guidance cut": 2, "below expectations": 2, "delays": 1, "loss": 1,
+    "bankruptcy": 2, "default": 1, "fraud": 2, "sec probe": 2
+}
+
+# Other forms that count as a keyword; short terms ("ai", "smr") match exactly
+KEYWORD_INFLECTIONS = {
+    "acquisition": ["acquisitions"], "acquire": ["acquires", "acquired"], "merger": ["mergers"],
+    "deal": ["deals"], "partnership": ["partnerships"], "contract": ["contracts"], "patent": ["patents"],
+    "breakthrough": ["breakthroughs"], "upgrade": ["upgrades", "upgraded"], "outperform": ["outperforms"],
+    "beat": ["beats"], "data center": ["data centers"], "robot": ["robots"],
+    "downgrade": ["downgrades", "downgraded"], "lawsuit": ["lawsuits"], "investigation": ["investigations"],
+    "recall": ["recalls", "recalled"], "warning": ["warnings"], "loss": ["losses"],
+    "default": ["defaults", "defaulted"],
+}
 
 
 class NewsScanner:
     """Scans for news catalysts in watchlist."""
 
-    def __init__(self):
-        self.fmp_base = FMP_BASE_URL
-        self.fmp_key = FMP_API_KEY
-        self.finnhub_base = FINNHUB_BASE_URL
-        self.finnhub_key = FINNHUB_API_KEY
+    def __init__(
+        self,
+        finnhub: Optional[FinnhubClient] = None,
+        index: Optional[ArticleIndex] = None,
+        reference: Optional[ReferenceStore] = None,
+        mode: str = NEWS_INGEST_MODE
+    ):
+        self.finnhub = finnhub or get_finnhub_client()
+        self.matcher = KeywordMatcher(BULLISH_KEYWORDS, BEARISH_KEYWORDS, inflections=KEYWORD_INFLECTIONS)
+        self.index = index or ArticleIndex()
+        self.reference = reference or get_reference_store()
+        self.mode = mode
+        self.last_stats: dict = {}
 
-    def _get_finnhub_news(self, ticker: str, from_date: str, to_date: str) -> List[dict]:
-        """Fetch company news from Finnhub."""
+    def _get_finnhub_news(self, ticker: str, from_date: str, to_date: str) -> Optional[List[dict]]:
+        """Fetch company news from Finnhub (None if the request failed)."""
         try:
-            url = f"{self.finnhub_base}/company-news"
-            params = {
-                "symbol": ticker,
-                "from": from_date,
-                "to": to_date,
-                "token": self.finnhub_key
-            }
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            return data if isinstance(data, list) else []
+            return self.finnhub.company_news(ticker, from_date, to_date)
         except Exception as e:
             print(f"[Warning] Failed to fetch news for {ticker}: {e}")
-            return []
+            return None
+
+    def _get_market_news(self, category: str) -> Optional[List[dict]]:
+        """Fetch a market-wide news feed, only articles newer than the last run's (None on failure)."""
+        try:
+            articles = self.finnhub.market_news(category, min_id=self.index.cursors.get(category))
+        except Exception as e:
+            print(f"[Warning] Failed to fetch {category} market news: {e}")
+            return None
+        ids = [a["id"] for a in articles if isinstance(a.get("id"), int)]
+        if ids:
+            self.index.cursors[category] = max(ids + [self.index.cursors.get(category, 0)])
+        return articles
+
+    def _fetch_profile(self, ticker: str) -> dict:
+        """Company name for the symbol index, kept compact for the reference store."""
+        return {"name": self.finnhub.company_profile(ticker).get("name", "")}
+
+    def _symbol_matcher(self, watchlist: List[str]) -> SymbolMatcher:
+        """Symbol/company-name index over the watchlist (names refresh monthly)."""
+        self.reference.refresh(PROFILE, watchlist, self._fetch_profile)
+        names = {t: (self.reference.get(PROFILE, t) or {}).get("name", "") for t in watchlist}
+        return SymbolMatcher(names)
+
+    def _collect_per_ticker(self, tickers: List[str], from_date: str, to_date: str) -> tuple:
+        """(ticker, article) pairs from one /company-news call per ticker, and the failure count."""
+        pairs, failures = [], 0
+        for ticker in tickers:
+            articles = self._get_finnhub_news(ticker, from_date, to_date)
+            if articles is None:
+                failures += 1
+                continue
+            pairs += [(ticker, article) for article in articles[:5]]  # Limit per ticker
+        return pairs, failures
+
+    def _collect_bulk(self, watchlist: List[str], portfolio: List[str], from_date: str, to_date: str) -> tuple:
+        """(ticker, article) pairs from a few market-wide feeds mapped to tickers locally.
+
+        Articles map to tickers via Finnhub's ``related`` field and the
+        symbol/company-name index; portfolio names are still fetched per
+        ticker so holdings never depend on feed coverage.
+        """
+        watchlist_set = set(watchlist)
+        matcher = self._symbol_matcher(watchlist)
+        pairs, failures = self._collect_per_ticker(portfolio, from_date, to_date)
+        for category in NEWS_BULK_CATEGORIES:
+            articles = self._get_market_news(category)
+            if articles is None:
+                failures += 1
+                continue
+            for article in articles:
+                related = [s.strip().upper() for s in (article.get("related") or "").split(",")]
+                text = f"{article.get('headline') or ''} {article.get('summary') or ''}"
+                tickers = dict.fromkeys(t for t in related + matcher.match(text) if t in watchlist_set)
+                pairs += [(ticker, article) for ticker in tickers]
+        return pairs, failures
 
     def _score_article(self, title: str, summary: str = "") -> tuple:
         """Score article for sentiment. Returns (score, sentiment, keywords)."""
-        text = f"{title} {summary}".lower()
-        
-        bullish_hits = []
-        bearish_hits = []
-        
-        for kw in BULLISH_KEYWORDS:
-            if kw in text:
-                bullish_hits.append(kw)
-        
-        for kw in BEARISH_KEYWORDS:
-            if kw in text:
-                bearish_hits.append(kw)
-        
-        score = len(bullish_hits) - len(bearish_hits)
-        
-        if score > 0:
-            sentiment = "bullish"
-            keywords = bullish_hits
-        elif score < 0:
-            sentiment = "bearish"
-            keywords = bearish_hits
-        else:
-            sentiment = "neutral"
-            keywords = bullish_hits + bearish_hits
-        
-        return score, sentiment, keywords
+        return self.matcher.score(f"{title} {summary}")
+
+    def _score_articles(self, articles: List[dict]) -> List[tuple]:
+        """Score a batch of articles in one matcher pass."""
+        return self.matcher.score_batch([
+            f"{a.get('headline') or ''} {a.get('summary') or ''}" for a in articles
+        ])
 
-    def scan(self, watchlist: List[str]) -> List[NewsResult]:
-        """Scan for news catalysts in watchlist."""
+    def scan(self, watchlist: List[str], portfolio: Optional[List[str]] = None) -> List[NewsResult]:
+        """Scan for news catalysts in watchlist.
+
+        Only articles missing from the cross-run index are scored; each
+        unique article is scored once however many tickers it maps to.
+        """
+        run_started = time.time()
         cutoff = datetime.now() - timedelta(hours=SCAN_LOOKBACK_HOURS)
+        fetch_from = cutoff
+        if self.index.last_run:
+            # Anything before the last successful run is already indexed (1h slack for late indexing)
+            fetch_from = max(cutoff, datetime.fromtimestamp(self.index.last_run) - timedelta(hours=1))
         to_date = datetime.now().strftime("%Y-%m-%d")
-        from_date = cutoff.strftime("%Y-%m-%d")
+        from_date = fetch_from.strftime("%Y-%m-%d")
+
+        if self.mode == "bulk":
+            portfolio = [t for t in (portfolio or []) if t in set(watchlist)]
+            pairs, failures = self._collect_bulk(watchlist, portfolio, from_date, to_date)
+        else:
+            pairs, failures = self._collect_per_ticker(watchlist, from_date, to_date)
 
+        pending: Dict[str, tuple] = {}  # key -> (article, tickers) for articles not yet indexed
+        fetched = seen = 0
+        for ticker, article in pairs:
+            # Parse timestamp
+            timestamp = article.get("datetime", 0)
+            if not timestamp:
+                continue
+            try:
+                pub_date = datetime.fromtimestamp(timestamp)
+            except (TypeError, ValueError, OSError):
+                continue
+            if pub_date < cutoff:
+                continue
+            fetched += 1
+            key = article_key(article)
+            if key in self.index:
+                self.index.link(key, ticker)
+                seen += 1
+            elif key in pending:
+                if ticker not in pending[key][1]:
+                    pending[key][1].append(ticker)
+            else:
+                pending[key] = (article, [ticker])
+
+        scores = self._score_articles([article for article, _ in pending.values()])
+        for (key, (article, tickers)), (score, sentiment, keywords) in zip(pending.items(), scores):
+            self.index.add(key, article, tickers[0], score, sentiment, keywords)
+            for ticker in tickers[1:]:
+                self.index.link(key, ticker)
+
+        try:
+            self.index.save(run_started if not failures else None)
+        except OSError as e:
+            print(f"[Warning] Failed to save article index: {e}")
+        self.last_stats = {"mode": self.mode, "fetched": fetched, "new": len(pending), "seen": seen, "failed": failures}
+
+        # Results cover the whole lookback window: new articles plus ones indexed by earlier runs
+        watchlist_set = set(watchlist)
         results = []
-        
-        for ticker in watchlist:
-            articles = self._get_finnhub_news(ticker, from_date, to_date)
-            
-            for article in articles[:5]:  # Limit per ticker
-                try:
-                    # Parse timestamp
-                    timestamp = article.get("datetime", 0)
-                    if timestamp:
-                        pub_date = datetime.fromtimestamp(timestamp)
-                        if pub_date < cutoff:
-                            continue
-                    else:
-                        continue
-                    
-                    title = article.get("headline", "")
-                    summary = article.get("summary", "")
-                    
-                    # Score the article
-                    score, sentiment, keywords = self._score_article(title, summary)
-                    
-                    # Only include if has sentiment signal
-                    if score != 0:
-                        results.append(NewsResult(
-                            symbol=ticker,
-                            title=title,
-                            published_date=pub_date,
-                            url=article.get("url", ""),
-                            source=article.get("source", "Unknown"),
-                            sentiment=sentiment,
-                            sentiment_score=score,
-                            keywords_matched=keywords
-                        ))
-                except Exception:
-                    continue
+        for entry in self.index.since(cutoff.timestamp()):
+            symbols = [s for s in entry["symbols"] if s in watchlist_set]
+            # Only include if has sentiment signal
+            if entry["score"] == 0 or not symbols:
+                continue
+            results.append(NewsResult(
+                symbol=symbols[0],
+                title=entry["headline"],
+                published_date=datetime.fromtimestamp(entry["published"]),
+                url=entry["url"],
+                source=entry["source"],
+                sentiment=entry["sentiment"],
+                sentiment_score=entry["score"],
+                keywords_matched=entry["keywords"],
+                related_symbols=symbols[1:]
+            ))
 
         # Sort by absolute sentiment score
         results.sort(key=lambda x: abs(x.sentiment_score), reverse=True)
@@ -1,10 +1,19 @@
 """Options Flow Scanner using Yahoo Finance."""
 
+import threading
+import numpy as np
+import pandas as pd
 import yfinance as yf
+from collections import namedtuple
 from datetime import datetime, timedelta
+from io import StringIO
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from ..cache.responses import get_response_cache
+
+OptionChain = namedtuple("OptionChain", ["calls", "puts"])
+
 
 class OptionsSignal(BaseModel):
     """Unusual options activity signal."""
@@ -21,18 +30,91 @@ class OptionsSignal(BaseModel):
     signal_strength: str  # "strong", "moderate"
 
 
+class OptionsChainCache:
+    """Per-run cache of option expirations and chains keyed by (ticker, expiry).
+
+    Misses fall through to the persistent response cache before Yahoo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stocks = {}
+        self._expirations = {}
+        self._chains = {}
+        self.downloads = 0
+        self.hits = 0
+
+    def _stock(self, ticker: str):
+        with self._lock:
+            if ticker not in self._stocks:
+                self._stocks[ticker] = yf.Ticker(ticker)
+            return self._stocks[ticker]
+
+    def expirations(self, ticker: str) -> tuple:
+        """Available expiry dates (YYYY-MM-DD), nearest first."""
+        with self._lock:
+            if ticker in self._expirations:
+                self.hits += 1
+                return self._expirations[ticker]
+        cache = get_response_cache()
+        hit, cached = cache.lookup("yahoo:options/expirations", {"symbol": ticker})
+        if hit:
+            expirations = tuple(cached)
+        else:
+            expirations = tuple(self._stock(ticker).options or ())
+            cache.store("yahoo:options/expirations", {"symbol": ticker}, list(expirations))
+        with self._lock:
+            self._expirations[ticker] = expirations
+        return expirations
+
+    def chain(self, ticker: str, expiry: str):
+        """Calls/puts chain for one expiry, downloaded at most once per run."""
+        key = (ticker, expiry)
+        with self._lock:
+            if key in self._chains:
+                self.hits += 1
+                return self._chains[key]
+        cache = get_response_cache()
+        params = {"symbol": ticker, "expiry": expiry}
+        hit, cached = cache.lookup("yahoo:options/chain", params)
+        if hit:
+            chain = OptionChain(
+                pd.read_json(StringIO(cached["calls"]), orient="split"),
+                pd.read_json(StringIO(cached["puts"]), orient="split")
+            )
+        else:
+            raw = self._stock(ticker).option_chain(expiry)
+            chain = OptionChain(raw.calls, raw.puts)
+            cache.store("yahoo:options/chain", params, {
+                "calls": chain.calls.to_json(orient="split", date_format="iso"),
+                "puts": chain.puts.to_json(orient="split", date_format="iso"),
+            })
+        with self._lock:
+            self._chains[key] = chain
+            self.downloads += int(not hit)
+        return chain
+
+
 class OptionsScanner:
     """Scans for unusual options activity."""
 
-    def __init__(self):
+    def __init__(self, chains: Optional[OptionsChainCache] = None):
         self.min_volume = 100  # Minimum volume to consider
         self.min_oi = 50  # Minimum open interest
         self.unusual_vol_oi_ratio = 1.0  # V/OI > 1 is unusual
         self.high_vol_oi_ratio = 2.0  # V/OI > 2 is very unusual
         self.max_expiry_days = 30  # Focus on near-term options
+        self.scan_expiries = 5  # Check first 5 expiries for unusual activity
+        self.ratio_expiries = 2  # First 2 expiries for call/put sentiment
+        self.chains = chains or OptionsChainCache()
+        self._call_put_ratios = {}
 
     def scan(self, tickers: List[str]) -> List[OptionsSignal]:
-        """Scan tickers for unusual options activity."""
+        """Scan tickers for unusual options activity.
+
+        Call/put ratios are computed from the same chains in this pass and
+        returned later by get_call_put_ratio without re-downloading.
+        """
         all_signals = []
         
         for ticker in tickers:
@@ -52,11 +134,9 @@ class OptionsScanner:
         """Scan single ticker for unusual options activity."""
         signals = []
         
-        stock = yf.Ticker(ticker)
-        
         # Get available expiration dates
         try:
-            expirations = stock.options
+            expirations = self.chains.expirations(ticker)
         except:
             return []
         
@@ -68,7 +148,7 @@ class OptionsScanner:
         max_expiry = today + timedelta(days=self.max_expiry_days)
         
         near_term_expiries = []
-        for exp in expirations[:5]:  # Check first 5 expiries
+        for exp in expirations[:self.scan_expiries]:
             try:
                 exp_date = datetime.strptime(exp, "%Y-%m-%d").date()
                 if exp_date <= max_expiry:
@@ -79,7 +159,7 @@ class OptionsScanner:
         # Scan each near-term expiry
         for expiry in near_term_expiries:
             try:
-                chain = stock.option_chain(expiry)
+                chain = self.chains.chain(ticker, expiry)
                 
                 # Scan calls
                 calls_signals = self._scan_chain(ticker, expiry, chain.calls, "call")
@@ -92,90 +172,99 @@ class OptionsScanner:
             except Exception as e:
                 continue
         
+        # Same pass: call/put ratio from the nearest expiries (mostly already downloaded above)
+        ratio = self._call_put_ratio(ticker, expirations)
+        if ratio is not None:
+            self._call_put_ratios[ticker] = ratio
+        
         return signals
 
+    @staticmethod
+    def _column(chain_df, name: str) -> np.ndarray:
+        """Numeric column as a float array with missing values as 0."""
+        if name not in chain_df.columns:
+            return np.zeros(len(chain_df))
+        return np.nan_to_num(pd.to_numeric(chain_df[name], errors="coerce").to_numpy(dtype=float))
+
     def _scan_chain(self, ticker: str, expiry: str, chain_df, option_type: str) -> List[OptionsSignal]:
-        """Scan options chain for unusual activity."""
-        signals = []
-        
+        """Scan options chain for unusual activity.
+
+        Filters, ratios, strength and IV are computed as whole-column array
+        operations; only rows that pass become OptionsSignal objects.
+        """
         if chain_df is None or chain_df.empty:
             return []
         
-        for _, row in chain_df.iterrows():
-            volume = int(row.get('volume', 0) or 0)
-            open_interest = int(row.get('openInterest', 0) or 0)
-            
-            # Skip low activity options
-            if volume < self.min_volume or open_interest < self.min_oi:
-                continue
-            
-            # Calculate volume/OI ratio
-            vol_oi_ratio = volume / open_interest if open_interest > 0 else 0
-            
-            # Check if unusual
-            if vol_oi_ratio < self.unusual_vol_oi_ratio:
-                continue
-            
-            # Determine signal type and strength
-            if vol_oi_ratio >= self.high_vol_oi_ratio:
-                signal_type = f"{option_type}_sweep"
-                signal_strength = "strong"
-            else:
-                signal_type = "unusual_volume"
-                signal_strength = "moderate"
-            
-            # Get IV if available
-            iv = row.get('impliedVolatility')
-            if iv and iv > 0:
-                iv = round(iv * 100, 1)  # Convert to percentage
-            else:
-                iv = None
-            
-            signals.append(OptionsSignal(
+        volume = self._column(chain_df, 'volume').astype(np.int64)
+        open_interest = self._column(chain_df, 'openInterest').astype(np.int64)
+        
+        # Skip low activity options, then keep only unusual volume/OI ratios
+        active = (volume >= self.min_volume) & (open_interest >= self.min_oi)
+        vol_oi_ratio = np.divide(volume, open_interest, out=np.zeros(len(volume)), where=open_interest > 0)
+        hits = np.flatnonzero(active & (vol_oi_ratio >= self.unusual_vol_oi_ratio))
+        if len(hits) == 0:
+            return []
+        
+        ratio = np.round(vol_oi_ratio[hits], 2)
+        strong = vol_oi_ratio[hits] >= self.high_vol_oi_ratio
+        iv = self._column(chain_df, 'impliedVolatility')[hits]
+        iv_pct = np.where(iv > 0, np.round(iv * 100, 1), np.nan)  # Convert to percentage
+        strikes = self._column(chain_df, 'strike')[hits]
+        last_prices = self._column(chain_df, 'lastPrice')[hits]
+        sweep_type = f"{option_type}_sweep"
+        
+        return [
+            OptionsSignal(
                 symbol=ticker,
                 expiry=expiry,
-                strike=float(row['strike']),
+                strike=float(strikes[i]),
                 option_type=option_type,
-                volume=volume,
-                open_interest=open_interest,
-                volume_oi_ratio=round(vol_oi_ratio, 2),
-                implied_volatility=iv,
-                last_price=float(row.get('lastPrice', 0) or 0),
-                signal_type=signal_type,
-                signal_strength=signal_strength
-            ))
+                volume=int(volume[row]),
+                open_interest=int(open_interest[row]),
+                volume_oi_ratio=float(ratio[i]),
+                implied_volatility=None if np.isnan(iv_pct[i]) else float(iv_pct[i]),
+                last_price=float(last_prices[i]),
+                signal_type=sweep_type if strong[i] else "unusual_volume",
+                signal_strength="strong" if strong[i] else "moderate"
+            )
+            for i, row in enumerate(hits)
+        ]
+
+    def _call_put_ratio(self, ticker: str, expirations: tuple) -> Optional[float]:
+        """Call/put volume ratio over the first expiries, from cached chains."""
+        total_call_vol = 0
+        total_put_vol = 0
         
-        return signals
+        # Check first 2 expiries for recent sentiment
+        for exp in expirations[:self.ratio_expiries]:
+            try:
+                chain = self.chains.chain(ticker, exp)
+                total_call_vol += chain.calls['volume'].sum() or 0
+                total_put_vol += chain.puts['volume'].sum() or 0
+            except:
+                continue
+        
+        if total_put_vol > 0:
+            return round(total_call_vol / total_put_vol, 2)
+        elif total_call_vol > 0:
+            return float('inf')  # All calls, no puts
+        return None
 
     def get_call_put_ratio(self, tickers: List[str]) -> dict:
         """Calculate call/put volume ratio for tickers."""
         ratios = {}
         
         for ticker in tickers:
+            if ticker in self._call_put_ratios:
+                ratios[ticker] = self._call_put_ratios[ticker]
+                continue
             try:
-                stock = yf.Ticker(ticker)
-                expirations = stock.options
-                
+                expirations = self.chains.expirations(ticker)
                 if not expirations:
                     continue
-                
-                total_call_vol = 0
-                total_put_vol = 0
-                
-                # Check first 2 expiries for recent sentiment
-                for exp in expirations[:2]:
-                    try:
-                        chain = stock.option_chain(exp)
-                        total_call_vol += chain.calls['volume'].sum() or 0
-                        total_put_vol += chain.puts['volume'].sum() or 0
-                    except:
-                        continue
-                
-                if total_put_vol > 0:
-                    ratios[ticker] = round(total_call_vol / total_put_vol, 2)
-                elif total_call_vol > 0:
-                    ratios[ticker] = float('inf')  # All calls, no puts
-                    
+                ratio = self._call_put_ratio(ticker, expirations)
+                if ratio is not None:
+                    ratios[ticker] = ratio
             except Exception as e:
                 continue
         
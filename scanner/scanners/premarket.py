@@ -1,9 +1,11 @@
 """Pre-Market Movers Scanner."""
 
-import yfinance as yf
-from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+from ..cache import ReferenceStore, get_reference_store
+from ..cache.reference import PROFILE
+from ..market_data import QuoteSnapshot, get_quote_snapshots
 
 
 class PreMarketMover(BaseModel):
@@ -20,7 +22,8 @@ class PreMarketMover(BaseModel):
 class PreMarketScanner:
     """Scans for pre-market movers."""
 
-    def __init__(self):
+    def __init__(self, reference: Optional[ReferenceStore] = None):
+        self.reference = reference or get_reference_store()
         self.significant_move_pct = 3.0  # 3% move is significant
         
         # Additional high-profile stocks to monitor beyond watchlist
@@ -28,16 +31,29 @@ class PreMarketScanner:
             "SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META"
         ]
 
-    def scan(self, watchlist_tickers: List[str]) -> List[PreMarketMover]:
+    def symbols(self, watchlist_tickers: List[str]) -> List[str]:
+        """Watchlist plus the always-watch names."""
+        return list(dict.fromkeys(watchlist_tickers + self.always_watch))
+
+    def scan(
+        self,
+        watchlist_tickers: List[str],
+        snapshots: Optional[Dict[str, QuoteSnapshot]] = None
+    ) -> List[PreMarketMover]:
         """Scan pre-market movers."""
         movers = []
         
         # Combine watchlist with always-watch list
-        all_tickers = list(set(watchlist_tickers + self.always_watch))
+        all_tickers = self.symbols(watchlist_tickers)
+        if snapshots is None:
+            snapshots = get_quote_snapshots(all_tickers)
         
         for ticker in all_tickers:
+            snapshot = snapshots.get(ticker)
+            if not snapshot:
+                continue
             try:
-                mover = self._check_ticker(ticker, ticker in watchlist_tickers)
+                mover = self._check_ticker(snapshot, ticker in watchlist_tickers)
                 if mover:
                     movers.append(mover)
             except Exception as e:
@@ -48,69 +64,47 @@ class PreMarketScanner:
         
         return movers
 
-    def _check_ticker(self, ticker: str, on_watchlist: bool) -> Optional[PreMarketMover]:
-        """Check single ticker for pre-market activity."""
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        # Get pre-market or regular price
-        pre_market_price = info.get('preMarketPrice')
-        regular_price = info.get('currentPrice') or info.get('regularMarketPrice')
-        prev_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
-        
-        if not prev_close:
-            return None
-        
-        # Use pre-market price if available, otherwise regular price
-        current_price = pre_market_price or regular_price
-        if not current_price:
+    def _check_ticker(self, snapshot: QuoteSnapshot, on_watchlist: bool) -> Optional[PreMarketMover]:
+        """Check single ticker's quote snapshot for pre-market activity."""
+        # Pre-market price is measured against the last close; otherwise
+        # the regular-session price against the prior close
+        if snapshot.pre_market_price:
+            current_price = snapshot.pre_market_price
+            change_pct = snapshot.pre_market_change_pct
+        else:
+            current_price = snapshot.last_price
+            change_pct = snapshot.change_pct
+        
+        if not current_price or change_pct is None:
             return None
         
-        change_pct = ((current_price - prev_close) / prev_close) * 100
-        
         # Only return if significant move
         if abs(change_pct) < self.significant_move_pct:
             return None
         
-        # Get volume
-        volume = info.get('preMarketVolume') or info.get('volume') or 0
-        
-        # Get company name
-        name = info.get('shortName', ticker)
-        
         return PreMarketMover(
-            symbol=ticker,
-            name=name,
+            symbol=snapshot.symbol,
+            name=self._company_name(snapshot.symbol),
             price=round(current_price, 2),
             change_pct=round(change_pct, 2),
-            volume=volume,
+            volume=snapshot.volume,
             on_watchlist=on_watchlist
         )
 
+    def _company_name(self, symbol: str) -> str:
+        """Company name from the profiles the news scanner keeps refreshed, else the symbol."""
+        return (self.reference.get(PROFILE, symbol) or {}).get("name") or symbol
+
     def get_market_futures(self) -> dict:
         """Get index futures for market direction."""
         futures = {}
-        
-        # S&P 500 futures (ES)
-        try:
-            spy = yf.Ticker("ES=F")
-            info = spy.info
-            price = info.get('regularMarketPrice', 0)
-            prev = info.get('previousClose', price)
-            change = ((price - prev) / prev * 100) if prev else 0
-            futures['S&P 500 Futures'] = round(change, 2)
-        except:
-            pass
-        
-        # Nasdaq futures (NQ)
-        try:
-            nq = yf.Ticker("NQ=F")
-            info = nq.info
-            price = info.get('regularMarketPrice', 0)
-            prev = info.get('previousClose', price)
-            change = ((price - prev) / prev * 100) if prev else 0
-            futures['Nasdaq Futures'] = round(change, 2)
-        except:
-            pass
+        names = {"ES=F": "S&P 500 Futures", "NQ=F": "Nasdaq Futures"}
+        
+        # Futures trade nearly 24h, so the latest bar vs the last settlement is the move
+        for symbol, snapshot in get_quote_snapshots(list(names)).items():
+            price = snapshot.pre_market_price or snapshot.last_price
+            prev = snapshot.last_price if snapshot.pre_market_price else snapshot.previous_close
+            if price and prev:
+                futures[names[symbol]] = round((price - prev) / prev * 100, 2)
         
         return futures
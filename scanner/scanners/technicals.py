@@ -1,12 +1,14 @@
 """Technical Analysis Scanner - RSI, Moving Averages, Short Interest."""
 
-import requests
-import yfinance as yf
 import numpy as np
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
-from ..config import FINNHUB_API_KEY, FINNHUB_BASE_URL
+from ..cache import ReferenceStore, get_reference_store
+from ..cache.reference import SHORT_INTEREST
+from ..indicators import TechnicalIndicators
+from ..market_data import PricePanel, download_price_panel
+from ..providers import FinnhubClient, get_finnhub_client
 
 
 class TechnicalSignal(BaseModel):
@@ -18,6 +20,8 @@ class TechnicalSignal(BaseModel):
     ma_200: Optional[float] = None  # 200-day moving average
     above_50ma: Optional[bool] = None
     above_200ma: Optional[bool] = None
+    last_cross: Optional[str] = None       # "golden" or "death"
+    last_cross_date: Optional[str] = None  # Day the 50MA last crossed the 200MA
     short_interest_ratio: Optional[float] = None  # Days to cover
     short_percent_float: Optional[float] = None   # % of float shorted
     signals: List[str] = Field(default_factory=list)
@@ -26,18 +30,34 @@ class TechnicalSignal(BaseModel):
 class TechnicalsScanner:
     """Scans for technical signals (RSI, MA, Short Interest)."""
 
-    def __init__(self):
+    def __init__(self, finnhub: Optional[FinnhubClient] = None, reference: Optional[ReferenceStore] = None):
+        self.finnhub = finnhub or get_finnhub_client()
+        self.reference = reference or get_reference_store()
         self.rsi_overbought = 70
         self.rsi_oversold = 30
         self.high_short_interest = 10  # >10% of float
+        self.min_bars = 50
+        self.cross_recent_bars = 5  # Report crossovers from the last week of sessions
 
-    def scan(self, tickers: List[str]) -> List[TechnicalSignal]:
-        """Scan tickers for technical signals."""
+    def scan(self, tickers: List[str], panel: Optional[PricePanel] = None) -> List[TechnicalSignal]:
+        """Scan tickers for technical signals.
+
+        Indicators for the whole universe come from one vectorized pass over
+        the close matrix; this method only turns them into signals.
+        """
         results = []
+        if panel is None:
+            panel = download_price_panel(tickers)
+        
+        covered = [t for t in tickers if t in panel]
+        indicators = TechnicalIndicators(panel.matrix("close")[panel.rows(covered)], panel.dates)
+        # Short interest is published twice a month; only refetch tickers with a new release due
+        eligible = [t for row, t in enumerate(covered) if indicators.bars[row] >= self.min_bars]
+        self.reference.refresh(SHORT_INTEREST, eligible, self._fetch_short_interest)
         
-        for ticker in tickers:
+        for row, ticker in enumerate(covered):
             try:
-                signal = self._analyze_ticker(ticker)
+                signal = self._analyze_ticker(ticker, indicators, row)
                 if signal and signal.signals:  # Only include if has signals
                     results.append(signal)
             except Exception as e:
@@ -46,70 +66,38 @@ class TechnicalsScanner:
         
         return results
 
-    def _calculate_rsi(self, prices: np.ndarray, period: int = 14) -> Optional[float]:
-        """Calculate RSI from price array."""
-        if len(prices) < period + 1:
+    def _fetch_short_interest(self, ticker: str) -> Optional[dict]:
+        """Latest short interest record from Finnhub, kept compact for the reference store."""
+        records = self.finnhub.short_interest(ticker)
+        if not records:
             return None
-        
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        # Smoothed RS calculation
-        for i in range(period, len(gains)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return round(rsi, 1)
+        latest = records[0]
+        return {
+            "ratio": latest.get("shortInterestRatio"),  # Days to cover
+            "pct_float": latest.get("shortInterestPercentFloat"),
+            "settlement": latest.get("date") or latest.get("settlementDate"),
+        }
 
     def _get_short_interest(self, ticker: str) -> tuple:
-        """Get short interest data from Finnhub."""
-        try:
-            url = f"{FINNHUB_BASE_URL}/stock/short-interest"
-            params = {"symbol": ticker, "token": FINNHUB_API_KEY}
-            resp = requests.get(url, params=params, timeout=10)
-            data = resp.json()
-            
-            if data and "data" in data and len(data["data"]) > 0:
-                latest = data["data"][0]
-                short_ratio = latest.get("shortInterestRatio")  # Days to cover
-                short_pct = latest.get("shortInterestPercentFloat")
-                return short_ratio, short_pct
-        except:
-            pass
-        return None, None
+        """Short interest (days to cover, % of float) from the reference store."""
+        stored = self.reference.get(SHORT_INTEREST, ticker) or {}
+        return stored.get("ratio"), stored.get("pct_float")
 
-    def _analyze_ticker(self, ticker: str) -> Optional[TechnicalSignal]:
-        """Analyze single ticker for technical signals."""
-        stock = yf.Ticker(ticker)
-        
-        # Get historical data for calculations (200 days + buffer)
-        hist = stock.history(period="1y")
-        
-        if hist.empty or len(hist) < 50:
+    @staticmethod
+    def _value(array: np.ndarray, row: int) -> Optional[float]:
+        value = array[row]
+        return None if np.isnan(value) else float(value)
+
+    def _analyze_ticker(self, ticker: str, indicators: TechnicalIndicators, row: int) -> Optional[TechnicalSignal]:
+        """Build signals for one ticker from precomputed indicators."""
+        if indicators.bars[row] < self.min_bars:
             return None
         
-        closes = hist['Close'].values
-        current_price = closes[-1]
-        
-        # Calculate RSI
-        rsi = self._calculate_rsi(closes)
-        
-        # Calculate moving averages
-        ma_50 = np.mean(closes[-50:]) if len(closes) >= 50 else None
-        ma_200 = np.mean(closes[-200:]) if len(closes) >= 200 else None
+        current_price = float(indicators.price[row])
+        rsi = self._value(indicators.rsi, row)
+        rsi = round(rsi, 1) if rsi is not None else None
+        ma_50 = self._value(indicators.ma_fast, row)
+        ma_200 = self._value(indicators.ma_slow, row)
         
         above_50ma = current_price > ma_50 if ma_50 else None
         above_200ma = current_price > ma_200 if ma_200 else None
@@ -128,21 +116,20 @@ class TechnicalsScanner:
                 signals.append(f"RSI oversold ({rsi})")
         
         # Moving average signals
+        cross, cross_date = None, None
         if ma_50 and ma_200:
             if above_50ma and above_200ma:
                 signals.append("Above 50 & 200 MA (bullish)")
             elif not above_50ma and not above_200ma:
                 signals.append("Below 50 & 200 MA (bearish)")
             
-            # Golden/Death cross check (approximate)
-            ma_50_prev = np.mean(closes[-55:-5]) if len(closes) >= 55 else None
-            ma_200_prev = np.mean(closes[-205:-5]) if len(closes) >= 205 else None
-            
-            if ma_50_prev and ma_200_prev:
-                if ma_50 > ma_200 and ma_50_prev <= ma_200_prev:
-                    signals.append("Golden cross forming")
-                elif ma_50 < ma_200 and ma_50_prev >= ma_200_prev:
-                    signals.append("Death cross forming")
+            # Golden/Death cross on the exact day the 50MA crossed the 200MA
+            if indicators.cross_index[row] >= 0:
+                cross = "golden" if indicators.cross_direction[row] > 0 else "death"
+                cross_date = indicators.cross_date(row)
+                if indicators.bars_since_cross[row] < self.cross_recent_bars:
+                    label = "Golden cross" if cross == "golden" else "Death cross"
+                    signals.append(f"{label} on {cross_date}")
         
         # Short interest signals
         if short_pct and short_pct >= self.high_short_interest:
@@ -156,6 +143,8 @@ class TechnicalsScanner:
             ma_200=round(ma_200, 2) if ma_200 else None,
             above_50ma=above_50ma,
             above_200ma=above_200ma,
+            last_cross=cross,
+            last_cross_date=cross_date,
             short_interest_ratio=short_ratio,
             short_percent_float=short_pct,
             signals=signals
@@ -0,0 +1,124 @@
+"""Incremental JSON parsing for streamed Claude responses.
+
+The analysis response is one JSON object whose top-level values are arrays
+(``top_opportunities``, ``watchlist``, ``no_action``) or objects
+(``sector_summary``). ``IncrementalJSONParser`` tracks nesting as text
+arrives and yields each element of those containers the moment its closing
+brace is seen, so callers can act on complete items long before the
+response ends, and keep them if the stream is cut off.
+"""
+
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class ParsedItem(NamedTuple):
+    section: str        # Top-level key, e.g. "top_opportunities"
+    key: Optional[str]  # Member name for object sections (sector name), None for arrays
+    value: Any
+
+
+class IncrementalJSONParser:
+    """Feed text chunks; get back the second-level items completed by each chunk."""
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._root = -1            # Index of the top-level "{" (text before it, e.g. ```json, is skipped)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expect_key = False   # At depth 1, the next string is a top-level key
+        self._section: Optional[str] = None
+        self._member: Optional[str] = None
+        self._item_start = -1
+        self.sections: Dict[str, Any] = {}
+        self.done = False
+
+    def feed(self, chunk: str) -> List[ParsedItem]:
+        """Consume more text and return items that became complete."""
+        self.buffer += chunk
+        items = []
+        buf = self.buffer
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self.done:
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._end_string(buf[self._string_start:i + 1])
+                continue
+            if self._root < 0:
+                if ch == "{":
+                    self._root = i
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if self._depth == 2 and ch == "{":
+                    self._item_start = i
+                elif self._depth == 1:
+                    self._start_section(ch)
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 2 and ch == "}" and self._item_start >= 0:
+                    item = self._complete_item(buf[self._item_start:i + 1])
+                    if item:
+                        items.append(item)
+                    self._item_start = -1
+                elif self._depth == 0:
+                    self.done = True
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+        self._pos = len(buf)
+        return items
+
+    def _end_string(self, literal: str):
+        try:
+            value = json.loads(literal)
+        except ValueError:
+            return
+        if self._depth == 1 and self._expect_key:
+            self._section = value
+            self._expect_key = False
+        elif self._depth == 2 and self._item_start < 0:
+            self._member = value  # Object section member name, or a bare string array element
+
+    def _start_section(self, bracket: str):
+        if self._section is not None:
+            self.sections.setdefault(self._section, [] if bracket == "[" else {})
+        self._member = None
+
+    def _complete_item(self, text: str) -> Optional[ParsedItem]:
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return None
+        container = self.sections.get(self._section)
+        if isinstance(container, list):
+            container.append(value)
+            return ParsedItem(self._section, None, value)
+        if isinstance(container, dict) and self._member is not None:
+            container[self._member] = value
+            return ParsedItem(self._section, self._member, value)
+        return None
+
+    def result(self) -> Dict[str, Any]:
+        """The full object if the response completed and parses, else the items completed so far."""
+        if self.done:
+            end = self.buffer.rfind("}")
+            try:
+                return json.loads(self.buffer[self._root:end + 1])
+            except ValueError:
+                pass
+        return self.sections
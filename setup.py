@@ -13,6 +13,8 @@ setup(
         "python-dotenv>=1.0.0",
         "rich>=13.7.0",
         "pydantic>=2.5.0",
+        "numpy>=1.24.0",
+        "pandas>=2.0.0",
         "reportlab>=4.1.0",
         "yfinance>=0.2.0",
         "resend>=0.7.0",
@@ -0,0 +1,127 @@
+"""Local stub of the Anthropic Messages API for hedging tests and benchmarks.
+
+``StubServer`` answers POST /v1/messages (plain JSON, or SSE for
+``stream: true``) with a canned analysis. ``plan(model)`` decides each
+request's behaviour: how long before the first token, whether it fails,
+and whether the stream stalls partway.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, NamedTuple, Optional
+
+
+def make_response(model: str) -> str:
+    """Canned analysis JSON; each item names the model that wrote it."""
+    return json.dumps({
+        "top_opportunities": [
+            {
+                "rank": rank, "ticker": ticker, "company": ticker, "setup_type": "swing",
+                "time_horizon": "1-3 weeks", "catalyst": model, "thesis": "Stub thesis.",
+                "trade_setup": "Stub setup.", "key_risk": "Stub risk.", "conviction": 8 - rank,
+            }
+            for rank, ticker in enumerate(("NVDA", "AMD", "SMR"), 1)
+        ],
+        "watchlist": [{"ticker": "OKLO", "reason": model}],
+        "no_action": [],
+        "sector_summary": {"ai_semiconductors": {"outlook": "Neutral", "overview": model, "news": []}},
+    })
+
+
+class Reply(NamedTuple):
+    delay: float = 0.0                 # Seconds before the answer (streamed: before the first token)
+    status: int = 200                  # Non-200 answers with an API error after ``delay``
+    stall_after: Optional[int] = None  # Streamed: stop sending after this many characters...
+    stall: float = 0.0                 # ...for this many seconds
+    chunk_delay: float = 0.0           # Streamed: pause between text chunks
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        model = body.get("model", "")
+        with self.server.lock:
+            self.server.requests.append(model)
+        reply = self.server.plan(model)
+        usage = {"input_tokens": 1200, "output_tokens": 300}
+        try:
+            time.sleep(reply.delay)
+            if reply.status != 200:
+                self._send_json(reply.status, {
+                    "type": "error", "error": {"type": "api_error", "message": "stub failure"},
+                })
+            elif body.get("stream"):
+                self._stream(model, reply, usage)
+            else:
+                self._send_json(200, {
+                    "id": "msg_stub", "type": "message", "role": "assistant", "model": model,
+                    "content": [{"type": "text", "text": make_response(model)}],
+                    "stop_reason": "end_turn", "stop_sequence": None, "usage": usage,
+                })
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client abandoned the request (hedge lost or SLA hit)
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, model: str, reply: Reply, usage: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        def event(name: str, payload: dict):
+            self.wfile.write(f"event: {name}\ndata: {json.dumps({'type': name, **payload})}\n\n".encode())
+            self.wfile.flush()
+
+        event("message_start", {"message": {
+            "id": "msg_stub", "type": "message", "role": "assistant", "model": model, "content": [],
+            "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": usage["input_tokens"], "output_tokens": 0},
+        }})
+        event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+        text = make_response(model)
+        for i in range(0, len(text), 40):
+            if reply.stall_after is not None and i >= reply.stall_after:
+                time.sleep(reply.stall)
+                return
+            event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": text[i:i + 40]}})
+            time.sleep(reply.chunk_delay)
+        event("content_block_stop", {"index": 0})
+        event("message_delta", {"delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                "usage": {"output_tokens": usage["output_tokens"]}})
+        event("message_stop", {})
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub on a free local port; ``url`` is the base URL for the SDK client."""
+
+    daemon_threads = True
+
+    def __init__(self, plan: Callable[[str], Reply] = lambda model: Reply()):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.plan = plan
+        self.requests: List[str] = []  # Model of each request received
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
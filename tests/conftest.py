@@ -0,0 +1,13 @@
+"""Shared fixtures."""
+
+import pytest
+
+from .anthropic_stub import StubServer
+
+
+@pytest.fixture
+def anthropic_stub():
+    """A running local Messages API stub; set ``.plan`` to script its replies."""
+    server = StubServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,144 @@
+"""Tests for hedged Claude calls, run against the local Messages API stub."""
+
+import anthropic
+import pytest
+
+from scanner.analyzer import ScannerAnalyzer
+from scanner.cache import AnalysisCache
+from scanner.hedging import LatencyLog, percentiles
+
+from .anthropic_stub import Reply
+
+PRIMARY = "claude-primary-stub"
+FALLBACK = "claude-fallback-stub"
+REQUEST = dict(
+    model=PRIMARY,
+    max_tokens=1000,
+    system=[{"type": "text", "text": "stub"}],
+    messages=[{"role": "user", "content": "stub scan data"}],
+)
+
+
+def plan(primary: Reply, fallback: Reply):
+    return lambda model: primary if model == PRIMARY else fallback
+
+
+@pytest.fixture
+def analyzer(anthropic_stub, tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "stub-key")
+    a = ScannerAnalyzer(stream=False, reanalyze=True)
+    a.client = anthropic.Anthropic(api_key="stub-key", base_url=anthropic_stub.url)
+    a.cache = AnalysisCache(tmp_path / "analysis")
+    a.model = PRIMARY
+    a.fallback_model = FALLBACK
+    a.hedge_after = 0.5
+    a.sla = 5.0
+    return a
+
+
+def test_primary_wins_before_hedge_after(analyzer, anthropic_stub):
+    anthropic_stub.plan = plan(Reply(delay=0.05), Reply(delay=0.05))
+    data = analyzer._call(REQUEST)
+    assert data["top_opportunities"][0]["catalyst"] == PRIMARY
+    assert analyzer.timings[-1]["winner"] == "primary"
+    assert analyzer.timings[-1]["hedged"] is False
+    assert anthropic_stub.requests == [PRIMARY]
+
+
+def test_hedge_wins_when_primary_stalls(analyzer, anthropic_stub):
+    anthropic_stub.plan = plan(Reply(delay=3.0), Reply(delay=0.05))
+    data = analyzer._call(REQUEST)
+    timing = analyzer.timings[-1]
+    assert data["top_opportunities"][0]["catalyst"] == FALLBACK
+    assert (timing["winner"], timing["model"], timing["hedged"]) == ("hedge", FALLBACK, True)
+    assert timing["seconds"] < 2.0
+
+
+def test_hedge_answer_is_not_cached_as_the_primary(analyzer, anthropic_stub):
+    analyzer.reanalyze = False
+    anthropic_stub.plan = plan(Reply(delay=3.0), Reply(delay=0.05))
+    assert analyzer._call(REQUEST)["top_opportunities"][0]["catalyst"] == FALLBACK
+
+    anthropic_stub.plan = plan(Reply(delay=0.05), Reply(delay=0.05))
+    data = analyzer._call(REQUEST)
+    assert data["top_opportunities"][0]["catalyst"] == PRIMARY
+    assert analyzer.cache.hits == 0
+    assert analyzer._call(REQUEST)["top_opportunities"][0]["catalyst"] == PRIMARY  # Primary answers are cached
+    assert analyzer.cache.hits == 1
+
+
+def test_hedge_retries_a_fast_failure(analyzer, anthropic_stub):
+    analyzer.hedge_after = 3.0
+    anthropic_stub.plan = plan(Reply(status=500), Reply(delay=0.05))
+    data = analyzer._call(REQUEST)
+    assert data["top_opportunities"][0]["catalyst"] == FALLBACK
+    assert analyzer.timings[-1]["winner"] == "hedge"
+    assert analyzer.timings[-1]["seconds"] < 2.0  # Didn't wait for hedge_after
+    assert anthropic_stub.requests == [PRIMARY, FALLBACK]
+
+
+def test_sla_abandons_both_requests(analyzer, anthropic_stub):
+    analyzer.hedge_after, analyzer.sla = 0.2, 0.8
+    anthropic_stub.plan = plan(Reply(delay=5.0), Reply(delay=5.0))
+    data = analyzer._call(REQUEST)
+    timing = analyzer.timings[-1]
+    assert data == {}
+    assert (timing["winner"], timing["hedged"]) == ("none", True)
+    assert timing["seconds"] < 2.0
+    assert analyzer.failed_calls == ["analysis"]
+
+
+def test_sla_keeps_streamed_items(analyzer, anthropic_stub):
+    analyzer.stream = True
+    analyzer.hedge_after, analyzer.sla = 0.0, 1.0
+    anthropic_stub.plan = plan(Reply(stall_after=600, stall=5.0), Reply())  # Two opportunities, then nothing
+    received = []
+    data = analyzer._call(REQUEST, on_item=lambda section, key, item: received.append(section))
+    assert received == ["top_opportunities", "top_opportunities"]
+    assert [o["ticker"] for o in data["top_opportunities"]] == ["NVDA", "AMD"]
+    assert analyzer.failed_calls == ["analysis"]
+    assert list(analyzer.cache.path.glob("*.json")) == []  # Incomplete answers aren't cached
+
+
+def test_only_the_stream_owner_calls_on_item(analyzer, anthropic_stub):
+    analyzer.stream = True
+    analyzer.hedge_after = 0.1
+    # Both requests are in flight; the primary's first item arrives first
+    anthropic_stub.plan = plan(Reply(delay=0.3, chunk_delay=0.02), Reply(delay=0.5, chunk_delay=0.02))
+    received = []
+    data = analyzer._call(REQUEST, on_item=lambda section, key, item: received.append((section, item)))
+    writers = {item.catalyst for section, item in received if section == "top_opportunities"}
+    writers |= {item.reason for section, item in received if section == "watchlist"}
+    assert anthropic_stub.requests == [PRIMARY, FALLBACK]
+    assert writers == {PRIMARY}
+    assert len(received) == 5  # 3 opportunities, 1 watchlist item, 1 sector summary; no duplicates
+    assert analyzer.timings[-1]["winner"] == "primary"
+    assert data["top_opportunities"][0]["catalyst"] == PRIMARY
+
+
+def test_late_hedge_is_not_counted_when_primary_owns_the_stream(analyzer, anthropic_stub):
+    analyzer.stream = True
+    analyzer.hedge_after = 0.3
+    # The primary's first item lands well before hedge_after, the full answer well after
+    anthropic_stub.plan = plan(Reply(chunk_delay=0.03), Reply())
+    analyzer._call(REQUEST, on_item=lambda *args: None)
+    assert anthropic_stub.requests == [PRIMARY]
+    assert analyzer.timings[-1]["hedged"] is False
+
+
+def test_percentiles():
+    assert percentiles([]) == {}
+    stats = percentiles(list(range(1, 101)))
+    assert stats["p50"] == pytest.approx(50.5)
+    assert stats["p90"] == pytest.approx(90.1)
+    assert stats["max"] == 100
+
+
+def test_latency_log_recent(tmp_path):
+    log = LatencyLog(tmp_path / "latency.jsonl")
+    assert log.recent() == []
+    log.append([{"call": "analysis", "seconds": 1.5}, {"call": "ranking", "seconds": 0.4}])
+    with open(log.path, "a") as f:
+        f.write('{"at": "2020-01-01T00:00:00", "call": "old", "seconds": 9}\n')
+        f.write("not json\n")
+    assert [r["call"] for r in log.recent(days=30)] == ["analysis", "ranking"]
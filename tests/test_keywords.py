@@ -0,0 +1,38 @@
+"""Tests for the news keyword matcher."""
+
+import pytest
+
+from scanner.keywords import KeywordMatcher
+from scanner.scanners.news import BEARISH_KEYWORDS, BULLISH_KEYWORDS, KEYWORD_INFLECTIONS
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordMatcher(BULLISH_KEYWORDS, BEARISH_KEYWORDS, inflections=KEYWORD_INFLECTIONS)
+
+
+@pytest.mark.parametrize("text", [
+    "Senate approves federal aid package",
+    "Charity aids flood victims",
+    "Program aided by state grants",
+    "The company said its ideal plan is on track",
+])
+def test_short_keywords_do_not_match_other_words(matcher, text):
+    assert matcher.score(text) == (0, "neutral", [])
+
+
+def test_listed_inflections_count_as_the_keyword(matcher):
+    score, sentiment, keywords = matcher.score("Acquired rival signs two deals; losses narrow")
+    assert sorted(keywords) == ["acquire", "deal"]
+    assert matcher.score("Losses widen after product recalls")[2] == ["loss", "recall"]
+
+
+def test_negation_within_clause(matcher):
+    assert matcher.score("Company denies fraud")[0] == 0
+    assert matcher.score("No deal. Merger talks continue")[2] == ["merger"]
+    assert matcher.score("Not a very big new deal")[2] == ["deal"]  # Negation more than 3 words back
+
+
+def test_batch_matches_single_scoring(matcher):
+    texts = ["AI chip deals surge", "No deal for now", "Aid package passes", "Downgraded to sell rating"]
+    assert matcher.score_batch(texts) == [matcher.score(t) for t in texts]